@@ -0,0 +1,96 @@
+from typing import Optional
+import sqlite3
+import random
+import os
+
+
+CATEGORIES = [
+    "animal", "finance", "search", "weather", "maps", "shopping",
+    "events", "news", "images", "sports", "music", "travel"
+]
+
+CATALOG_COLUMNS = [
+    "name", "category", "base_url", "endpoint", "description",
+    "query_parameters", "example_request", "example_response"
+]
+
+
+def make_row(i: int, rng: random.Random) -> tuple:
+    """
+    Returns a synthetic `apientry` row shaped like the entries in data/apis.csv.
+    """
+    category = rng.choice(CATEGORIES)
+    name = f"{category} api {i // 4}"
+    endpoint = f"/v1/{category}/resource{i}"
+    return (
+        name,
+        category,
+        f"https://api.example{i % 97}.com",
+        endpoint,
+        f"Retrieve {category} resource {i} with filtering and pagination support.",
+        "q (string), limit (integer), page (integer)",
+        f"GET https://api.example{i % 97}.com{endpoint}?q=test&limit=5",
+        '{"data": [' + ", ".join(
+            f'{{"id": {j}, "title": "{category} item {j}", "score": {rng.random():.4f}}}' for j in range(5)
+        ) + '], "page": 1, "total": 5}'
+    )
+
+
+def write_csv(csv_path: str, rows: int, seed: int = 0) -> None:
+    """
+    Writes a synthetic catalog CSV with the columns expected by `validate_csv`.
+    """
+    import csv
+
+    rng = random.Random(seed)
+    with open(csv_path, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.writer(f)
+        writer.writerow(CATALOG_COLUMNS)
+        for i in range(rows):
+            writer.writerow(make_row(i, rng))
+
+
+def make_catalog(db_path: str, rows: int, seed: int = 0) -> None:
+    """
+    Creates (or replaces) a SQLite database with a synthetic `apientry` table of the given size.
+    """
+    if os.path.exists(db_path):
+        os.remove(db_path)
+    rng = random.Random(seed)
+    conn = sqlite3.connect(db_path)
+    with conn:
+        conn.execute(f"CREATE TABLE apientry ({', '.join(f'{col} TEXT' for col in CATALOG_COLUMNS)})")
+        conn.executemany(
+            f"INSERT INTO apientry VALUES ({', '.join('?' for _ in CATALOG_COLUMNS)})",
+            (make_row(i, rng) for i in range(rows))
+        )
+    conn.close()
+
+
+def use_database(db_path: str, project_root: Optional[str] = None) -> None:
+    """
+    Points the already-imported modules at a benchmark database (and optionally a benchmark project root
+    holding `src/apps`), so the real `db/apis.db` is never touched.
+    """
+    import src.config.setup as setup
+    import src.db.crud as crud
+
+    setup._engine = setup.initialize_database(db_path)
+    setup.DB_PATH = crud.DB_PATH = db_path
+
+    if project_root:
+        import src.workflow.helper as helper
+        helper.PROJECT_ROOT = project_root
+
+
+def make_apps(project_root: str, count: int) -> None:
+    """
+    Creates `count` trivial generated apps under `<project_root>/src/apps`.
+    """
+    for i in range(count):
+        app_dir = os.path.join(project_root, 'src', 'apps', f"benchmark_app_{i}")
+        os.makedirs(app_dir, exist_ok=True)
+        with open(os.path.join(app_dir, 'frontend.py'), 'w', encoding='utf-8') as f:
+            f.write("import streamlit as st\n\n\ndef main():\n    st.write('hello')\n\n\nif __name__ == '__main__':\n    main()\n")
+        with open(os.path.join(app_dir, 'backend.py'), 'w', encoding='utf-8') as f:
+            f.write("")
@@ -0,0 +1,95 @@
+from benchmarks.common import make_catalog
+from benchmarks.common import use_database
+import statistics
+import argparse
+import tempfile
+import sqlite3
+import shutil
+import time
+import zlib
+import os
+
+
+def _payload_bytes(db_path: str) -> int:
+    conn = sqlite3.connect(db_path)
+    try:
+        # length() counts characters for TEXT; cast to BLOB to count bytes for both storage classes.
+        return conn.execute(
+            "SELECT SUM(length(CAST(example_request AS BLOB)) + length(CAST(example_response AS BLOB))) FROM apientry"
+        ).fetchone()[0] or 0
+    finally:
+        conn.close()
+
+
+def _file_mb(db_path: str) -> float:
+    conn = sqlite3.connect(db_path)
+    try:
+        conn.execute("VACUUM")
+    finally:
+        conn.close()
+    return os.path.getsize(db_path) / (1024 * 1024)
+
+
+def main() -> None:
+    """
+    Reports how much the example payload compression shrinks the catalog and what decompression costs.
+    Builds a synthetic uncompressed catalog, migrates it (which trains the dictionary and compresses the
+    payloads), and compares payload bytes and vacuumed file size with plain zlib without a dictionary.
+
+    Usage:
+        PYTHONPATH=. python -m benchmarks.compression_benchmark --rows 200000
+    """
+    parser = argparse.ArgumentParser(description=main.__doc__)
+    parser.add_argument("--rows", type=int, default=200000, help="Number of catalog rows.")
+    parser.add_argument("--decode-samples", type=int, default=20000, help="Payloads decoded for timing.")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        db_path = os.path.join(tmp_dir, "apis.db")
+        raw_path = os.path.join(tmp_dir, "raw.db")
+        make_catalog(db_path, args.rows, seed=0)
+        shutil.copy(db_path, raw_path)
+        raw_bytes = _payload_bytes(raw_path)
+
+        # Migrate the copy with compression disabled, so both files carry the same indexes.
+        import src.db.schema as schema
+        compress_existing_rows = schema.compress_existing_rows
+        schema.compress_existing_rows = lambda conn: None
+        use_database(raw_path)
+        schema.compress_existing_rows = compress_existing_rows
+
+        start = time.perf_counter()
+        use_database(db_path)
+        migrate_seconds = time.perf_counter() - start
+
+        from src.db.crud import decode_payload
+        import src.db.crud as crud
+
+        stored_bytes = _payload_bytes(db_path)
+        with crud.get_engine().connect() as conn:
+            blobs = [row[0] for row in conn.execute(crud.text(
+                f"SELECT example_response FROM apientry ORDER BY random() LIMIT {args.decode_samples}"
+            ))]
+        texts = [decode_payload(blob) for blob in blobs]
+        plain_bytes = sum(len(zlib.compress(value.encode("utf-8"), 6)) for value in texts)
+        sample_raw = sum(len(value.encode("utf-8")) for value in texts)
+
+        timings = []
+        for blob in blobs:
+            start = time.perf_counter()
+            decode_payload(blob)
+            timings.append(time.perf_counter() - start)
+
+        print(f"rows={args.rows}")
+        print(f"payload bytes: {raw_bytes} raw -> {stored_bytes} stored ({raw_bytes / max(stored_bytes, 1):.2f}x)")
+        print(f"plain zlib on the same responses, no dictionary: {sample_raw / max(plain_bytes, 1):.2f}x")
+        print(f"vacuumed file: {_file_mb(raw_path):.1f} MB uncompressed -> {_file_mb(db_path):.1f} MB compressed")
+        print(f"migration (including FTS build and compression): {migrate_seconds:.1f}s")
+        print(
+            f"decode per payload: median {statistics.median(timings) * 1e6:.1f} us, "
+            f"p99 {sorted(timings)[int(len(timings) * 0.99)] * 1e6:.1f} us"
+        )
+
+
+if __name__ == "__main__":
+    main()
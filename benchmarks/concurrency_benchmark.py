@@ -0,0 +1,103 @@
+from benchmarks.common import make_catalog
+from benchmarks.common import use_database
+from benchmarks.common import write_csv
+from typing import List
+import statistics
+import threading
+import argparse
+import tempfile
+import random
+import time
+import os
+
+
+def _reader(stop: threading.Event, latencies: List[float], errors: List[str], page_size: int, total_rows: int) -> None:
+    from src.db.crud import fetch_entries_page
+    from src.db.crud import count_entries
+
+    rng = random.Random()
+    while not stop.is_set():
+        start = time.perf_counter()
+        try:
+            count_entries()
+            page = fetch_entries_page(rng.randrange(0, max(total_rows - page_size, 1)), page_size)
+            if page.empty:
+                errors.append("empty page")
+        except Exception as e:
+            errors.append(str(e))
+        latencies.append(time.perf_counter() - start)
+
+
+def _percentile(values: List[float], pct: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct))] if ordered else 0.0
+
+
+def main() -> None:
+    """
+    Runs catalog readers in parallel with a full CSV reload and reports reader latency before and during
+    the ingest. With WAL, reader latency during the ingest should stay close to the idle baseline; run
+    with `--journal-mode DELETE` to compare against SQLite's default rollback journal.
+
+    Usage:
+        PYTHONPATH=. python -m benchmarks.concurrency_benchmark --rows 200000 --readers 8
+    """
+    parser = argparse.ArgumentParser(description=main.__doc__)
+    parser.add_argument("--rows", type=int, default=200000, help="Number of catalog rows.")
+    parser.add_argument("--readers", type=int, default=8, help="Number of concurrent reader threads.")
+    parser.add_argument("--page-size", type=int, default=50, help="Rows fetched per read.")
+    parser.add_argument("--journal-mode", default="WAL", help="SQLite journal mode to benchmark.")
+    args = parser.parse_args()
+
+    import src.config.setup as setup
+    setup.DB_JOURNAL_MODE = args.journal_mode
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        db_path = os.path.join(tmp_dir, "apis.db")
+        csv_path = os.path.join(tmp_dir, "apis.csv")
+        make_catalog(db_path, args.rows, seed=0)
+        write_csv(csv_path, args.rows, seed=1)  # different payloads, so every row is rewritten
+        use_database(db_path)
+
+        from src.db.crud import ingest_csv
+
+        ingest_csv(csv_path)  # migrate and hash once so the timed ingest is a pure update
+        write_csv(csv_path, args.rows, seed=2)
+
+        def run_readers(duration_fn) -> tuple:
+            stop = threading.Event()
+            latencies: List[float] = []
+            errors: List[str] = []
+            threads = [
+                threading.Thread(target=_reader, args=(stop, latencies, errors, args.page_size, args.rows))
+                for _ in range(args.readers)
+            ]
+            for thread in threads:
+                thread.start()
+            result = duration_fn()
+            stop.set()
+            for thread in threads:
+                thread.join()
+            return latencies, errors, result
+
+        idle_latencies, idle_errors, _ = run_readers(lambda: time.sleep(3))
+        ingest_latencies, ingest_errors, ingest_result = run_readers(lambda: ingest_csv(csv_path))
+
+        print(f"journal_mode={args.journal_mode}, rows={args.rows}, readers={args.readers}")
+        print(f"ingest: {ingest_result[1]}")
+        print(f"{'phase':<16}{'reads':>8}{'p50 ms':>10}{'p99 ms':>10}{'max ms':>10}{'errors':>8}")
+        for phase, latencies, errors in (
+            ("idle", idle_latencies, idle_errors),
+            ("during ingest", ingest_latencies, ingest_errors),
+        ):
+            print(
+                f"{phase:<16}{len(latencies):>8}"
+                f"{statistics.median(latencies) * 1000 if latencies else 0:>10.1f}"
+                f"{_percentile(latencies, 0.99) * 1000:>10.1f}"
+                f"{max(latencies, default=0) * 1000:>10.1f}"
+                f"{len(errors):>8}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+from collections import defaultdict
+from typing import Dict
+from typing import List
+from typing import Tuple
+import subprocess
+import statistics
+import argparse
+import time
+import sys
+import os
+
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def _import_once(module: str) -> Tuple[float, Dict[str, int]]:
+    """
+    Imports `module` in a fresh interpreter with `-X importtime` and returns the wall time in seconds
+    and the self time in microseconds of every imported module.
+    """
+    env = {**os.environ, "PYTHONPATH": os.pathsep.join(filter(None, [PROJECT_ROOT, os.environ.get("PYTHONPATH")]))}
+    start = time.perf_counter()
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=PROJECT_ROOT, env=env, capture_output=True, text=True
+    )
+    elapsed = time.perf_counter() - start
+    if completed.returncode != 0:
+        raise RuntimeError(f"Importing {module} failed:\n{completed.stderr[-2000:]}")
+
+    self_times = {}
+    for line in completed.stderr.splitlines():
+        # import time:       self [us] |  cumulative | imported package
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, _, name = line[len("import time:"):].split("|", 2)
+        self_times[name.strip()] = int(self_us)
+    return elapsed, self_times
+
+
+def _by_package(self_times: Dict[str, int]) -> List[Tuple[str, int]]:
+    totals = defaultdict(int)
+    for name, self_us in self_times.items():
+        parts = name.split(".")
+        package = ".".join(parts[:2]) if parts[0] == "src" else parts[0]
+        totals[package] += self_us
+    return sorted(totals.items(), key=lambda item: item[1], reverse=True)
+
+
+def main() -> None:
+    """
+    Tracks cold-start import cost of the builder (`src.workflow.app`) and a generated app frontend, using
+    `python -X importtime` in fresh interpreters. Reports median wall time, total import time, and the
+    packages that dominate it, so regressions from new module-level imports or side effects show up.
+
+    Usage:
+        PYTHONPATH=. python -m benchmarks.import_benchmark --runs 5
+    """
+    apps_dir = os.path.join(PROJECT_ROOT, "src", "apps")
+    default_app = next((name for name in sorted(os.listdir(apps_dir))
+                        if os.path.exists(os.path.join(apps_dir, name, "frontend.py"))), None)
+
+    parser = argparse.ArgumentParser(description=main.__doc__)
+    parser.add_argument("--runs", type=int, default=5, help="Fresh interpreters per target.")
+    parser.add_argument("--app", default=default_app, help="Generated app whose frontend is imported.")
+    parser.add_argument("--top", type=int, default=8, help="Packages listed per target.")
+    args = parser.parse_args()
+
+    targets = ["src.workflow.app"]
+    if args.app:
+        targets.append(f"src.apps.{args.app}.frontend")
+
+    for module in targets:
+        _import_once(module)  # warm the bytecode cache so runs measure imports, not compilation
+        runs = [_import_once(module) for _ in range(args.runs)]
+        wall = statistics.median(elapsed for elapsed, _ in runs)
+        import_us = statistics.median(sum(self_times.values()) for _, self_times in runs)
+
+        print(f"{module}: wall {wall * 1000:.0f} ms, imports {import_us / 1000:.0f} ms, {len(runs[-1][1])} modules")
+        for package, self_us in _by_package(runs[-1][1])[:args.top]:
+            print(f"    {package:<40}{self_us / 1000:>8.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
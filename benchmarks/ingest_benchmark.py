@@ -0,0 +1,85 @@
+from benchmarks.common import use_database
+from benchmarks.common import make_row
+from benchmarks.common import write_csv
+import subprocess
+import argparse
+import tempfile
+import resource
+import random
+import json
+import time
+import sys
+import os
+
+
+def _peak_rss_mb() -> float:
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is reported in bytes on macOS and kilobytes on Linux.
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def _worker(csv_path: str, db_path: str) -> None:
+    use_database(db_path)
+    from src.db.crud import ingest_csv
+
+    baseline_rss = _peak_rss_mb()
+    start = time.perf_counter()
+    success, message, counts = ingest_csv(csv_path)
+    elapsed = time.perf_counter() - start
+    print(json.dumps({
+        "success": success,
+        "message": message,
+        "rows": counts.get("rows", 0),
+        "seconds": elapsed,
+        "rows_per_second": counts.get("rows_per_second", 0),
+        "baseline_rss_mb": baseline_rss,
+        "peak_rss_mb": _peak_rss_mb(),
+    }))
+
+
+def main() -> None:
+    """
+    Measures peak RSS and throughput of streaming CSV ingestion for catalogs of increasing size. Each size
+    is ingested into a fresh database in a separate process so peak RSS is not shared between runs.
+
+    Usage:
+        PYTHONPATH=. python -m benchmarks.ingest_benchmark --sizes-mb 10 100 1000
+    """
+    parser = argparse.ArgumentParser(description=main.__doc__)
+    parser.add_argument("--sizes-mb", type=int, nargs="+", default=[10, 100, 1000], help="CSV sizes to generate.")
+    parser.add_argument("--worker", nargs=2, metavar=("CSV", "DB"), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        _worker(*args.worker)
+        return
+
+    bytes_per_row = len(",".join(make_row(0, random.Random(0)))) + 1
+
+    print(f"{'csv MB':>8}{'rows':>12}{'seconds':>10}{'rows/s':>12}{'peak RSS MB':>14}{'ingest RSS MB':>15}")
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for size_mb in args.sizes_mb:
+            csv_path = os.path.join(tmp_dir, f"catalog_{size_mb}mb.csv")
+            db_path = os.path.join(tmp_dir, f"catalog_{size_mb}mb.db")
+            write_csv(csv_path, rows=size_mb * 1024 * 1024 // bytes_per_row)
+
+            output = subprocess.run(
+                [sys.executable, "-m", "benchmarks.ingest_benchmark", "--worker", csv_path, db_path],
+                capture_output=True, text=True, check=True
+            ).stdout.strip().splitlines()[-1]
+            result = json.loads(output)
+            if not result["success"]:
+                print(f"{size_mb:>8} failed: {result['message']}")
+                continue
+
+            actual_mb = os.path.getsize(csv_path) / (1024 * 1024)
+            print(
+                f"{actual_mb:>8.0f}{result['rows']:>12}{result['seconds']:>10.1f}{result['rows_per_second']:>12}"
+                f"{result['peak_rss_mb']:>14.0f}{result['peak_rss_mb'] - result['baseline_rss_mb']:>15.0f}"
+            )
+            os.remove(csv_path)
+            os.remove(db_path)
+
+
+if __name__ == "__main__":
+    main()
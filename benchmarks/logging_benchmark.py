@@ -0,0 +1,122 @@
+from concurrent.futures import ThreadPoolExecutor
+from types import SimpleNamespace
+from typing import Callable
+import statistics
+import argparse
+import tempfile
+import logging
+import time
+import sys
+import os
+
+
+MODEL_ID = "gemini-2.0-flash-exp"
+
+
+class _FakeClient:
+    """
+    Stands in for the GenAI client so only the logging around a call is measured.
+    """
+    def __init__(self, response_chars: int) -> None:
+        response = SimpleNamespace(text=("lorem ipsum dolor sit amet " * (response_chars // 27 + 1))[:response_chars])
+        self.models = SimpleNamespace(generate_content=lambda model, contents: response)
+
+
+def _legacy_setup(log_dir: str) -> None:
+    """
+    The previous configuration: handlers write synchronously on the logging thread, and a record
+    factory shortens every record's path.
+    """
+    from src.config.logging import custom_path_filter
+    import src.config.logging as app_logging
+
+    class CustomLogRecord(logging.LogRecord):
+        def __init__(self, *args, **kwargs):
+            super().__init__(*args, **kwargs)
+            self.pathname = custom_path_filter(self.pathname)
+
+    app_logging.stop_logging()
+    root = logging.getLogger()
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+    logging.setLogRecordFactory(CustomLogRecord)
+    logging.basicConfig(
+        level=logging.INFO,
+        format="%(asctime)s [%(levelname)s] [%(module)s] [%(pathname)s]: %(message)s",
+        handlers=[logging.StreamHandler(), logging.FileHandler(os.path.join(log_dir, "app.log"))]
+    )
+
+
+def _legacy_generate_content(client, model_id: str, prompt: str):
+    logger = logging.getLogger()
+    logger.info(f"Generating content using model: {model_id}")
+    start_time = time.time()
+    response = client.models.generate_content(model=model_id, contents=prompt)
+    logger.info(f"Content generated successfully in {time.time() - start_time:.2f} seconds.")
+    logger.info(f"Response: {response.text.strip()}")
+    return response
+
+
+def _measure(generate: Callable, client: _FakeClient, calls: int, threads: int) -> list:
+    def timed_call(_: int) -> float:
+        start = time.perf_counter()
+        generate(client, MODEL_ID, "prompt")
+        return time.perf_counter() - start
+
+    with ThreadPoolExecutor(max_workers=threads) as pool:
+        return list(pool.map(timed_call, range(calls)))
+
+
+def main() -> None:
+    """
+    Measures the logging overhead `generate_content` adds to each LLM call, for the previous synchronous
+    configuration (whole response logged at INFO) and the queued one, with concurrent callers as in
+    background builds. The queued run includes the trace span around each call (disable with
+    APP_BUILDER_TRACE=0). The client is a stand-in that returns a canned response immediately. Console
+    output goes to /dev/null, so the numbers understate the synchronous cost on a real terminal.
+
+    Usage:
+        PYTHONPATH=. python -m benchmarks.logging_benchmark --calls 2000 --response-chars 8000 --threads 4
+    """
+    parser = argparse.ArgumentParser(description=main.__doc__)
+    parser.add_argument("--calls", type=int, default=2000, help="LLM calls per configuration.")
+    parser.add_argument("--response-chars", type=int, default=8000, help="Size of each canned response.")
+    parser.add_argument("--threads", type=int, default=4, help="Concurrent callers.")
+    args = parser.parse_args()
+
+    client = _FakeClient(args.response_chars)
+    stderr, sys.stderr = sys.stderr, open(os.devnull, "w")
+    try:
+        import src.config.logging as app_logging
+        import src.utils.tracing as tracing
+        from src.llm.gemini_text import generate_content
+
+        results = {}
+        with tempfile.TemporaryDirectory() as log_dir:
+            tracing.TRACE_SPANS_PATH = os.path.join(log_dir, "spans.jsonl")
+            _legacy_setup(log_dir)
+            results["synchronous"] = (_measure(_legacy_generate_content, client, args.calls, args.threads), 0.0)
+
+            logging.setLogRecordFactory(logging.LogRecord)
+            app_logging.setup_logger(log_dir=log_dir)
+            latencies = _measure(generate_content, client, args.calls, args.threads)
+            start = time.perf_counter()
+            app_logging.stop_logging()  # wait for the listener to write everything queued
+            tracing.flush_spans()
+            results["queued"] = (latencies, time.perf_counter() - start)
+    finally:
+        sys.stderr.close()
+        sys.stderr = stderr
+
+    print(f"{'config':<14}{'mean us':>10}{'p50 us':>10}{'p99 us':>10}{'drain ms':>10}")
+    for name, (latencies, drain) in results.items():
+        latencies = sorted(latencies)
+        p99 = latencies[int(len(latencies) * 0.99) - 1]
+        print(
+            f"{name:<14}{statistics.mean(latencies) * 1e6:>10.1f}{statistics.median(latencies) * 1e6:>10.1f}"
+            f"{p99 * 1e6:>10.1f}{drain * 1000:>10.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
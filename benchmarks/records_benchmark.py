@@ -0,0 +1,54 @@
+from benchmarks.common import make_catalog
+from benchmarks.common import use_database
+import tracemalloc
+import argparse
+import tempfile
+import time
+import os
+
+
+def _measure(fn) -> tuple:
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = fn()
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return len(result), elapsed, peak
+
+
+def main() -> None:
+    """
+    Compares loading the whole catalog as full entry dicts (`fetch_db_entries`) against summary and full
+    `ApiEntry` records (`fetch_entry_records`), reporting wall time and peak Python allocations.
+
+    Usage:
+        PYTHONPATH=. python -m benchmarks.records_benchmark --rows 200000
+    """
+    parser = argparse.ArgumentParser(description=main.__doc__)
+    parser.add_argument("--rows", type=int, default=200000, help="Number of catalog rows.")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        db_path = os.path.join(tmp_dir, "apis.db")
+        make_catalog(db_path, args.rows, seed=0)
+        use_database(db_path)
+
+        from src.db.crud import fetch_entry_records
+        from src.db.crud import fetch_db_entries
+        from src.db.records import SUMMARY
+        from src.db.records import FULL
+
+        print(f"rows={args.rows}")
+        print(f"{'loader':<28}{'entries':>10}{'seconds':>10}{'peak MB':>10}")
+        for label, fn in (
+            ("fetch_db_entries (dicts)", fetch_db_entries),
+            ("records, full", lambda: fetch_entry_records(projection=FULL)),
+            ("records, summary", lambda: fetch_entry_records(projection=SUMMARY)),
+        ):
+            count, elapsed, peak = _measure(fn)
+            print(f"{label:<28}{count:>10}{elapsed:>10.2f}{peak / (1024 * 1024):>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+from benchmarks.common import make_catalog
+from benchmarks.common import use_database
+from benchmarks.common import make_apps
+from typing import Callable
+from typing import Dict
+import statistics
+import argparse
+import tempfile
+import time
+import os
+
+
+APP_SCRIPT = os.path.join("src", "workflow", "app.py")
+
+SAMPLE_IDEAS = [
+    {"title": f"Idea_{i}", "description": "A benchmark idea.", "apis_used": ["cat facts", "weather api 1"]}
+    for i in range(6)
+]
+
+
+def _sidebar_region():
+    from src.workflow.app import sidebar_app_runner
+    sidebar_app_runner()
+
+
+def _catalog_region():
+    from src.workflow.app import catalog_section
+    catalog_section()
+
+
+def _ideas_region():
+    from src.workflow.app import ideas_section
+    ideas_section()
+
+
+def _time_runs(at, repeats: int) -> float:
+    at.run()  # warm-up
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        at.run()
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings) * 1000
+
+
+def main() -> None:
+    """
+    Measures the median rerun time of the whole builder page against the rerun time of each fragment,
+    i.e. what an interaction costs before and after the page was split into fragments.
+
+    Usage:
+        PYTHONPATH=. python -m benchmarks.rerun_benchmark --rows 5000 --apps 50
+    """
+    from streamlit.testing.v1 import AppTest
+
+    parser = argparse.ArgumentParser(description=main.__doc__)
+    parser.add_argument("--rows", type=int, default=5000, help="Number of catalog rows.")
+    parser.add_argument("--apps", type=int, default=50, help="Number of generated apps.")
+    parser.add_argument("--repeats", type=int, default=10, help="Timed reruns per scenario.")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        db_path = os.path.join(tmp_dir, "apis.db")
+        make_catalog(db_path, args.rows)
+        make_apps(tmp_dir, args.apps)
+        use_database(db_path, project_root=tmp_dir)
+
+        available_apps = {
+            f"benchmark_app_{i}": os.path.join(tmp_dir, "src", "apps", f"benchmark_app_{i}", "frontend.py")
+            for i in range(args.apps)
+        }
+        base_state = {
+            "ideas": SAMPLE_IDEAS,
+            "selected_ideas": [],
+            "selected_entry_ids": set(),
+            "available_apps": available_apps,
+        }
+
+        scenarios: Dict[str, Callable[[], AppTest]] = {
+            "full page rerun": lambda: AppTest.from_file(APP_SCRIPT, default_timeout=60),
+            "sidebar app runner fragment": lambda: AppTest.from_function(_sidebar_region, default_timeout=60),
+            "catalog fragment": lambda: AppTest.from_function(_catalog_region, default_timeout=60),
+            "ideas grid fragment": lambda: AppTest.from_function(_ideas_region, default_timeout=60),
+        }
+
+        print(f"Catalog rows: {args.rows}, generated apps: {args.apps}, repeats: {args.repeats}")
+        print(f"{'scenario':<32}{'median ms':>12}")
+        for name, factory in scenarios.items():
+            at = factory()
+            for key, value in base_state.items():
+                at.session_state[key] = value
+            print(f"{name:<32}{_time_runs(at, args.repeats):>12.1f}")
+
+
+if __name__ == "__main__":
+    main()
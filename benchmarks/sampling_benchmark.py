@@ -0,0 +1,66 @@
+from benchmarks.common import make_catalog
+from benchmarks.common import use_database
+from collections import Counter
+import statistics
+import argparse
+import tempfile
+import random
+import time
+import os
+
+
+def _median_ms(fn, repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings) * 1000
+
+
+def main() -> None:
+    """
+    Compares sampling ideation entries in SQLite (`sample_entry_records`) against loading the whole catalog
+    and calling `random.sample`, and checks that the SQL sampler covers the catalog evenly.
+
+    Usage:
+        PYTHONPATH=. python -m benchmarks.sampling_benchmark --rows 1000000
+    """
+    parser = argparse.ArgumentParser(description=main.__doc__)
+    parser.add_argument("--rows", type=int, default=1000000, help="Number of catalog rows.")
+    parser.add_argument("--k", type=int, default=3, help="Entries per sample.")
+    parser.add_argument("--repeat", type=int, default=5, help="Runs of the full-load baseline.")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        db_path = os.path.join(tmp_dir, "apis.db")
+        make_catalog(db_path, args.rows, seed=0)
+        use_database(db_path)
+
+        from src.db.crud import sample_entry_records
+        from src.db.crud import fetch_entry_records
+        from src.db.crud import fetch_db_entries
+
+        print(f"rows={args.rows}, k={args.k}")
+        print(f"{'sampler':<36}{'median ms':>12}")
+        for label, fn, repeat in (
+            ("fetch_db_entries + random.sample", lambda: random.sample(fetch_db_entries(), args.k), args.repeat),
+            ("summary records + random.sample", lambda: random.sample(fetch_entry_records(), args.k), args.repeat),
+            ("sample_entry_records", lambda: sample_entry_records(args.k), 200),
+            ("sample_entry_records, stratified", lambda: sample_entry_records(args.k, stratify=True), 200),
+        ):
+            print(f"{label:<36}{_median_ms(fn, repeat):>12.2f}")
+
+        first = [entry.id for entry in sample_entry_records(args.k, seed=42)]
+        second = [entry.id for entry in sample_entry_records(args.k, seed=42)]
+        print(f"seeded samples repeat: {first == second}")
+
+        deciles = Counter()
+        for _ in range(2000):
+            for entry in sample_entry_records(args.k):
+                deciles[min(9, (entry.id - 1) * 10 // args.rows)] += 1
+        print("draws per id decile: " + " ".join(str(deciles[i]) for i in range(10)))
+
+
+if __name__ == "__main__":
+    main()
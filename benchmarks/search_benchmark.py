@@ -0,0 +1,77 @@
+from benchmarks.common import make_catalog
+from benchmarks.common import use_database
+from typing import List
+import statistics
+import argparse
+import tempfile
+import time
+import os
+
+
+QUERIES = [
+    "weather",
+    "finance resource",
+    "music api 1200",
+    "pagination",
+    "resource12345",
+    "travel filtering support",
+]
+
+
+def _time_queries(fn, queries: List[str], repeat: int) -> List[float]:
+    latencies = []
+    for _ in range(repeat):
+        for query in queries:
+            start = time.perf_counter()
+            fn(query)
+            latencies.append(time.perf_counter() - start)
+    return latencies
+
+
+def main() -> None:
+    """
+    Compares catalog search latency of the FTS5 index (`fetch_entries_page` with a text filter, as the
+    catalog view searches, BM25-ranked) against the LIKE scan it replaces, on a synthetic catalog.
+
+    Usage:
+        PYTHONPATH=. python -m benchmarks.search_benchmark --rows 100000
+    """
+    parser = argparse.ArgumentParser(description=main.__doc__)
+    parser.add_argument("--rows", type=int, default=100000, help="Number of catalog rows.")
+    parser.add_argument("--limit", type=int, default=20, help="Results per query.")
+    parser.add_argument("--repeat", type=int, default=20, help="Times each query is run.")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        db_path = os.path.join(tmp_dir, "apis.db")
+        make_catalog(db_path, args.rows, seed=0)
+        use_database(db_path)  # migrates the legacy table and builds the FTS index
+
+        import src.db.crud as crud
+
+        def like_search(query: str) -> None:
+            with crud.get_engine().connect() as conn:
+                conn.execute(
+                    crud.text(
+                        f"SELECT id, {crud.ENTRY_COLUMN_LIST} FROM apientry "
+                        "WHERE name LIKE :q OR category LIKE :q OR description LIKE :q "
+                        "ORDER BY id LIMIT :limit"
+                    ),
+                    {"q": f"%{query}%", "limit": args.limit}
+                ).fetchall()
+
+        print(f"rows={args.rows}, limit={args.limit}, repeat={args.repeat}")
+        print(f"{'query':<28}{'hits':>6}{'fts p50 ms':>12}{'like p50 ms':>13}")
+        fts_all, like_all = [], []
+        for query in QUERIES:
+            hits = len(crud.fetch_entries_page(0, args.limit, text_filter=query))
+            fts = _time_queries(lambda q: crud.fetch_entries_page(0, args.limit, text_filter=q), [query], args.repeat)
+            like = _time_queries(like_search, [query], args.repeat)
+            fts_all.extend(fts)
+            like_all.extend(like)
+            print(f"{query:<28}{hits:>6}{statistics.median(fts) * 1000:>12.2f}{statistics.median(like) * 1000:>13.2f}")
+        print(f"{'all':<28}{'':>6}{statistics.median(fts_all) * 1000:>12.2f}{statistics.median(like_all) * 1000:>13.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,32 +1,41 @@
-from src.config.setup import initialize_genai_client
-from src.db.crud import fetch_db_entries_by_names
+from src.config.setup import get_genai_client
+from src.db.crud import sample_entry_records
+from src.db.crud import fetch_entry_records
+from src.db.records import ApiEntry
 from src.llm.gemini_text import generate_content
+from src.utils.tracing import annotate
+from src.utils.tracing import traced
+from src.utils.templates import templates
 from src.config.setup import TEMPLATES_DIR
-from src.db.crud import fetch_db_entries
 from src.config.logging import logger
 from src.config.setup import MODEL
 from typing import Tuple
+from typing import Union
 from typing import Dict 
 from typing import List 
 import pandas as pd
-import random
 import re
 
 # File paths for templates
 IDEATE_TEMPLATE_PATH = TEMPLATES_DIR + '/ideate.txt'
 BUILD_TEMPLATE_PATH = TEMPLATES_DIR + '/build.txt'
 
+# Templates are parsed once (and again only when their file changes) and must use exactly these placeholders.
+templates.register("ideate", IDEATE_TEMPLATE_PATH, fields=["apis_summary", "num_ideas"])
+templates.register("build", BUILD_TEMPLATE_PATH, fields=["ideas_text", "entries_text", "app_name_slug"])
+
 # Markers for code extraction
 FRONTEND_MARKERS = ("---BEGIN FRONTEND CODE---", "---END FRONTEND CODE---")
 BACKEND_MARKERS = ("---BEGIN BACKEND CODE---", "---END BACKEND CODE---")
 
 
-def build_prompt(entries: List[Dict[str, str]], num_ideas: int) -> str:
+def build_prompt(entries: List[Union[ApiEntry, Dict[str, str]]], num_ideas: int) -> str:
     """
     Builds a prompt using provided API entries and the number of ideas to generate.
 
     Args:
-        entries (List[Dict[str, str]]): List of API entry dictionaries containing name, category, and description.
+        entries (List[Union[ApiEntry, Dict[str, str]]]): API entry records or dictionaries containing name,
+            category, and description. Only these summary fields are read.
         num_ideas (int): Number of ideas to generate.
 
     Returns:
@@ -38,14 +47,12 @@ def build_prompt(entries: List[Dict[str, str]], num_ideas: int) -> str:
     ])
 
     try:
-        with open(IDEATE_TEMPLATE_PATH, 'r', encoding='utf-8') as f:
-            template = f.read()
-        logger.info("Prompt template loaded successfully.")
+        template = templates.get("ideate")
     except FileNotFoundError as e:
         logger.error(f"Ideation template file not found: {e}")
         raise
 
-    return template.format(apis_summary=apis_summary, num_ideas=num_ideas).strip()
+    return template.render(apis_summary=apis_summary, num_ideas=num_ideas).strip()
 
 
 def extract_ideas_from_response(response: str) -> List[Dict[str, List[str]]]:
@@ -94,34 +101,43 @@ def extract_ideas_from_response(response: str) -> List[Dict[str, List[str]]]:
     return ideas
 
 
-def generate_ideas(num_ideas: int = 3, selected_names: List[str] = None) -> List[Dict[str, List[str]]]:
+@traced()
+def generate_ideas(
+    num_ideas: int = 3,
+    selected_names: List[str] = None,
+    selected_ids: List[int] = None
+) -> List[Dict[str, List[str]]]:
     """
     Generates a specified number of ideas based on API entries.
 
     Args:
         num_ideas (int, optional): Number of ideas to generate. Defaults to 3.
         selected_names (List[str], optional): List of specific API names to fetch. Defaults to None.
+        selected_ids (List[int], optional): List of specific API entry ids to fetch. Takes precedence
+            over `selected_names`. Defaults to None.
 
     Returns:
         List[Dict[str, List[str]]]: List of generated ideas.
     """
     try:
-        if selected_names:
-            entries = fetch_db_entries_by_names(selected_names)
+        # The prompt only uses the summary columns, so the heavy example payloads are never read.
+        if selected_ids:
+            entries = fetch_entry_records(ids=selected_ids)
+        elif selected_names:
+            entries = fetch_entry_records(names=selected_names)
         else:
-            all_entries = fetch_db_entries()
-            if not all_entries:
+            entries = sample_entry_records(k=3)
+            if not entries:
                 logger.warning("No API entries available.")
                 return [{
                     "title": "No APIs Found",
                     "description": "No entries available.",
                     "apis_used": []
                 }]
-            sample_size = min(3, len(all_entries))
-            entries = random.sample(all_entries, sample_size)
 
+        annotate(num_ideas=num_ideas, entries=len(entries))
         prompt = build_prompt(entries, num_ideas)
-        client = initialize_genai_client()
+        client = get_genai_client()
         response = generate_content(client, MODEL, prompt)
         logger.info("Generated ideas successfully.")
         return extract_ideas_from_response(response.text)
@@ -153,6 +169,7 @@ def extract_code_block(response: str, markers: Tuple[str, str]) -> str:
         return f"# No code block found for section: {start_marker}"
 
 
+@traced()
 def build_app_code(selected_ideas: List[Dict[str, List[str]]], app_name_slug: str, entries: pd.DataFrame) -> Tuple[str, str]:
     """
     Builds frontend and backend code for an application based on selected ideas and entries.
@@ -166,7 +183,7 @@ def build_app_code(selected_ideas: List[Dict[str, List[str]]], app_name_slug: st
         Tuple[str, str]: Frontend and backend code blocks as strings.
     """
     try:
-        client = initialize_genai_client()
+        client = get_genai_client()
         ideas_summary = "\n\n".join([
             f"Title: {idea['title']}\nDescription: {idea['description']}\nAPIs Used: {', '.join(idea['apis_used'])}"
             for idea in selected_ideas
@@ -176,10 +193,8 @@ def build_app_code(selected_ideas: List[Dict[str, List[str]]], app_name_slug: st
         if not entries.empty:
             apis_summary = "APIs Table:\n" + entries.to_csv(index=False)
 
-        with open(BUILD_TEMPLATE_PATH, 'r', encoding='utf-8') as f:
-            template = f.read()
-
-        prompt = template.format(ideas_text=ideas_summary, entries_text=apis_summary, app_name_slug=app_name_slug)
+        prompt = templates.render("build", ideas_text=ideas_summary, entries_text=apis_summary, app_name_slug=app_name_slug)
+        annotate(app_name_slug=app_name_slug, prompt_chars=len(prompt))
         response = generate_content(client, MODEL, prompt)
 
         frontend_code = extract_code_block(response.text, FRONTEND_MARKERS)
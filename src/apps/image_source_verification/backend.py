@@ -1,4 +1,5 @@
 import requests
+from src.utils import serp_cache
 from typing import Dict, List, Optional
 from src.config.setup import get_serp_api_key
 from src.config.logging import logger
@@ -28,9 +29,7 @@ def search_images(query: str) -> Optional[Dict]:
         "gl": "us"
     }
     try:
-        response = requests.get(url, params=params)
-        response.raise_for_status()  # Raise an exception for bad status codes
-        data = response.json()
+        data = serp_cache.search(params, url=url)
         if data and data.get('images_results'):
            return data
         else:
@@ -90,9 +89,7 @@ def search_text_from_keywords(keywords: List[str]) -> Optional[Dict]:
     }
 
     try:
-        response = requests.get(url, params=params)
-        response.raise_for_status()  # Raise an exception for bad status codes
-        data = response.json()
+        data = serp_cache.search(params, url=url)
         if data and data.get('organic_results'):
             return data
         else:
@@ -1,6 +1,9 @@
 import requests
+from src.utils import serp_cache
 from typing import Dict, Optional, List
 from src.config.setup import get_serp_api_key
+from src.config.setup import FANOUT_DEADLINE_SECONDS
+from src.utils.fanout import FanOut
 from src.config.logging import logger
 import json
 
@@ -22,9 +25,7 @@ def fetch_data_from_serp(url: str, params: Dict) -> Optional[dict]:
 
     params['api_key'] = api_key
     try:
-        response = requests.get(url, params=params)
-        response.raise_for_status()  # Raise HTTPError for bad responses (4xx or 5xx)
-        return response.json()
+        return serp_cache.search(params, url=url)
     except requests.exceptions.RequestException as e:
         logger.error(f"Error during API request: {e}")
         return None
@@ -103,37 +104,53 @@ def get_finance_data(business_type: str) -> Optional[List[dict]]:
         logger.warning(f"No finance data found for {business_type}")
         return None
 
-def get_business_investment_data(business_type: str, location: str) -> Optional[Dict]:
+def get_business_investment_data(
+    business_type: str,
+    location: str,
+    deadline_seconds: float = FANOUT_DEADLINE_SECONDS
+) -> Optional[Dict]:
     """
     Orchestrates the retrieval of business information and financial data.
 
+    The finance lookup runs alongside the local search, and the detail lookups of all places run
+    concurrently as soon as the local search returns, so the total time is close to that of the slowest
+    single request. Whatever has not returned by the deadline is left out.
+
     Args:
         business_type (str): The type of business to analyze.
         location (str): The location to search in.
+        deadline_seconds (float): Time budget for all requests together.
 
     Returns:
-        Optional[Dict]: A dictionary containing business information and financial data.
-                        Returns None if an error occurs.
+        Optional[Dict]: A dictionary containing the local results, their details keyed by place ID,
+                        financial data and whether any request missed the deadline.
+                        Returns None if no local businesses were found.
     """
-    local_results = search_local_businesses(business_type, location)
-    if not local_results:
-        return None
-
-    business_details_list = []
-    for result in local_results:
-        place_id = result.get('place_id')
-        if place_id:
-            business_details = get_business_details(place_id)
-            business_details_list.append(business_details)
-        else:
-           logger.warning(f"No place ID found for result: {result}")
-
-    finance_data = get_finance_data(business_type)
-
-
+    with FanOut(timeout=deadline_seconds, name="business-investment") as fanout:
+        fanout.submit("finance", get_finance_data, business_type)
+        fanout.submit("local", search_local_businesses, business_type, location)
+        local_results = fanout.result("local")
+        if not local_results:
+            return None
+
+        for result in local_results:
+            place_id = result.get('place_id')
+            if not place_id:
+                logger.warning(f"No place ID found for result: {result}")
+            elif ("details", place_id) not in fanout:
+                fanout.submit(("details", place_id), get_business_details, place_id)
+
+        outcome = fanout.collect()
+
+    business_details = {
+        key[1]: details for key, details in outcome.results.items()
+        if isinstance(key, tuple) and details
+    }
     response = {
          "local_results": local_results,
-         "finance_data": finance_data,
+         "business_details": business_details,
+         "finance_data": outcome.results.get("finance"),
+         "partial": not outcome.complete,
     }
 
-    return response
\ No newline at end of file
+    return response
@@ -1,10 +1,10 @@
 import streamlit as st
 from src.apps.local_business_investment_analyzer import backend
 from src.llm.gemini_text import generate_content
-from src.config.setup import initialize_genai_client
+from src.config.setup import get_genai_client
 from src.config.logging import logger
+from src.utils import serp_render
 
-gemini_client = initialize_genai_client()
 MODEL_ID = "gemini-2.0-flash-exp"
 
 def process_with_gemini(prompt: str) -> str:
@@ -18,7 +18,7 @@ def process_with_gemini(prompt: str) -> str:
         str: The text response from Gemini.
     """
     try:
-        response = generate_content(gemini_client, MODEL_ID, prompt)
+        response = generate_content(get_genai_client(), MODEL_ID, prompt)
         return response.text
     except Exception as e:
         logger.error(f"Error processing with Gemini: {e}")
@@ -37,32 +37,28 @@ def display_business_info(business_info: dict):
     
     st.subheader(business_info.get("title", "Business Information"))
     
-    if "local_results" in business_info and business_info["local_results"]:
-      for result in business_info["local_results"]:
-          st.markdown(f"**Name:** {result.get('title', 'N/A')}")
-          st.markdown(f"**Address:** {result.get('address', 'N/A')}")
-          st.markdown(f"**Phone:** {result.get('phone', 'N/A')}")
-          st.markdown(f"**Rating:** {result.get('rating', 'N/A')}")
-          st.markdown(f"**Reviews:** {result.get('reviews', 'N/A')}")
-          st.markdown(f"**Website:** {result.get('website', 'N/A')}")
-          st.markdown("---")
-    else:
-        st.write("No specific local results found.")
-    
-    if 'finance_data' in business_info and business_info['finance_data']:
-        st.subheader("Financial Data:")
-        financial_data = business_info['finance_data']
-        if isinstance(financial_data, list):
-             for data in financial_data:
-                st.markdown(f"**Symbol:** {data.get('symbol', 'N/A')}")
-                st.markdown(f"**Price:** {data.get('price', 'N/A')}")
-                st.markdown(f"**Change:** {data.get('change', 'N/A')}")
-                st.markdown(f"**Change Percent:** {data.get('changePercent', 'N/A')}")
-                st.markdown("---")
-        else:
-            st.write("Financial data not in list format")
-    else:
-        st.write("No financial data available.")
+    if business_info.get("partial"):
+        st.warning("Some lookups took too long and were skipped; the results below may be incomplete.")
+
+    business_details = business_info.get("business_details") or {}
+    local_results = []
+    for result in business_info.get("local_results") or []:
+        details = business_details.get(result.get('place_id')) or {}
+        local_results.append({
+            **result,
+            "description": details.get('description') or result.get('description'),
+            "hours": details.get('hours') or result.get('hours'),
+        })
+    serp_render.render_table(
+        {"local_results": local_results}, "local", limit=20,
+        empty_message="No specific local results found."
+    )
+
+    st.subheader("Financial Data:")
+    serp_render.render_table(
+        {"markets": business_info.get("finance_data")}, "markets", limit=10,
+        empty_message="No financial data available."
+    )
 
 def main():
     """
@@ -71,12 +67,13 @@ def main():
     - Configure and render the user interface
     - Handle user inputs and interactions
     - Process and display data from backend
-    - Format JSON responses using Gemini
+    - Summarize results using Gemini when asked to
     """
     st.title("Local Business Investment Analyzer")
 
     business_type = st.text_input("Enter business type (e.g., restaurant, cafe):", "restaurant")
     location = st.text_input("Enter location (e.g., New York, NY):", "New York, NY")
+    summarize = st.toggle("Summarize with Gemini", value=False)
 
     if st.button("Analyze"):
         if not business_type or not location:
@@ -88,10 +85,11 @@ def main():
                 business_info = backend.get_business_investment_data(business_type, location)
 
                 if business_info:
-                    prompt = f"Format this business information into a user-friendly summary, especially the JSON data. Format for optimal reading and comprehension: {business_info}"
-                    formatted_info = process_with_gemini(prompt)
-                    st.write(formatted_info)
                     display_business_info(business_info)
+                    if summarize:
+                        prompt = f"Summarize the investment potential of these businesses and the related market data for an investor: {business_info}"
+                        st.subheader("Summary")
+                        st.write(process_with_gemini(prompt))
 
                 else:
                     st.error("Could not retrieve business information.")
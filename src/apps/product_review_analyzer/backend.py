@@ -1,4 +1,5 @@
 import requests
+from src.utils import serp_cache
 from typing import Dict, Optional
 from src.config.setup import get_serp_api_key
 from src.config.logging import logger
@@ -17,9 +18,7 @@ def _make_api_request(url: str, params: Dict) -> Optional[Dict]:
         Optional[Dict]: The JSON response as a dictionary, or None if an error occurs.
     """
     try:
-        response = requests.get(url, params=params)
-        response.raise_for_status()
-        return response.json()
+        return serp_cache.search(params, url=url)
     except requests.exceptions.RequestException as e:
         logger.error(f"API request failed: {e}")
         return None
@@ -1,11 +1,12 @@
 import streamlit as st
 from src.apps.product_review_analyzer import backend
 from src.llm.gemini_text import generate_content
-from src.config.setup import initialize_genai_client
+from src.config.setup import get_genai_client
 from src.config.logging import logger
-import json
+from src.utils.fanout import FanOut
+from src.utils import serp_render
+from typing import Optional
 
-gemini_client = initialize_genai_client()
 MODEL_ID = "gemini-2.0-flash-exp"
 
 def process_with_gemini(prompt: str) -> str:
@@ -19,92 +20,55 @@ def process_with_gemini(prompt: str) -> str:
         str: The formatted response from Gemini.
     """
     try:
-        response = generate_content(gemini_client, MODEL_ID, prompt)
+        response = generate_content(get_genai_client(), MODEL_ID, prompt)
         return response.text
     except Exception as e:
         logger.error(f"Error processing with Gemini: {e}")
         return "Error generating formatted response."
     
-def display_search_results(results: dict, search_type: str) -> None:
+# Search type -> (heading, backend search, result kind for serp_render, what the summary prompt covers, message when there are no results)
+SEARCHES = {
+    "Google Shopping": ("Top Google Shopping Results:", backend.search_google_shopping, "shopping", "product shopping results", "No shopping results available"),
+    "Walmart Basic Search": ("Top Walmart Results:", backend.search_walmart, "walmart", "product results", "No Walmart search results available"),
+    "Google Search Results": ("Top Google Search Results:", backend.search_google, "organic", "Google search results", "No Google search results available"),
+    "Google Local Basic Search": ("Top Google Local Results:", backend.search_google_local, "local", "local search results", "No local results available"),
+}
+
+# Time budget for all searches and summaries of one product query.
+PIPELINE_DEADLINE_SECONDS = 60.0
+
+def build_summary_prompt(results: dict, search_type: str) -> Optional[str]:
     """
-    Displays search results in a user-friendly format, using Gemini for formatting JSON if needed.
+    Builds the Gemini prompt summarizing the top results of a search.
 
     Args:
-        results (dict): The search results to display.
-        search_type (str): The type of search performed (e.g., 'Google Shopping', 'Walmart').
-    """
-    try:
-        if not results:
-            st.write("No results found.")
-            return
-
-        if search_type == "Google Shopping":
-            st.subheader("Top Google Shopping Results:")
-            if "shopping_results" in results and results["shopping_results"]:
-              
-              formatted_results = []
-              for item in results["shopping_results"][:5]:
-                formatted_results.append(f"Title: {item.get('title', 'N/A')}, Price: {item.get('price', 'N/A')}, Link: {item.get('link', 'N/A')}")
-
-              prompt = f"Summarize the following product shopping results:\n {formatted_results}"
-              formatted_text = process_with_gemini(prompt)
-              st.write(formatted_text)
-
-            else:
-              st.write("No shopping results available")
-
-
-        elif search_type == "Walmart Basic Search":
-          st.subheader("Top Walmart Results:")
-          if "organic_results" in results and results["organic_results"]:
-            
-            formatted_results = []
-            for item in results["organic_results"][:5]:
-              formatted_results.append(f"Title: {item.get('title', 'N/A')}, Price: {item.get('price', 'N/A')}, Link: {item.get('link', 'N/A')}")
-            prompt = f"Summarize the following product results:\n {formatted_results}"
-            formatted_text = process_with_gemini(prompt)
-            st.write(formatted_text)
-
-          else:
-            st.write("No Walmart search results available")
-
-
-        elif search_type == "Google Search Results":
-            st.subheader("Top Google Search Results:")
-            if "organic_results" in results and results["organic_results"]:
-              formatted_results = []
-              for item in results["organic_results"][:5]:
-                formatted_results.append(f"Title: {item.get('title', 'N/A')}, Link: {item.get('link', 'N/A')}")
-
-              prompt = f"Summarize the following Google search results:\n {formatted_results}"
-              formatted_text = process_with_gemini(prompt)
-              st.write(formatted_text)
-            else:
-              st.write("No Google search results available")
+        results (dict): The search results.
+        search_type (str): The type of search performed (e.g., 'Google Shopping', 'Walmart Basic Search').
 
+    Returns:
+        Optional[str]: The prompt, or None if the search returned nothing to summarize.
+    """
+    if not results:
+        return None
+
+    formatted_results = []
+    if search_type == "Google Shopping":
+        for item in results.get("shopping_results") or []:
+            formatted_results.append(f"Title: {item.get('title', 'N/A')}, Price: {item.get('price', 'N/A')}, Link: {item.get('link', 'N/A')}")
+    elif search_type == "Walmart Basic Search":
+        for item in results.get("organic_results") or []:
+            formatted_results.append(f"Title: {item.get('title', 'N/A')}, Price: {item.get('price', 'N/A')}, Link: {item.get('link', 'N/A')}")
+    elif search_type == "Google Search Results":
+        for item in results.get("organic_results") or []:
+            formatted_results.append(f"Title: {item.get('title', 'N/A')}, Link: {item.get('link', 'N/A')}")
+    elif search_type == "Google Local Basic Search":
+        for item in results.get("local_results") or []:
+            formatted_results.append(f"Title: {item.get('title', 'N/A')}, Rating: {item.get('rating', 'N/A')}, Address: {item.get('address', 'N/A')}")
+
+    if not formatted_results:
+        return None
+    return f"Summarize the following {SEARCHES[search_type][3]}:\n {formatted_results[:5]}"
 
-        elif search_type == "Google Local Basic Search":
-          st.subheader("Top Google Local Results:")
-          if "local_results" in results and results["local_results"]:
-
-            formatted_results = []
-            for item in results["local_results"][:5]:
-                formatted_results.append(f"Title: {item.get('title', 'N/A')}, Rating: {item.get('rating', 'N/A')}, Address: {item.get('address', 'N/A')}")
-            prompt = f"Summarize the following local search results:\n {formatted_results}"
-            formatted_text = process_with_gemini(prompt)
-            st.write(formatted_text)
-
-          else:
-            st.write("No local results available")
-
-
-        else:
-            st.write("Unsupported search type.")
-
-    except Exception as e:
-      logger.error(f"Error displaying search results: {e}")
-      st.error("Error occurred while displaying results.")
-    
 
 def main():
     """
@@ -113,54 +77,63 @@ def main():
     - Configure and render the user interface
     - Handle user inputs and interactions
     - Process and display data from backend
-    - Format JSON responses using Gemini
+    - Summarize results using Gemini when asked to
+
+    The four searches run concurrently and each table is shown as soon as its search returns. With
+    summaries enabled, each summary starts as soon as its search returns and is shown when ready.
     """
     st.title("Product Review Analyzer")
 
     product_name = st.text_input("Enter product name:", "")
+    summarize = st.toggle("Summarize results with Gemini", value=False)
 
     if product_name:
         st.subheader("Searching for: " + product_name)
 
-        # Google Shopping Search
-        st.write("Fetching Google Shopping results...")
-        try:
-            shopping_results = backend.search_google_shopping(product_name)
-            display_search_results(shopping_results, "Google Shopping")
-        except Exception as e:
-            logger.error(f"Error during Google Shopping search: {e}")
-            st.error("Error fetching Google Shopping results.")
-
-
-        # Walmart Search
-        st.write("Fetching Walmart results...")
-        try:
-          walmart_results = backend.search_walmart(product_name)
-          display_search_results(walmart_results, "Walmart Basic Search")
-        except Exception as e:
-          logger.error(f"Error during Walmart search: {e}")
-          st.error("Error fetching Walmart results")
-
-
-        # Google Search
-        st.write("Fetching Google Search results...")
-        try:
-            google_search_results = backend.search_google(product_name)
-            display_search_results(google_search_results, "Google Search Results")
-        except Exception as e:
-            logger.error(f"Error during Google search: {e}")
-            st.error("Error fetching Google Search results.")
-
-
-        # Google Local Search
-        st.write("Fetching Google Local results...")
-        try:
-          google_local_results = backend.search_google_local(product_name)
-          display_search_results(google_local_results, "Google Local Basic Search")
-        except Exception as e:
-          logger.error(f"Error during Google Local search: {e}")
-          st.error("Error fetching Google Local results")
+        # Streamlit elements can only be written from the script thread, so the sections are laid out
+        # up front (two per row) and filled in here as the background calls finish.
+        tables, summaries = {}, {}
+        search_types = list(SEARCHES)
+        for start in range(0, len(search_types), 2):
+            for column, search_type in zip(st.columns(2), search_types[start:start + 2]):
+                with column:
+                    st.subheader(SEARCHES[search_type][0])
+                    tables[search_type] = st.empty()
+                    summaries[search_type] = st.empty()
+                    tables[search_type].write(f"Fetching {search_type} results...")
+
+        searched, done = set(), set()
+        with FanOut(timeout=PIPELINE_DEADLINE_SECONDS, name="product-review") as fanout:
+            for search_type, (_, search, _, _, _) in SEARCHES.items():
+                fanout.submit(("search", search_type), search, product_name)
+
+            for (stage, search_type), value, error in fanout.as_completed():
+                if stage == "summary":
+                    summaries[search_type].write(value)
+                    done.add(search_type)
+                    continue
+                if error is not None:
+                    logger.error(f"Error during {search_type} search: {error}")
+                    tables[search_type].error(f"Error fetching {search_type} results.")
+                    done.add(search_type)
+                    continue
+
+                searched.add(search_type)
+                _, _, kind, _, no_results_message = SEARCHES[search_type]
+                with tables[search_type].container():
+                    serp_render.render_table(value, kind, empty_message=no_results_message if value else "No results found.")
+                prompt = build_summary_prompt(value, search_type) if summarize else None
+                if prompt is None:
+                    done.add(search_type)
+                else:
+                    summaries[search_type].write(f"Summarizing {search_type} results...")
+                    fanout.submit(("summary", search_type), process_with_gemini, prompt)
+
+        for search_type in [search_type for search_type in SEARCHES if search_type not in done]:
+            logger.warning(f"{search_type} did not finish within {PIPELINE_DEADLINE_SECONDS:.0f} seconds.")
+            placeholder = summaries[search_type] if search_type in searched else tables[search_type]
+            placeholder.warning(f"{search_type} results took too long and were skipped.")
 
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
@@ -1,4 +1,5 @@
 import requests
+from src.utils import serp_cache
 from typing import Dict, Optional, List
 from src.config.setup import get_serp_api_key
 from src.config.logging import logger
@@ -50,9 +51,7 @@ def search_events(location: str, query: str) -> Optional[Dict]:
     }
 
     try:
-        response = requests.get(url, params=params)
-        response.raise_for_status()
-        data = response.json()
+        data = serp_cache.search(params, url=url)
         
         events = _safe_get(data, ['events_results'], [])
         
@@ -107,9 +106,7 @@ def search_products_for_event(events: List[Dict], event_query: str) -> Optional[
         "hl": "en",
     }
     try:
-        response = requests.get(url, params=params)
-        response.raise_for_status()
-        data = response.json()
+        data = serp_cache.search(params, url=url)
 
 
         shopping_results = _safe_get(data, ['shopping_results'], [])
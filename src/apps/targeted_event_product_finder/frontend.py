@@ -1,12 +1,7 @@
 import streamlit as st
 from src.apps.targeted_event_product_finder import backend
-from src.config.setup import initialize_genai_client
 from src.config.logging import logger
 
-# Initialize Gemini client
-gemini_client = initialize_genai_client()
-MODEL_ID = "gemini-2.0-flash-exp"
-
 # --- UI ---
 st.set_page_config(page_title="Targeted Event Product Finder", page_icon="🔎")
 st.title("Find Products for Your Events")
@@ -1,4 +1,6 @@
 import requests
+from src.utils import serp_cache
+from src.utils import http
 from typing import Dict, Optional
 from src.config.setup import get_serp_api_key
 from src.config.logging import logger
@@ -12,7 +14,7 @@ def get_cat_fact() -> Optional[str]:
         Optional[str]: A string containing the cat fact, or None if an error occurs.
     """
     try:
-        response = requests.get("https://catfact.ninja/fact")
+        response = http.get("https://catfact.ninja/fact")
         response.raise_for_status()  # Raise an exception for HTTP errors
         data = response.json()
         return data.get("fact")
@@ -47,9 +49,7 @@ def search_image(query: str) -> Optional[str]:
     }
     
     try:
-        response = requests.get("https://serpapi.com/search", params=params)
-        response.raise_for_status()
-        results = response.json()
+        results = serp_cache.search(params)
         if results and "images_results" in results and results["images_results"]:
             return results["images_results"][0].get("original")
         else:
@@ -1,11 +1,10 @@
 import streamlit as st
 from src.apps.visual_cat_fact_enrichment import backend
 from src.llm.gemini_text import generate_content
-from src.config.setup import initialize_genai_client
+from src.config.setup import get_genai_client
 from src.config.logging import logger
 import json
 
-gemini_client = initialize_genai_client()
 MODEL_ID = "gemini-2.0-flash-exp"
 
 def process_with_gemini(prompt: str) -> str:
@@ -19,7 +18,7 @@ def process_with_gemini(prompt: str) -> str:
         str: The formatted text from Gemini.
     """
     try:
-        response = generate_content(gemini_client, MODEL_ID, prompt)
+        response = generate_content(get_genai_client(), MODEL_ID, prompt)
         return response.text
     except Exception as e:
         logger.error(f"Error processing with Gemini: {e}")
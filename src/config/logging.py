@@ -1,7 +1,49 @@
+from logging.handlers import RotatingFileHandler
+from logging.handlers import QueueListener
+from logging.handlers import QueueHandler
+from typing import Optional
+from typing import Dict
+from typing import List
+import threading
 import logging
+import atexit
+import random
+import queue
+import time
 import os
 
 
+# `trace_id` is filled in by `src.utils.tracing` for records logged inside a span.
+LOG_FORMAT = "%(asctime)s [%(levelname)s] [%(trace_id)s] [%(module)s] [%(pathname)s]: %(message)s"
+
+# Root level, plus per-logger overrides, e.g. APP_BUILDER_LOG_LEVELS="src.llm=DEBUG,google_genai=INFO".
+LOG_LEVEL: str = os.environ.get("APP_BUILDER_LOG_LEVEL", "INFO")
+DEFAULT_LOGGER_LEVELS: Dict[str, str] = {
+    "google_genai": "WARNING",
+    "httpx": "WARNING",
+    "urllib3": "WARNING",
+    "PIL": "WARNING",
+}
+
+# Fraction of records below WARNING kept per logger, e.g. APP_BUILDER_LOG_SAMPLE="src.llm=0.1".
+# Applies to loggers obtained with `get_logger`.
+DEFAULT_SAMPLE_RATES: Dict[str, float] = {}
+
+# Size-based rotation of the log file.
+LOG_MAX_BYTES: int = 10 * 1024 * 1024
+LOG_BACKUP_COUNT: int = 5
+
+# Records are handed to a background thread through a bounded queue. When it is full, records below
+# WARNING are dropped rather than blocking the caller.
+LOG_QUEUE_SIZE: int = 10000
+
+# Messages of records below ERROR are cut to this many characters.
+LOG_MAX_MESSAGE_CHARS: int = 4000
+
+# At exit, how long the listener may write nothing while the queue is full before the rest is abandoned.
+LOG_STOP_TIMEOUT_SECONDS: float = 5.0
+
+
 def custom_path_filter(path: str) -> str:
     """
     Filters the provided file path to shorten it by removing the project root portion.
@@ -17,7 +59,7 @@ def custom_path_filter(path: str) -> str:
         The shortened file path, with the project root removed if present.
     """
     project_root = "Agentic-Workflow-Patterns"
-    
+
     # Find the index of the project root in the path
     idx = path.find(project_root)
     if idx != -1:
@@ -25,27 +67,248 @@ def custom_path_filter(path: str) -> str:
         path = path[idx + len(project_root):]
     return path
 
-class CustomLogRecord(logging.LogRecord):
+def _parse_overrides(value: str) -> Dict[str, str]:
+    overrides = {}
+    for item in value.split(","):
+        name, sep, setting = item.partition("=")
+        if sep and name.strip() and setting.strip():
+            overrides[name.strip()] = setting.strip()
+    return overrides
+
+class ShortPathFormatter(logging.Formatter):
+    """
+    ShortPathFormatter shortens the file path of each record with `custom_path_filter`. It runs on the
+    listener thread, so the path filtering is no longer paid for by the code that logs.
+    """
+    def format(self, record: logging.LogRecord) -> str:
+        record.pathname = custom_path_filter(record.pathname)
+        return super().format(record)
+
+class DeferredFileHandler(RotatingFileHandler):
+    """
+    DeferredFileHandler is a size-rotating file handler that creates its directory and opens its file
+    when the first record is emitted rather than when it is constructed, so importing the logger has
+    no filesystem side effects in processes that never log.
     """
-    CustomLogRecord modifies the default LogRecord to filter and shorten the file path in log messages.
-    
+    def __init__(self, filename: str, *args, **kwargs):
+        kwargs["delay"] = True
+        super().__init__(filename, *args, **kwargs)
+
+    def _open(self):
+        os.makedirs(os.path.dirname(self.baseFilename), exist_ok=True)
+        return super()._open()
+
+class BoundedQueueHandler(QueueHandler):
+    """
+    BoundedQueueHandler formats and truncates records on the calling thread and hands them to the
+    listener without waiting for any I/O. If the queue is full, records below WARNING are dropped and
+    counted; more severe records wait for room.
+
     Attributes:
     -----------
-    pathname : str
-        The full file path where the log message was generated, filtered to remove the project root.
-    
-    Methods:
+    max_message_chars : int
+        Messages of records below ERROR longer than this are truncated.
+    dropped : int
+        Number of records dropped because the queue was full.
+    """
+    def __init__(self, log_queue: queue.Queue, max_message_chars: int = LOG_MAX_MESSAGE_CHARS):
+        super().__init__(log_queue)
+        self.max_message_chars = max_message_chars
+        self.dropped = 0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record = super().prepare(record)
+        excess = len(record.msg) - self.max_message_chars
+        if excess > 0 and record.levelno < logging.ERROR:
+            record.msg = f"{record.msg[:self.max_message_chars]}... [truncated {excess} chars]"
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put(record, block=record.levelno >= logging.WARNING)
+        except queue.Full:
+            self.dropped += 1
+
+class DrainingQueueListener(QueueListener):
+    """
+    DrainingQueueListener waits for room in a full queue for its stop signal, where `QueueListener`
+    would raise `queue.Full`, for as long as its thread keeps writing records. Records are only ever
+    written by one thread at a time, so they stay in order and file rollover never races.
+    """
+    def stop(self) -> int:
+        """
+        Stops the listener thread after it has written all queued records.
+
+        Returns:
+        --------
+        int
+            Number of records left unwritten because the thread wrote nothing for
+            `LOG_STOP_TIMEOUT_SECONDS` (e.g. a handler is stuck); 0 otherwise.
+        """
+        if self._thread is None:
+            return 0
+        while True:
+            backlog = self.queue.qsize()
+            try:
+                self.queue.put(self._sentinel, timeout=LOG_STOP_TIMEOUT_SECONDS)
+                break
+            except queue.Full:
+                if not self._thread.is_alive():
+                    # The thread is gone, so this thread can write the rest without racing it.
+                    self._drain()
+                    self._thread = None
+                    return 0
+                if self.queue.qsize() >= backlog:
+                    return self.queue.qsize()
+        self._thread.join()
+        self._thread = None
+        return 0
+
+    def _drain(self) -> None:
+        while True:
+            try:
+                record = self.queue.get_nowait()
+            except queue.Empty:
+                return
+            if record is not self._sentinel:
+                self.handle(record)
+
+class RateLimitFilter(logging.Filter):
+    """
+    RateLimitFilter lets through at most `max_records` records below WARNING per call site (file and
+    line) every `interval_seconds`. The first record after a suppressed stretch notes how many similar
+    records were dropped.
+    """
+    def __init__(self, max_records: int, interval_seconds: float = 60.0):
+        super().__init__()
+        self.max_records = max_records
+        self.interval_seconds = interval_seconds
+        self._windows: Dict[tuple, List] = {}
+        self._lock = threading.Lock()
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno >= logging.WARNING:
+            return True
+        key = (record.pathname, record.lineno)
+        now = time.monotonic()
+        with self._lock:
+            # [window start, records let through, records suppressed]
+            window = self._windows.setdefault(key, [now, 0, 0])
+            if now - window[0] >= self.interval_seconds:
+                window[0], window[1] = now, 0
+            if window[1] >= self.max_records:
+                window[2] += 1
+                return False
+            window[1] += 1
+            suppressed, window[2] = window[2], 0
+        if suppressed:
+            record.msg = f"{record.msg} ({suppressed} similar messages suppressed)"
+        return True
+
+class SamplingFilter(logging.Filter):
+    """
+    SamplingFilter keeps a random `rate` fraction of records below WARNING.
+    """
+    def __init__(self, rate: float):
+        super().__init__()
+        self.rate = rate
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        return record.levelno >= logging.WARNING or random.random() < self.rate
+
+_listener: Optional[DrainingQueueListener] = None
+_queue_handler: Optional[BoundedQueueHandler] = None
+_record_filters: List[logging.Filter] = []
+
+def add_record_filter(record_filter: logging.Filter) -> None:
+    """
+    Adds a filter that sees every record on the thread that logs it, before it is queued, e.g. to
+    attach context that is only available there. It stays installed if the logger is set up again.
+    """
+    _record_filters.append(record_filter)
+    if _queue_handler is not None:
+        _queue_handler.addFilter(record_filter)
+
+def _start_listener(handlers: List[logging.Handler]) -> None:
+    global _listener
+    _queue_handler.queue = queue.Queue(LOG_QUEUE_SIZE)
+    _listener = DrainingQueueListener(_queue_handler.queue, *handlers, respect_handler_level=True)
+    _listener.start()
+
+def _restart_listener_in_child() -> None:
+    # The listener thread does not survive a fork (the app executor's workers are forked), so the
+    # child starts its own over the same handlers.
+    if _listener is not None:
+        _start_listener(list(_listener.handlers))
+
+def stop_logging() -> None:
+    """
+    Stops the listener thread after it has written all queued records. Registered to run at exit.
+    """
+    global _listener
+    if _listener is None:
+        return
+    unwritten = _listener.stop()
+    if unwritten:
+        # Writing from here would race the stuck listener thread for its handlers.
+        logging.lastResort.handle(logging.makeLogRecord({
+            "levelno": logging.WARNING, "levelname": "WARNING",
+            "msg": f"Log writer stopped responding at exit; {unwritten} queued log records were not written."
+        }))
+    elif _queue_handler.dropped:
+        record = logging.makeLogRecord({
+            "levelno": logging.WARNING, "levelname": "WARNING", "pathname": __file__, "module": "logging",
+            "msg": f"{_queue_handler.dropped} log records were dropped because the log queue was full."
+        })
+        for handler in _listener.handlers:
+            if record.levelno >= handler.level:
+                handler.handle(record)
+    _listener = None
+
+def get_logger(name: str, max_per_minute: Optional[int] = None, sample_rate: Optional[float] = None) -> logging.Logger:
+    """
+    Returns a named logger for a hot path. Its level can be set per name through `APP_BUILDER_LOG_LEVELS`,
+    and its records below WARNING can be rate-limited per call site and sampled.
+
+    Parameters:
+    -----------
+    name : str
+        Logger name, usually the module's `__name__`.
+    max_per_minute : int, optional
+        Records below WARNING let through per call site per minute, unlimited by default.
+    sample_rate : float, optional
+        Fraction of records below WARNING kept. Defaults to the most specific `APP_BUILDER_LOG_SAMPLE`
+        entry for the name or one of its parents, or keeping all records.
+
+    Returns:
     --------
-    __init__(*args, **kwargs):
-        Initializes the custom log record and applies the path filter.
+    logging.Logger
+        The logger, with its filters attached once.
     """
-    def __init__(self, *args, **kwargs):
-        super().__init__(*args, **kwargs)
-        self.pathname = custom_path_filter(self.pathname)
+    named_logger = logging.getLogger(name)
+    if getattr(named_logger, "_app_builder_filters", False):
+        return named_logger
+
+    if sample_rate is None:
+        sample_rates = {**DEFAULT_SAMPLE_RATES, **_parse_overrides(os.environ.get("APP_BUILDER_LOG_SAMPLE", ""))}
+        parts = name.split(".")
+        for depth in range(len(parts), 0, -1):
+            prefix = ".".join(parts[:depth])
+            if prefix in sample_rates:
+                sample_rate = float(sample_rates[prefix])
+                break
+    if sample_rate is not None and sample_rate < 1:
+        named_logger.addFilter(SamplingFilter(sample_rate))
+    if max_per_minute is not None:
+        named_logger.addFilter(RateLimitFilter(max_per_minute))
+    named_logger._app_builder_filters = True
+    return named_logger
 
 def setup_logger(log_filename: str = "app.log", log_dir: str = "logs") -> logging.Logger:
     """
-    Sets up and configures the logger with custom log record handling and file/stream handlers.
+    Sets up the root logger to hand records to a background listener thread, which writes them to the
+    console and to a size-rotated log file. Logging calls therefore never wait on disk or console I/O.
+    Calling it again reconfigures the pipeline.
 
     Parameters:
     -----------
@@ -59,27 +322,43 @@ def setup_logger(log_filename: str = "app.log", log_dir: str = "logs") -> loggin
     logging.Logger
         The configured logger instance.
     """
-    # Ensure the logging directory exists
-    if not os.path.exists(log_dir):
-        os.makedirs(log_dir)
+    global _queue_handler
+    previous = list(_listener.handlers) if _listener is not None else []
+    stop_logging()
+    for handler in previous:
+        handler.close()
 
-    # Define the log file path
+    # Define the log file path (the directory is created on the first write)
     log_filepath = os.path.join(log_dir, log_filename)
+    formatter = ShortPathFormatter(LOG_FORMAT, defaults={"trace_id": "-"})
+    targets = [
+        logging.StreamHandler(),
+        DeferredFileHandler(log_filepath, maxBytes=LOG_MAX_BYTES, backupCount=LOG_BACKUP_COUNT)
+    ]
+    for handler in targets:
+        handler.setFormatter(formatter)
+
+    root = logging.getLogger()
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+    _queue_handler = BoundedQueueHandler(queue.Queue(LOG_QUEUE_SIZE))
+    for record_filter in _record_filters:
+        _queue_handler.addFilter(record_filter)
+    root.addHandler(_queue_handler)
+    root.setLevel(LOG_LEVEL)
+    _start_listener(targets)
 
-    # Define the logging configuration
-    logging.setLogRecordFactory(CustomLogRecord)
-    logging.basicConfig(
-        level=logging.INFO,
-        format="%(asctime)s [%(levelname)s] [%(module)s] [%(pathname)s]: %(message)s",
-        handlers=[
-            logging.StreamHandler(),
-            logging.FileHandler(log_filepath)
-        ]
-    )
+    # Per-logger levels
+    levels = {**DEFAULT_LOGGER_LEVELS, **_parse_overrides(os.environ.get("APP_BUILDER_LOG_LEVELS", ""))}
+    for name, level in levels.items():
+        logging.getLogger(name).setLevel(level.upper())
 
     # Return the configured logger
-    return logging.getLogger()
+    return root
+
 
+atexit.register(stop_logging)
+os.register_at_fork(after_in_child=_restart_listener_in_child)
 
 # Initialize the logger with the custom configuration.
-logger = setup_logger()
\ No newline at end of file
+logger = setup_logger()
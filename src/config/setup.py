@@ -1,12 +1,16 @@
 from src.config.logging import logger
-from sqlalchemy import create_engine
-from sqlalchemy.engine import Engine
 from src.utils.io import load_yaml
-from google import genai
+from typing import TYPE_CHECKING
+from typing import Optional
 from typing import Dict
 from typing import Any 
+import threading
 import os
 
+if TYPE_CHECKING:
+    from sqlalchemy.engine import Engine
+    from google import genai
+
 
 # Configuration Constants
 BASE_DIR: str = os.path.dirname(os.path.abspath(__file__))
@@ -18,19 +22,110 @@ CSV_PATH: str = os.path.join(DATA_DIR, 'apis.csv')
 IMAGES_DIR: str = os.path.join(PROJECT_ROOT, 'img')
 GOOGLE_ICON_PATH: str = os.path.join(IMAGES_DIR, 'google_logo.svg')
 TEMPLATES_DIR: str = os.path.join(PROJECT_ROOT, 'templates')
+PROFILES_DIR: str = os.path.join(PROJECT_ROOT, 'logs', 'profiles')
 CREDENTIALS_FILE: str = os.path.join(PROJECT_ROOT, 'credentials', 'api.yml')
 MODEL = "gemini-2.0-flash-exp"
+CATALOG_PAGE_SIZE: int = 50
+
+# SQLite engine tuning
+DB_JOURNAL_MODE: str = "WAL"
+DB_SYNCHRONOUS: str = "NORMAL"
+DB_CACHE_SIZE_KB: int = 64 * 1024
+DB_MMAP_SIZE_BYTES: int = 256 * 1024 * 1024
+DB_BUSY_TIMEOUT_SECONDS: float = 30.0
+DB_POOL_SIZE: int = 8
+DB_MAX_OVERFLOW: int = 8
+
+# Streaming CSV ingestion
+INGEST_CHUNK_ROWS: int = 5000
+UPLOAD_COPY_BUFFER_BYTES: int = 1024 * 1024
+
+# Rerun instrumentation (opt-in via APP_BUILDER_PROFILE=1 or the ?profile=1 query parameter)
+PROFILING_ENABLED: bool = os.environ.get("APP_BUILDER_PROFILE") == "1"
+PROFILE_SLOW_RERUN_SECONDS: float = float(os.environ.get("APP_BUILDER_PROFILE_SLOW_SECONDS", "0"))
+
+# Isolated app execution
+APP_EXECUTION_MODES = ("Inline", "Isolated process")
+APP_POOL_SIZE: int = 2
+APP_CPU_LIMIT_SECONDS: int = 600
+APP_MEMORY_LIMIT_MB: int = 2048
+APP_MAX_RUNTIME_SECONDS: int = 1800
+# Address the app servers listen on (0.0.0.0 to accept remote browsers) and the URL the builder embeds;
+# set the URL to the host (or proxy) browsers reach the server machine by, e.g. http://apps.example.com:{port}
+APP_BIND_ADDRESS: str = os.environ.get("APP_BUILDER_APP_BIND_ADDRESS", "127.0.0.1")
+APP_PUBLIC_URL: str = os.environ.get("APP_BUILDER_APP_PUBLIC_URL", "http://localhost:{port}")
+
+# Background app builds
+BUILD_MAX_CONCURRENCY: int = 3
+BUILD_JOBS_PATH: str = os.path.join(DB_DIR, 'build_jobs.json')
+
+# Outbound HTTP from generated app backends (src.utils.http)
+HTTP_CONNECT_TIMEOUT_SECONDS: float = 5.0
+HTTP_READ_TIMEOUT_SECONDS: float = 30.0
+HTTP_RETRIES: int = 3
+HTTP_BACKOFF_SECONDS: float = 0.5
+HTTP_POOL_SIZE: int = 10
+
+# Concurrent API calls of generated app backends (src.utils.fanout)
+FANOUT_MAX_WORKERS: int = 8
+FANOUT_DEADLINE_SECONDS: float = 20.0
 
-# Global Configuration
-CONFIG: Dict[str, Any] = load_yaml(CREDENTIALS_FILE)
-engine: Engine
+# Shared SERP API response cache (src.utils.serp_cache); APP_BUILDER_SERP_CACHE=0 disables it
+SERP_CACHE_ENABLED: bool = os.environ.get("APP_BUILDER_SERP_CACHE", "1") != "0"
+SERP_CACHE_PATH: str = os.path.join(DB_DIR, 'serp_cache.db')
+SERP_SEARCH_URL: str = "https://serpapi.com/search"
+SERP_CACHE_DEFAULT_TTL_SECONDS: float = 3600
+SERP_CACHE_TTL_SECONDS: Dict[str, float] = {
+    "google": 3600,
+    "google_news": 900,
+    "google_finance": 300,
+    "google_events": 3 * 3600,
+    "google_shopping": 6 * 3600,
+    "walmart": 6 * 3600,
+    "google_images": 24 * 3600,
+    "google_local": 24 * 3600,
+    "google_maps": 24 * 3600,
+}
+# How long past its TTL an entry may still be served while it is refreshed in the background: the
+# engine's TTL times this factor, capped, so short-lived data such as finance quotes and news never
+# goes much staler than its TTL.
+SERP_CACHE_STALE_TTL_FACTOR: float = 1.0
+SERP_CACHE_MAX_STALE_SECONDS: float = 24 * 3600
+SERP_CACHE_MEMORY_ENTRIES: int = 256
 
-def get_google_api_key(config: Dict[str, Any] = CONFIG) -> str:
+# Trace spans (on unless APP_BUILDER_TRACE=0), appended as JSON lines
+TRACING_ENABLED: bool = os.environ.get("APP_BUILDER_TRACE", "1") != "0"
+TRACES_DIR: str = os.path.join(PROJECT_ROOT, 'logs', 'traces')
+TRACE_SPANS_PATH: str = os.path.join(TRACES_DIR, 'spans.jsonl')
+TRACE_MAX_BYTES: int = 50 * 1024 * 1024
+TRACE_FLUSH_SECONDS: float = 0.5
+
+# Shared resources, created on first use rather than at import so that processes and generated apps
+# only pay for what they touch. `CONFIG` and `engine` remain importable via the module `__getattr__`.
+_config: Optional[Dict[str, Any]] = None
+_engine: Optional["Engine"] = None
+_genai_client: Optional["genai.Client"] = None
+_init_lock = threading.RLock()
+
+
+def get_config() -> Dict[str, Any]:
+    """
+    Load the credentials file on first use and return the cached configuration.
+    """
+    global _config
+    if _config is None:
+        with _init_lock:
+            if _config is None:
+                _config = load_yaml(CREDENTIALS_FILE)
+    return _config
+
+
+def get_google_api_key(config: Optional[Dict[str, Any]] = None) -> str:
     """
     Extract the Google API key from the configuration.
 
     Args:
-        config (Dict[str, Any]): The loaded configuration dictionary.
+        config (Optional[Dict[str, Any]]): The loaded configuration dictionary. Defaults to `get_config()`.
 
     Returns:
         str: The Google API key.
@@ -38,6 +133,8 @@ def get_google_api_key(config: Dict[str, Any] = CONFIG) -> str:
     Raises:
         ValueError: If the Google API key is missing.
     """
+    if config is None:
+        config = get_config()
     api_key = config.get("GOOGLE_API_KEY", "")
     if not api_key:
         logger.error("Google API key is missing in the configuration.")
@@ -45,12 +142,12 @@ def get_google_api_key(config: Dict[str, Any] = CONFIG) -> str:
     return api_key
 
 
-def get_serp_api_key(config: Dict[str, Any] = CONFIG) -> str:
+def get_serp_api_key(config: Optional[Dict[str, Any]] = None) -> str:
     """
     Extract the SERP API key from the configuration.
 
     Args:
-        config (Dict[str, Any]): The loaded configuration dictionary.
+        config (Optional[Dict[str, Any]]): The loaded configuration dictionary. Defaults to `get_config()`.
 
     Returns:
         str: The SERP API key.
@@ -58,6 +155,8 @@ def get_serp_api_key(config: Dict[str, Any] = CONFIG) -> str:
     Raises:
         ValueError: If the SERP API key is missing.
     """
+    if config is None:
+        config = get_config()
     api_key = config.get("SERP_API_KEY", "")
     if not api_key:
         logger.error("SERP API key is missing in the configuration.")
@@ -65,12 +164,12 @@ def get_serp_api_key(config: Dict[str, Any] = CONFIG) -> str:
     return api_key
 
 
-def initialize_genai_client(config: Dict[str, Any] = CONFIG) -> genai.Client:
+def initialize_genai_client(config: Optional[Dict[str, Any]] = None) -> "genai.Client":
     """
     Initializes the GenAI client using the Google API key from the configuration.
 
     Args:
-        config (Dict[str, Any]): The loaded configuration dictionary.
+        config (Optional[Dict[str, Any]]): The loaded configuration dictionary. Defaults to `get_config()`.
 
     Returns:
         genai.Client: The initialized GenAI client.
@@ -78,6 +177,8 @@ def initialize_genai_client(config: Dict[str, Any] = CONFIG) -> genai.Client:
     Raises:
         Exception: If the client initialization fails.
     """
+    from google import genai
+
     try:
         logger.info("Extracting Google API key from configuration.")
         google_api_key = get_google_api_key(config)
@@ -91,6 +192,20 @@ def initialize_genai_client(config: Dict[str, Any] = CONFIG) -> genai.Client:
         raise
 
 
+def get_genai_client() -> "genai.Client":
+    """
+    Return the process-wide GenAI client, creating it on first use. Prefer this over
+    `initialize_genai_client` so the client (and the `google.genai` import) is only paid for once,
+    and only by code paths that call the model.
+    """
+    global _genai_client
+    if _genai_client is None:
+        with _init_lock:
+            if _genai_client is None:
+                _genai_client = initialize_genai_client()
+    return _genai_client
+
+
 def setup_directories() -> None:
     """
     Create necessary directories for the project.
@@ -106,9 +221,30 @@ def setup_directories() -> None:
         raise
 
 
-def initialize_database(db_path: str) -> Engine:
+def _configure_sqlite_connection(dbapi_connection: Any, connection_record: Any) -> None:
+    """
+    Apply journaling, durability and cache pragmas to every new SQLite connection.
+
+    WAL lets readers keep reading the last committed snapshot while a CSV reload holds the write lock,
+    and the busy timeout makes a second writer wait instead of failing immediately.
+    """
+    cursor = dbapi_connection.cursor()
+    try:
+        cursor.execute(f"PRAGMA journal_mode={DB_JOURNAL_MODE}")
+        cursor.execute(f"PRAGMA synchronous={DB_SYNCHRONOUS}")
+        cursor.execute(f"PRAGMA cache_size=-{DB_CACHE_SIZE_KB}")
+        cursor.execute(f"PRAGMA mmap_size={DB_MMAP_SIZE_BYTES}")
+        cursor.execute(f"PRAGMA busy_timeout={int(DB_BUSY_TIMEOUT_SECONDS * 1000)}")
+    finally:
+        cursor.close()
+
+
+def initialize_database(db_path: str) -> "Engine":
     """
-    Initialize a SQLite database using SQLAlchemy.
+    Initialize a SQLite database using SQLAlchemy and make sure the managed schema exists.
+
+    The engine uses a sized connection pool shared by all Streamlit sessions, and every pooled connection
+    is configured for concurrent reads during writes (see `_configure_sqlite_connection`).
 
     Args:
         db_path (str): Path to the SQLite database file.
@@ -118,19 +254,52 @@ def initialize_database(db_path: str) -> Engine:
     
     Logs database initialization status.
     """
+    from src.db.schema import ensure_schema
+    from sqlalchemy import create_engine
+    from sqlalchemy.pool import QueuePool
+    from sqlalchemy import event
+
     try:
-        engine = create_engine(f'sqlite:///{db_path}', echo=False)
-        logger.info(f"Database initialized at {db_path}")
+        engine = create_engine(
+            f'sqlite:///{db_path}',
+            echo=False,
+            poolclass=QueuePool,
+            pool_size=DB_POOL_SIZE,
+            max_overflow=DB_MAX_OVERFLOW,
+            connect_args={"timeout": DB_BUSY_TIMEOUT_SECONDS, "check_same_thread": False}
+        )
+        event.listen(engine, "connect", _configure_sqlite_connection)
+        with engine.begin() as conn:
+            ensure_schema(conn)
+        logger.info(f"Database initialized at {db_path} (journal_mode={DB_JOURNAL_MODE}, pool_size={DB_POOL_SIZE})")
         return engine
     except Exception as e:
         logger.error(f"Failed to initialize database at {db_path}: {e}")
         raise
 
-# Setup happens when the module is imported
-try:
-    setup_directories()
-    engine = initialize_database(DB_PATH)
-    logger.info("Module setup complete. Database and directories are ready.")
-except Exception as e:
-    logger.critical(f"Module setup failed: {e}")
-    raise
+def get_engine() -> "Engine":
+    """
+    Return the shared database engine, creating the project directories and the engine (and migrating
+    the schema) on first use.
+    """
+    global _engine
+    if _engine is None:
+        with _init_lock:
+            if _engine is None:
+                try:
+                    setup_directories()
+                    _engine = initialize_database(DB_PATH)
+                    logger.info("Database and directories are ready.")
+                except Exception as e:
+                    logger.critical(f"Database setup failed: {e}")
+                    raise
+    return _engine
+
+
+def __getattr__(name: str) -> Any:
+    # Keeps `from src.config.setup import CONFIG` / `engine` working without loading them at import.
+    if name == "CONFIG":
+        return get_config()
+    if name == "engine":
+        return get_engine()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
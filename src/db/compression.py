@@ -0,0 +1,225 @@
+from sqlalchemy.engine import Connection
+from src.config.logging import logger
+from collections import Counter
+from sqlalchemy import text
+from typing import Iterable
+from typing import Optional
+from typing import Tuple
+from typing import Union
+from typing import Dict
+from typing import List
+import threading
+import struct
+import time
+import zlib
+import re
+
+
+# Columns stored compressed. Compressed values are BLOBs, uncompressed ones stay TEXT, so the SQLite
+# storage class tells them apart and older rows remain readable as-is.
+COMPRESSED_COLUMNS: List[str] = ["example_request", "example_response"]
+
+# Values shorter than this are not worth the 4-byte header and deflate framing.
+MIN_COMPRESS_BYTES = 64
+
+# Deflate can only refer back 32 KiB, so a larger preset dictionary would not help.
+DICTIONARY_BYTES = 32 * 1024
+TRAINING_SAMPLE_SIZE = 2000
+COMPRESSION_LEVEL = 6
+
+ZDICT_DDL = """
+    CREATE TABLE IF NOT EXISTS apientry_zdict (
+        dict_id INTEGER PRIMARY KEY,
+        zdict BLOB NOT NULL,
+        created_at REAL NOT NULL
+    )
+"""
+
+# Each compressed value starts with the id (Adler-32) of the dictionary it was compressed with.
+_HEADER = struct.Struct(">I")
+
+# Substrings that recur across payloads: JSON keys, URL origins, words and runs of JSON punctuation.
+_TOKEN = re.compile(r'"[^"\\]{1,48}":\s?|https?://[^\s"/?]+|[A-Za-z][\w\-]{3,}|[\[\]{}",:\s]{3,}')
+
+_codecs: Dict[int, "PayloadCodec"] = {}
+_codecs_lock = threading.Lock()
+
+
+class PayloadCodec:
+    """
+    Raw-deflate compressor and decompressor sharing one preset dictionary.
+    """
+
+    def __init__(self, dict_id: int, zdict: bytes) -> None:
+        self.dict_id = dict_id
+        self.zdict = zdict
+        # Priming a compressor hashes the whole dictionary, so do it once and copy the primed state per value.
+        self._primed = zlib.compressobj(COMPRESSION_LEVEL, zlib.DEFLATED, -15, zdict=zdict)
+        self._header = _HEADER.pack(dict_id)
+
+    def compress(self, value: Optional[str]) -> Union[None, str, bytes]:
+        """
+        Compress a payload, returning it unchanged if it is short or does not shrink.
+        """
+        if not isinstance(value, str) or len(value) < MIN_COMPRESS_BYTES:
+            return value
+        data = value.encode("utf-8")
+        compressor = self._primed.copy()
+        blob = self._header + compressor.compress(data) + compressor.flush()
+        return blob if len(blob) < len(data) else value
+
+    def decompress(self, blob: bytes) -> str:
+        decompressor = zlib.decompressobj(-15, zdict=self.zdict)
+        return (decompressor.decompress(blob[_HEADER.size:]) + decompressor.flush()).decode("utf-8")
+
+
+def train_dictionary(samples: Iterable[str], size: int = DICTIONARY_BYTES) -> bytes:
+    """
+    Build a deflate preset dictionary from sample payloads: the substrings found in the most samples,
+    with the most common last, where deflate reaches them with the shortest distances.
+
+    Args:
+        samples (Iterable[str]): Payloads representative of the catalog.
+        size (int): Maximum dictionary size in bytes.
+
+    Returns:
+        bytes: The dictionary, empty if the samples share nothing.
+    """
+    document_frequency = Counter()
+    for sample in samples:
+        document_frequency.update(set(_TOKEN.findall(sample)))
+
+    picked, total = [], 0
+    for token, count in document_frequency.most_common():
+        if count < 2:
+            break
+        encoded = token.encode("utf-8")
+        if total + len(encoded) > size:
+            continue
+        picked.append(encoded)
+        total += len(encoded)
+    return b"".join(reversed(picked))
+
+
+def _register(dict_id: int, zdict: bytes) -> PayloadCodec:
+    with _codecs_lock:
+        codec = _codecs.get(dict_id)
+        if codec is None:
+            codec = _codecs[dict_id] = PayloadCodec(dict_id, zdict)
+        return codec
+
+
+def load_codec(conn: Connection, dict_id: int) -> PayloadCodec:
+    """
+    Return the codec for a stored dictionary, reading it from the database on first use.
+
+    Raises:
+        KeyError: If the dictionary does not exist.
+    """
+    codec = _codecs.get(dict_id)
+    if codec is not None:
+        return codec
+    zdict = conn.execute(
+        text("SELECT zdict FROM apientry_zdict WHERE dict_id = :dict_id"), {"dict_id": dict_id}
+    ).scalar()
+    if zdict is None:
+        raise KeyError(f"Compression dictionary {dict_id} not found.")
+    return _register(dict_id, bytes(zdict))
+
+
+def ensure_codec(conn: Connection, samples: Iterable[str]) -> Optional[PayloadCodec]:
+    """
+    Return the catalog's current codec, training and storing a dictionary from `samples` if there is none.
+
+    Returns:
+        Optional[PayloadCodec]: The codec, or None if there is no dictionary and the samples share too
+        little to build one.
+    """
+    dict_id = conn.execute(text("SELECT dict_id FROM apientry_zdict ORDER BY created_at DESC LIMIT 1")).scalar()
+    if dict_id is not None:
+        return load_codec(conn, dict_id)
+
+    zdict = train_dictionary(samples)
+    if not zdict:
+        return None
+    dict_id = zlib.adler32(zdict)
+    conn.execute(
+        text("INSERT OR IGNORE INTO apientry_zdict (dict_id, zdict, created_at) VALUES (:dict_id, :zdict, :created_at)"),
+        {"dict_id": dict_id, "zdict": zdict, "created_at": time.time()}
+    )
+    logger.info("Trained a %d-byte compression dictionary for example payloads.", len(zdict))
+    return _register(dict_id, zdict)
+
+
+def compress_rows(rows: List[Dict], codec: Optional[PayloadCodec]) -> Tuple[int, int]:
+    """
+    Compress the payload columns of row dicts in place.
+
+    Returns:
+        Tuple[int, int]: Bytes of the payloads before and after compression.
+    """
+    raw_bytes = stored_bytes = 0
+    for row in rows:
+        for col in COMPRESSED_COLUMNS:
+            value = row.get(col)
+            if not isinstance(value, str):
+                continue
+            raw_bytes += len(value.encode("utf-8"))
+            if codec is not None:
+                value = row[col] = codec.compress(value)
+            stored_bytes += len(value) if isinstance(value, bytes) else len(value.encode("utf-8"))
+    return raw_bytes, stored_bytes
+
+
+def is_compressed(value: object) -> bool:
+    return isinstance(value, (bytes, memoryview))
+
+
+def decompress_value(conn: Connection, value: object) -> object:
+    """
+    Return the text of a payload column value, decompressing it if needed. Other values pass through.
+    """
+    if not is_compressed(value):
+        return value
+    blob = bytes(value)
+    (dict_id,) = _HEADER.unpack_from(blob)
+    return load_codec(conn, dict_id).decompress(blob)
+
+
+def compress_existing_rows(conn: Connection, batch_rows: int = 1000) -> None:
+    """
+    Compress the payloads of rows stored before compression was introduced, in id order and in batches.
+    """
+    samples = [
+        value for row in conn.execute(text(
+            f"SELECT {', '.join(COMPRESSED_COLUMNS)} FROM apientry ORDER BY random() LIMIT {TRAINING_SAMPLE_SIZE}"
+        )) for value in row if isinstance(value, str)
+    ]
+    codec = ensure_codec(conn, samples)
+    if codec is None:
+        return
+
+    last_id, raw_total, stored_total = 0, 0, 0
+    while True:
+        rows = [dict(row) for row in conn.execute(
+            text(f"SELECT id, {', '.join(COMPRESSED_COLUMNS)} FROM apientry WHERE id > :last_id ORDER BY id LIMIT :limit"),
+            {"last_id": last_id, "limit": batch_rows}
+        ).mappings()]
+        if not rows:
+            break
+        last_id = rows[-1]["id"]
+        rows = [row for row in rows if any(isinstance(row[col], str) for col in COMPRESSED_COLUMNS)]
+        raw_bytes, stored_bytes = compress_rows(rows, codec)
+        raw_total += raw_bytes
+        stored_total += stored_bytes
+        if rows:
+            conn.execute(
+                text(f"UPDATE apientry SET {', '.join(f'{col} = :{col}' for col in COMPRESSED_COLUMNS)} WHERE id = :id"),
+                rows
+            )
+
+    if raw_total:
+        logger.info(
+            "Compressed existing example payloads: %d -> %d bytes (%.2fx).",
+            raw_total, stored_total, raw_total / max(stored_total, 1)
+        )
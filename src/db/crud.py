@@ -1,111 +1,409 @@
 from sqlalchemy.exc import OperationalError
 from sqlalchemy.exc import SQLAlchemyError
+from src.db.schema import MAX_BOUND_PARAMETERS
+from src.db.schema import ENTRY_COLUMNS
+from src.db.schema import ensure_schema
+from src.db.records import SUMMARY_COLUMNS
+from src.db.records import DETAIL_COLUMNS
+from src.db.records import ApiEntry
+from src.db.records import SUMMARY
+from src.db.records import FULL
+from src.db.compression import COMPRESSED_COLUMNS
+from src.db.compression import decompress_value
+from src.db.compression import compress_rows
+from src.db.compression import is_compressed
+from src.db.compression import ensure_codec
 from src.config.logging import logger
+from src.config.setup import INGEST_CHUNK_ROWS
 from src.config.setup import DB_PATH
-from src.config.setup import engine
+from src.config.setup import get_engine
+from sqlalchemy.engine import Connection
 from sqlalchemy import text
+from typing import Optional
 from typing import Tuple
+from typing import Union
+from typing import IO
+from typing import Iterator
+from typing import Sequence
 from typing import List 
 from typing import Dict 
 import pandas as pd
+import hashlib
+import random
+import time
+import re
 import os
 
 
+REQUIRED_COLUMNS = ENTRY_COLUMNS
+ENTRY_COLUMN_LIST = ", ".join(ENTRY_COLUMNS)
+QUALIFIED_COLUMN_LIST = ", ".join(f"a.{col}" for col in ["id"] + ENTRY_COLUMNS)
+
+# Rows are identified across reloads by (name, endpoint).
+KEY_COLUMNS = ("name", "endpoint")
+
+# Number of most recent catalog generations whose row changes are kept in 'apientry_changes'.
+CHANGE_LOG_GENERATIONS = 20
+
+FTS_MIN_PREFIX_LENGTH = 3
+
+# BM25 column weights, in FTS_COLUMNS order: name, category, description, query_parameters.
+FTS_RANK = "bm25(apientry_fts, 10.0, 4.0, 2.0, 1.0)"
+
+
 def validate_csv(df: pd.DataFrame) -> Tuple[bool, str]:
     """
     Validate that the given DataFrame contains all required columns.
     """
-    required_columns = [
-        "name", "category", "base_url", "endpoint",
-        "description", "query_parameters", "example_request", "example_response"
-    ]
-
-    missing_columns = [col for col in required_columns if col not in df.columns]
+    missing_columns = [col for col in REQUIRED_COLUMNS if col not in df.columns]
     if missing_columns:
         return False, f"Missing required columns: {', '.join(missing_columns)}"
     return True, "CSV is valid"
 
 
-def purge_and_load_csv(csv_path: str) -> Tuple[bool, str]:
+def _row_hash(row: Dict) -> str:
+    """
+    Hash of a row's values, used to detect changed rows without comparing every column in SQL.
+    """
+    payload = "\x1f".join("" if row[col] is None else str(row[col]) for col in REQUIRED_COLUMNS)
+    return hashlib.sha1(payload.encode("utf-8")).hexdigest()
+
+
+def _chunked(values: Sequence, size: int = MAX_BOUND_PARAMETERS) -> Iterator[Sequence]:
+    """
+    Split a sequence into slices small enough to bind as SQL parameters.
+    """
+    for start in range(0, len(values), size):
+        yield values[start:start + size]
+
+
+def _prepare_rows(chunk: pd.DataFrame) -> List[Dict]:
+    """
+    Convert one CSV chunk into row dicts with their hash. Rows without a name are dropped.
+    """
+    chunk = chunk[REQUIRED_COLUMNS].astype(object)
+    chunk = chunk.where(pd.notna(chunk), None)
+
+    missing_names = chunk["name"].isna()
+    if missing_names.any():
+        logger.warning("Skipping %d CSV rows without a name.", int(missing_names.sum()))
+        chunk = chunk[~missing_names]
+
+    rows = chunk.to_dict(orient="records")
+    for row in rows:
+        row["row_hash"] = _row_hash(row)
+    return rows
+
+
+STAGED_COLUMNS = REQUIRED_COLUMNS + ["row_hash"]
+
+
+def _begin_staging(conn: Connection) -> None:
     """
-    Drop the existing 'apientry' table (if it exists) and load the CSV file data into it.
-    
+    Prepare an empty temporary staging table on the given connection. A unique key on the staging table
+    means a later CSV row replaces an earlier one with the same (name, endpoint).
+    """
+    ensure_schema(conn)
+    conn.execute(text(
+        f"CREATE TEMP TABLE IF NOT EXISTS apientry_staging ({', '.join(f'{col} TEXT' for col in STAGED_COLUMNS)})"
+    ))
+    conn.execute(text("CREATE UNIQUE INDEX IF NOT EXISTS temp.idx_apientry_staging_key ON apientry_staging (name, endpoint)"))
+    conn.execute(text("DELETE FROM apientry_staging"))
+
+
+def _stage_rows(conn: Connection, rows: List[Dict]) -> None:
+    """
+    Bulk-load one batch of rows into the staging table with `executemany`.
+    """
+    if not rows:
+        return
+    conn.execute(
+        text(
+            f"INSERT OR REPLACE INTO apientry_staging ({', '.join(STAGED_COLUMNS)}) "
+            f"VALUES ({', '.join(f':{col}' for col in STAGED_COLUMNS)})"
+        ),
+        rows
+    )
+
+
+def _apply_staged(conn: Connection) -> Dict[str, int]:
+    """
+    Diff the staged rows against 'apientry' and apply the changes: changed rows are updated, new rows
+    inserted and rows missing from the staging table deleted, with set-based statements whose writes to
+    'apientry' are proportional to the number of changed rows. Each changed row is recorded in
+    'apientry_changes' under the next catalog generation, which becomes current if anything changed.
+
+    Returns:
+        Dict[str, int]: Counts of inserted, updated, deleted and unchanged rows, and the catalog `generation`.
+    """
+    column_list = ", ".join(STAGED_COLUMNS)
+    key_match = "a.name IS s.name AND a.endpoint IS s.endpoint"
+    generation = (conn.execute(text("SELECT generation FROM catalog_meta WHERE id = 1")).scalar() or 0) + 1
+    params = {"generation": generation}
+
+    staged = conn.execute(text("SELECT COUNT(*) FROM apientry_staging")).scalar() or 0
+
+    conn.execute(text(f"""
+        INSERT INTO apientry_changes (generation, entry_id, op)
+        SELECT :generation, a.id, 'update' FROM apientry AS a JOIN apientry_staging AS s ON {key_match}
+        WHERE a.row_hash IS NOT s.row_hash
+    """), params)
+    updated = conn.execute(text(f"""
+        UPDATE apientry AS a
+        SET {', '.join(f'{col} = s.{col}' for col in STAGED_COLUMNS)}
+        FROM apientry_staging AS s
+        WHERE {key_match} AND a.row_hash IS NOT s.row_hash
+    """)).rowcount
+
+    # New rows get ids above the current maximum, since nothing has been deleted yet.
+    params["max_id"] = conn.execute(text("SELECT MAX(id) FROM apientry")).scalar() or 0
+    inserted = conn.execute(text(f"""
+        INSERT INTO apientry ({column_list})
+        SELECT {column_list} FROM apientry_staging AS s
+        WHERE NOT EXISTS (SELECT 1 FROM apientry AS a WHERE {key_match})
+    """)).rowcount
+    conn.execute(text("""
+        INSERT INTO apientry_changes (generation, entry_id, op)
+        SELECT :generation, id, 'insert' FROM apientry WHERE id > :max_id
+    """), params)
+
+    deleted_rows = """
+        FROM apientry
+        WHERE NOT EXISTS (
+            SELECT 1 FROM apientry_staging AS s
+            WHERE s.name IS apientry.name AND s.endpoint IS apientry.endpoint
+        )
+    """
+    conn.execute(
+        text(f"INSERT INTO apientry_changes (generation, entry_id, op) SELECT :generation, id, 'delete' {deleted_rows}"),
+        params
+    )
+    deleted = conn.execute(text(f"DELETE {deleted_rows}")).rowcount
+
+    conn.execute(text("DELETE FROM apientry_staging"))
+
+    if inserted or updated or deleted:
+        conn.execute(
+            text("UPDATE catalog_meta SET generation = :generation, updated_at = :now WHERE id = 1"),
+            {"generation": generation, "now": time.time()}
+        )
+        conn.execute(
+            text("DELETE FROM apientry_changes WHERE generation <= :oldest"),
+            {"oldest": generation - CHANGE_LOG_GENERATIONS}
+        )
+    else:
+        generation -= 1
+
+    return {
+        "inserted": inserted,
+        "updated": updated,
+        "deleted": deleted,
+        "unchanged": staged - inserted - updated,
+        "generation": generation,
+    }
+
+
+def ingest_csv(
+    source: Union[str, IO],
+    chunk_size: int = INGEST_CHUNK_ROWS
+) -> Tuple[bool, str, Dict[str, int]]:
+    """
+    Incrementally load a CSV file into the 'apientry' table with bounded memory.
+
+    The CSV is streamed in chunks of `chunk_size` rows. Each chunk is validated and staged as it is read,
+    then rows keyed by (name, endpoint) are diffed against the table: changed rows are updated, new rows
+    inserted and rows no longer in the CSV deleted. Everything happens in one transaction, so concurrent
+    readers always see a complete table and a bad chunk leaves the table untouched.
+
     Args:
-        csv_path (str): Path to the CSV file to be loaded.
+        source (Union[str, IO]): Path to the CSV file, or a readable file object.
+        chunk_size (int): Number of rows read, validated and staged at a time.
 
     Returns:
-        Tuple[bool, str]: Success status and message.
+        Tuple[bool, str, Dict[str, int]]: Success status, message, and counts of inserted, updated,
+        deleted and unchanged rows, the resulting catalog `generation`, `rows` read, `rows_per_second`,
+        and the example payload sizes before and after compression, `payload_bytes` and
+        `stored_payload_bytes` (empty on failure).
     """
-    logger.debug("Attempting to load CSV from path: %s", csv_path)
+    logger.debug("Attempting to load CSV from: %s", source)
 
     # Step 1: Validate CSV file path
-    if not os.path.exists(csv_path):
-        logger.error("CSV file not found at path: %s", csv_path)
-        return False, f"CSV file not found: {csv_path}"
+    if isinstance(source, str) and not os.path.exists(source):
+        logger.error("CSV file not found at path: %s", source)
+        return False, f"CSV file not found: {source}", {}
 
-    # Step 2: Read the CSV
+    # Step 2: Open the CSV as a stream of chunks
     try:
-        df = pd.read_csv(csv_path)
-        if df.empty:
-            logger.error("CSV file is empty: %s", csv_path)
-            return False, "CSV file is empty."
-        logger.debug("CSV file read successfully. Rows: %d, Columns: %d", df.shape[0], df.shape[1])
+        chunks = pd.read_csv(source, chunksize=chunk_size)
     except Exception as e:
         logger.error("Failed to read CSV file: %s", e)
-        return False, f"Error reading CSV file: {e}"
-
-    # Step 3: Validate the CSV structure
-    is_valid, validation_msg = validate_csv(df)
-    if not is_valid:
-        logger.error("CSV validation failed: %s", validation_msg)
-        return False, validation_msg
+        return False, f"Error reading CSV file: {e}", {}
 
-    # Step 4: Ensure the database exists or create it
+    # Step 3: Validate and stage each chunk, then apply the diff, in a single transaction
     try:
-        if not os.path.exists(DB_PATH):
-            logger.warning("Database file not found at path: %s. Creating a new database.", DB_PATH)
-            # Initialize the database by creating the 'apientry' table
-            with engine.begin() as conn:
-                conn.execute(text("""
-                    CREATE TABLE IF NOT EXISTS apientry (
-                        name TEXT,
-                        category TEXT,
-                        base_url TEXT,
-                        endpoint TEXT,
-                        description TEXT,
-                        query_parameters TEXT,
-                        example_request TEXT,
-                        example_response TEXT
-                    )
-                """))
-                logger.info("New database and 'apientry' table initialized.")
-    except Exception as e:
-        logger.error("Failed to create or initialize the database: %s", e)
-        return False, f"Database initialization error: {e}"
+        start_time = time.perf_counter()
+        total_rows = payload_bytes = stored_payload_bytes = 0
+        codec = None
+        with chunks, get_engine().begin() as conn:
+            _begin_staging(conn)
+            for chunk_index, chunk in enumerate(chunks):
+                is_valid, validation_msg = validate_csv(chunk)
+                if not is_valid:
+                    logger.error("CSV validation failed: %s", validation_msg)
+                    raise ValueError(validation_msg)
 
-    # Step 5: Reload the data into the database
-    try:
-        with engine.begin() as conn:  # Use a transaction to ensure atomicity
-            logger.debug("Dropping existing 'apientry' table if it exists.")
-            conn.execute(text("DROP TABLE IF EXISTS apientry"))
+                rows = _prepare_rows(chunk)
+                if codec is None:
+                    # Trains the payload dictionary from the first chunk if the catalog has none yet.
+                    codec = ensure_codec(conn, [
+                        row[col] for row in rows for col in COMPRESSED_COLUMNS if isinstance(row[col], str)
+                    ])
+                raw_bytes, stored_bytes = compress_rows(rows, codec)
+                payload_bytes += raw_bytes
+                stored_payload_bytes += stored_bytes
+                _stage_rows(conn, rows)
+                total_rows += len(chunk)
+                logger.debug("Staged CSV chunk %d (%d rows so far).", chunk_index, total_rows)
+
+            if total_rows == 0:
+                raise ValueError("CSV file is empty.")
+
+            counts = _apply_staged(conn)
+
+        elapsed = time.perf_counter() - start_time
+        counts["rows"] = total_rows
+        counts["rows_per_second"] = int(total_rows / elapsed) if elapsed > 0 else total_rows
+        counts["payload_bytes"] = payload_bytes
+        counts["stored_payload_bytes"] = stored_payload_bytes
 
-            logger.debug("Inserting new data into 'apientry' table.")
-            df.to_sql('apientry', con=conn, if_exists='replace', index=False)
+        logger.info(
+            "CSV synced into the database at %s: %d rows in %.2fs (%d rows/s); "
+            "%d inserted, %d updated, %d deleted, %d unchanged; payloads compressed %.2fx.",
+            DB_PATH, total_rows, elapsed, counts["rows_per_second"],
+            counts["inserted"], counts["updated"], counts["deleted"], counts["unchanged"],
+            payload_bytes / max(stored_payload_bytes, 1)
+        )
+        message = (
+            f"CSV uploaded: {counts['inserted']} inserted, {counts['updated']} updated, "
+            f"{counts['deleted']} deleted, {counts['unchanged']} unchanged "
+            f"({total_rows} rows at {counts['rows_per_second']} rows/s)."
+        )
+        return True, message, counts
 
-        logger.info("CSV successfully loaded into the database at: %s", DB_PATH)
-        return True, "CSV uploaded and database reloaded successfully!"
+    except ValueError as ve:
+        return False, str(ve), {}
+
+    except pd.errors.ParserError as pe:
+        logger.error("Failed to parse CSV file: %s", pe)
+        return False, f"Error reading CSV file: {pe}", {}
 
     except OperationalError as oe:
         logger.error("Database operational error on path %s: %s", DB_PATH, oe)
-        return False, f"Database operational error: {oe}"
+        return False, f"Database operational error: {oe}", {}
 
     except SQLAlchemyError as sqle:
         logger.error("SQLAlchemy error occurred: %s", sqle)
-        return False, f"SQLAlchemy error: {sqle}"
+        return False, f"SQLAlchemy error: {sqle}", {}
 
     except Exception as e:
         logger.error("Unexpected error occurred while loading CSV: %s", e)
-        return False, f"Unknown error: {e}"
+        return False, f"Unknown error: {e}", {}
+
+
+def purge_and_load_csv(csv_path: str) -> Tuple[bool, str]:
+    """
+    Load the CSV file data into the 'apientry' table. Kept for existing callers; the load is an
+    incremental upsert (see `ingest_csv`) rather than a drop and full reload.
+
+    Args:
+        csv_path (str): Path to the CSV file to be loaded.
+
+    Returns:
+        Tuple[bool, str]: Success status and message.
+    """
+    success, message, _ = ingest_csv(csv_path)
+    return success, message
+
+
+def get_catalog_generation() -> int:
+    """
+    Return the catalog generation, which increases every time an ingest changes 'apientry'. Caches built
+    from the catalog can store the generation they were built at and compare it with this single
+    primary-key read to know whether they are still valid.
+
+    Returns:
+        int: The current generation, or 0 if it cannot be read.
+    """
+    try:
+        with get_engine().connect() as conn:
+            return conn.execute(text("SELECT generation FROM catalog_meta WHERE id = 1")).scalar() or 0
+    except Exception as e:
+        logger.error("Error while reading the catalog generation: %s", e)
+        return 0
+
+
+def get_catalog_changes(since_generation: int) -> Optional[List[Dict]]:
+    """
+    Return the rows changed after the given generation, so a cache can update only those entries.
+
+    Args:
+        since_generation (int): The generation the cache was built at.
+
+    Returns:
+        Optional[List[Dict]]: Changes as dicts with `generation`, `entry_id` and `op` (insert, update or
+        delete), oldest first. None if the change log no longer reaches back to `since_generation`
+        (only the last `CHANGE_LOG_GENERATIONS` are kept) and the cache must be rebuilt.
+    """
+    try:
+        with get_engine().connect() as conn:
+            current = conn.execute(text("SELECT generation FROM catalog_meta WHERE id = 1")).scalar() or 0
+            if since_generation >= current:
+                return []
+            # Generation 1 is the catalog as first migrated, before any changes were logged.
+            if since_generation < max(current - CHANGE_LOG_GENERATIONS, 1):
+                return None
+            result = conn.execute(
+                text(
+                    "SELECT generation, entry_id, op FROM apientry_changes "
+                    "WHERE generation > :since ORDER BY generation, entry_id"
+                ),
+                {"since": since_generation}
+            )
+            return [dict(row) for row in result.mappings()]
+    except Exception as e:
+        logger.error("Error while reading catalog changes: %s", e)
+        return None
+
+
+def _decode_entries(conn: Connection, entries: List[Dict]) -> List[Dict]:
+    """
+    Decompress the example payloads of entry dicts in place, and return them.
+    """
+    for entry in entries:
+        for col in COMPRESSED_COLUMNS:
+            if is_compressed(entry.get(col)):
+                entry[col] = decompress_value(conn, entry[col])
+    return entries
+
+
+def _decode_frame(conn: Connection, df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Decompress the example payload columns of a DataFrame read from 'apientry'.
+    """
+    for col in COMPRESSED_COLUMNS:
+        if col in df.columns:
+            df[col] = [decompress_value(conn, value) for value in df[col]]
+    return df
+
+
+def decode_payload(value: object) -> object:
+    """
+    Return the text of one example payload value, decompressing it if it is stored compressed.
+    """
+    if not is_compressed(value):
+        return value
+    with get_engine().connect() as conn:
+        return decompress_value(conn, value)
 
 
 def get_entries() -> pd.DataFrame:
@@ -117,10 +415,10 @@ def get_entries() -> pd.DataFrame:
         return pd.DataFrame()
 
     try:
-        with engine.connect() as conn:
+        with get_engine().connect() as conn:
             logger.debug("Fetching all entries from 'apientry' table.")
-            result = conn.execute(text("SELECT * FROM apientry"))
-            df = pd.DataFrame(result.fetchall(), columns=result.keys())
+            result = conn.execute(text(f"SELECT id, {ENTRY_COLUMN_LIST} FROM apientry ORDER BY id"))
+            df = _decode_frame(conn, pd.DataFrame(result.fetchall(), columns=result.keys()))
         logger.info("Successfully fetched entries from the database.")
         return df
 
@@ -132,27 +430,14 @@ def get_entries() -> pd.DataFrame:
 def fetch_db_entries() -> List[Dict]:
     """
     Retrieve API entries from the 'apientry' table in the database.
-    Returns a list of dicts with keys: name, category, base_url, endpoint, description.
+    Returns a list of dicts with keys: id, name, category, base_url, endpoint, description,
+    query_parameters, example_request, example_response.
     """
     try:
-        with engine.connect() as conn:
+        with get_engine().connect() as conn:
             logger.debug("Fetching specific columns from 'apientry' table.")
-            result = conn.execute(text(
-                "SELECT name, category, base_url, endpoint, description, query_parameters, example_request, example_response FROM apientry"
-            ))
-            entries = [
-                {
-                    "name": row["name"],
-                    "category": row["category"],
-                    "base_url": row["base_url"],
-                    "endpoint": row["endpoint"],
-                    "description": row["description"],
-                    "query_parameters": row["query_parameters"],
-                    "example_request": row["example_request"],
-                    "example_response": row["example_response"]
-                }
-                for row in result.mappings()
-            ]
+            result = conn.execute(text(f"SELECT id, {ENTRY_COLUMN_LIST} FROM apientry ORDER BY id"))
+            entries = _decode_entries(conn, [dict(row) for row in result.mappings()])
 
         logger.info("Fetched %d entries from the database.", len(entries))
         return entries
@@ -164,31 +449,345 @@ def fetch_db_entries() -> List[Dict]:
 
 def fetch_db_entries_by_names(names: List[str]) -> List[Dict]:
     """
-    Retrieve API entries from 'apientry' table for the given list of names.
+    Retrieve API entries from 'apientry' table for the given list of names. Large name lists are
+    queried in chunks to stay under SQLite's bound-parameter limit.
     """
     if not names:
         return []
 
     try:
-        placeholders = ", ".join([f":name{i}" for i in range(len(names))])
-        params = {f"name{i}": name for i, name in enumerate(names)}
-        with engine.connect() as conn:
-            query = text(f"SELECT name, category, base_url, endpoint, description, query_parameters, example_request, example_response FROM apientry WHERE name IN ({placeholders})")
-            result = conn.execute(query, params)
-            entries = [
-                {
-                    "name": row["name"],
-                    "category": row["category"],
-                    "base_url": row["base_url"],
-                    "endpoint": row["endpoint"],
-                    "description": row["description"],
-                    "query_parameters": row["query_parameters"],
-                    "example_request": row["example_request"],
-                    "example_response": row["example_response"]
-                }
-                for row in result.mappings()
-            ]
+        entries = []
+        with get_engine().connect() as conn:
+            for chunk in _chunked(list(names)):
+                placeholders = ", ".join([f":name{i}" for i in range(len(chunk))])
+                params = {f"name{i}": name for i, name in enumerate(chunk)}
+                query = text(f"SELECT id, {ENTRY_COLUMN_LIST} FROM apientry WHERE name IN ({placeholders})")
+                entries.extend(dict(row) for row in conn.execute(query, params).mappings())
+            _decode_entries(conn, entries)
+        entries.sort(key=lambda entry: entry["id"])
         return entries
     except Exception as e:
         logger.error("Error while fetching entries by names: %s", e)
         return []
+
+
+def _fts_query(query: str) -> str:
+    """
+    Turn free text into an FTS5 MATCH expression: every word must match, words of three or more
+    characters as a prefix (shorter prefixes expand to most of the index). Words are quoted so FTS5
+    operators and punctuation in user input cannot produce a syntax error.
+    """
+    return " ".join(
+        f'"{token}"*' if len(token) >= FTS_MIN_PREFIX_LENGTH else f'"{token}"'
+        for token in re.findall(r"\w+", query)
+    )
+
+
+_fts_enabled: Optional[bool] = None
+
+
+def _has_fts(conn: Connection) -> bool:
+    """
+    Whether the FTS5 search index exists. Cached once found, since the schema never drops it.
+    """
+    global _fts_enabled
+    if not _fts_enabled:
+        _fts_enabled = conn.execute(text(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'apientry_fts'"
+        )).scalar() is not None
+    return _fts_enabled
+
+
+def _build_filter_clause(
+    conn: Connection,
+    categories: Optional[List[str]] = None,
+    text_filter: Optional[str] = None
+) -> Tuple[str, str, str, Dict]:
+    """
+    Build the FROM, WHERE and ORDER BY clauses and bound parameters for the catalog facets and text
+    filter. The text filter uses the FTS5 index, ranked by BM25, when it exists and falls back to
+    LIKE matching otherwise. Columns of 'apientry' must be qualified as `a.<column>`.
+    """
+    source = "apientry a"
+    conditions = []
+    order = "a.id"
+    params = {}
+
+    if categories:
+        placeholders = ", ".join([f":category{i}" for i in range(len(categories))])
+        conditions.append(f"a.category IN ({placeholders})")
+        params.update({f"category{i}": category for i, category in enumerate(categories)})
+
+    if text_filter and text_filter.strip():
+        match = _fts_query(text_filter)
+        if match and _has_fts(conn):
+            # CROSS JOIN pins the FTS table as the outer loop so MATCH runs once, not once per row.
+            source = (
+                f"(SELECT rowid, {FTS_RANK} AS score FROM apientry_fts WHERE apientry_fts MATCH :match) f "
+                "CROSS JOIN apientry a ON a.id = f.rowid"
+            )
+            order = "f.score, a.id"
+            params["match"] = match
+        else:
+            escaped = text_filter.strip().replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+            conditions.append(
+                "(a.name LIKE :text ESCAPE '\\' OR a.category LIKE :text ESCAPE '\\' "
+                "OR a.description LIKE :text ESCAPE '\\')"
+            )
+            params["text"] = f"%{escaped}%"
+
+    where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+    return source, where, order, params
+
+
+def get_categories() -> List[str]:
+    """
+    Retrieve the distinct categories in the 'apientry' table, sorted alphabetically.
+    """
+    try:
+        with get_engine().connect() as conn:
+            result = conn.execute(text(
+                "SELECT DISTINCT category FROM apientry WHERE category IS NOT NULL ORDER BY category"
+            ))
+            return [row[0] for row in result]
+    except Exception as e:
+        logger.error("Error while fetching categories: %s", e)
+        return []
+
+
+def count_entries(categories: Optional[List[str]] = None, text_filter: Optional[str] = None) -> int:
+    """
+    Count the entries matching the given category facets and text filter.
+    """
+    try:
+        with get_engine().connect() as conn:
+            source, where, _, params = _build_filter_clause(conn, categories, text_filter)
+            return conn.execute(text(f"SELECT COUNT(*) FROM {source} {where}"), params).scalar() or 0
+    except Exception as e:
+        logger.error("Error while counting entries: %s", e)
+        return 0
+
+
+def fetch_entries_page(
+    offset: int,
+    limit: int,
+    categories: Optional[List[str]] = None,
+    text_filter: Optional[str] = None
+) -> pd.DataFrame:
+    """
+    Retrieve one page of entries matching the given filters, including each row's `id`. With a text
+    filter, rows are ordered by search relevance; otherwise by `id`.
+
+    Args:
+        offset (int): Number of matching rows to skip.
+        limit (int): Maximum number of rows to return.
+        categories (Optional[List[str]]): Only return entries in these categories.
+        text_filter (Optional[str]): Full-text query over name, category, description and query parameters.
+
+    Returns:
+        pd.DataFrame: The requested page, or an empty DataFrame on error.
+    """
+    try:
+        with get_engine().connect() as conn:
+            source, where, order, params = _build_filter_clause(conn, categories, text_filter)
+            params.update({"limit": limit, "offset": offset})
+            result = conn.execute(
+                text(f"SELECT {QUALIFIED_COLUMN_LIST} FROM {source} {where} ORDER BY {order} LIMIT :limit OFFSET :offset"),
+                params
+            )
+            return _decode_frame(conn, pd.DataFrame(result.fetchall(), columns=result.keys()))
+    except Exception as e:
+        logger.error("Error while fetching entries page: %s", e)
+        return pd.DataFrame()
+
+
+def fetch_db_entries_by_ids(ids: List[int]) -> List[Dict]:
+    """
+    Retrieve API entries from the 'apientry' table for the given ids. Large id lists are queried in
+    chunks to stay under SQLite's bound-parameter limit.
+    """
+    if not ids:
+        return []
+
+    try:
+        entries = []
+        with get_engine().connect() as conn:
+            for chunk in _chunked(list(ids)):
+                placeholders = ", ".join([f":id{i}" for i in range(len(chunk))])
+                params = {f"id{i}": entry_id for i, entry_id in enumerate(chunk)}
+                query = text(f"SELECT id, {ENTRY_COLUMN_LIST} FROM apientry WHERE id IN ({placeholders})")
+                entries.extend(dict(row) for row in conn.execute(query, params).mappings())
+            _decode_entries(conn, entries)
+        entries.sort(key=lambda entry: entry["id"])
+        return entries
+    except Exception as e:
+        logger.error("Error while fetching entries by ids: %s", e)
+        return []
+
+
+def _to_records(rows: Sequence[Sequence], projection: str) -> List[ApiEntry]:
+    """
+    Build `ApiEntry` records from rows of `id`, the summary columns and, for the full projection,
+    the detail columns.
+    """
+    summary_width = 1 + len(SUMMARY_COLUMNS)
+    return [
+        ApiEntry(
+            *row[:summary_width],
+            details=dict(zip(DETAIL_COLUMNS, row[summary_width:])) if projection == FULL else None
+        )
+        for row in rows
+    ]
+
+
+def fetch_entry_records(
+    ids: Optional[List[int]] = None,
+    names: Optional[List[str]] = None,
+    projection: str = SUMMARY
+) -> List[ApiEntry]:
+    """
+    Retrieve catalog entries as compact `ApiEntry` records, reading only the columns the projection needs.
+
+    With the summary projection only id, name, category and description are read; the remaining
+    columns are fetched per record if and when they are accessed. Use the full projection when every
+    column is known to be needed.
+
+    Args:
+        ids (Optional[List[int]]): Only return entries with these ids.
+        names (Optional[List[str]]): Only return entries with these names. Ignored if `ids` is given.
+        projection (str): `SUMMARY` or `FULL`.
+
+    Returns:
+        List[ApiEntry]: Matching entries sorted by id (all entries if neither filter is given).
+    """
+    if projection not in (SUMMARY, FULL):
+        raise ValueError(f"Unknown projection: {projection}")
+
+    columns = ["id"] + SUMMARY_COLUMNS + (DETAIL_COLUMNS if projection == FULL else [])
+    select = f"SELECT {', '.join(columns)} FROM apientry"
+    if ids:
+        key, values = "id", list(ids)
+    elif names:
+        key, values = "name", list(names)
+    else:
+        key, values = None, []
+
+    try:
+        rows = []
+        with get_engine().connect() as conn:
+            if key is None:
+                rows.extend(conn.execute(text(f"{select} ORDER BY id")))
+            else:
+                for chunk in _chunked(values):
+                    placeholders = ", ".join([f":v{i}" for i in range(len(chunk))])
+                    params = {f"v{i}": value for i, value in enumerate(chunk)}
+                    rows.extend(conn.execute(text(f"{select} WHERE {key} IN ({placeholders})"), params))
+                rows.sort(key=lambda row: row[0])
+
+        return _to_records(rows, projection)
+    except Exception as e:
+        logger.error("Error while fetching entry records: %s", e)
+        return []
+
+
+def fetch_entry_details(entry_id: int) -> Dict:
+    """
+    Retrieve the detail columns (see `DETAIL_COLUMNS`) of one entry. Used by `ApiEntry` to load them lazily.
+    Returns None for each column if the entry no longer exists.
+    """
+    with get_engine().connect() as conn:
+        row = conn.execute(
+            text(f"SELECT {', '.join(DETAIL_COLUMNS)} FROM apientry WHERE id = :id"), {"id": entry_id}
+        ).fetchone()
+    return dict(zip(DETAIL_COLUMNS, row if row is not None else [None] * len(DETAIL_COLUMNS)))
+
+
+def _distinct_categories(conn: Connection) -> List[str]:
+    """
+    Distinct non-null categories, found by hopping through the category index one value at a time, so
+    the cost grows with the number of categories rather than the number of rows.
+    """
+    result = conn.execute(text(
+        "WITH RECURSIVE c(category) AS ("
+        " SELECT MIN(category) FROM apientry"
+        " UNION ALL"
+        " SELECT (SELECT MIN(category) FROM apientry WHERE category > c.category) FROM c"
+        " WHERE c.category IS NOT NULL"
+        ") SELECT category FROM c WHERE category IS NOT NULL"
+    ))
+    return [row[0] for row in result]
+
+
+def sample_entry_records(
+    k: int = 3,
+    categories: Optional[List[str]] = None,
+    stratify: bool = False,
+    seed: Optional[int] = None,
+    projection: str = SUMMARY
+) -> List[ApiEntry]:
+    """
+    Randomly sample up to `k` distinct entries inside SQLite, without reading the rest of the catalog.
+
+    Each draw picks a random id between the smallest and largest matching id and takes the first
+    matching row at or after it, an index seek per draw, so the cost is O(k log N) instead of loading
+    all N rows. Ids are assigned densely on ingest; rows just after a gap left by deleted rows are
+    slightly more likely to be drawn.
+
+    Args:
+        k (int): Number of entries to sample.
+        categories (Optional[List[str]]): Only sample from these categories.
+        stratify (bool): Spread the draws evenly across categories (the given ones, or all of them)
+            instead of sampling rows uniformly, so small categories are represented.
+        seed (Optional[int]): Seed for a reproducible sample.
+        projection (str): `SUMMARY` or `FULL`, as for `fetch_entry_records`.
+
+    Returns:
+        List[ApiEntry]: The sampled entries; fewer than `k` if only a handful of entries match.
+    """
+    if projection not in (SUMMARY, FULL):
+        raise ValueError(f"Unknown projection: {projection}")
+    if k <= 0:
+        return []
+
+    rng = random.Random(seed)
+    columns = ["id"] + SUMMARY_COLUMNS + (DETAIL_COLUMNS if projection == FULL else [])
+    select = f"SELECT {', '.join(columns)} FROM apientry"
+
+    try:
+        with get_engine().connect() as conn:
+            if stratify:
+                strata = list(categories) if categories else _distinct_categories(conn)
+                rng.shuffle(strata)
+                filters = [("category = :c0", {"c0": category}) for category in strata]
+            elif categories:
+                placeholders = ", ".join([f":c{i}" for i in range(len(categories))])
+                filters = [(f"category IN ({placeholders})", {f"c{i}": c for i, c in enumerate(categories)})]
+            else:
+                filters = [("1 = 1", {})]
+
+            id_ranges = []
+            for where, params in filters:
+                # Separate subqueries: SQLite only answers a lone MIN()/MAX() from the index without a scan.
+                low, high = conn.execute(text(
+                    f"SELECT (SELECT MIN(id) FROM apientry WHERE {where}), (SELECT MAX(id) FROM apientry WHERE {where})"
+                ), params).fetchone()
+                if low is not None:
+                    id_ranges.append((where, params, low, high))
+
+            rows = {}
+            attempts = 0
+            while id_ranges and len(rows) < k and attempts < k * 10:
+                where, params, low, high = id_ranges[attempts % len(id_ranges)]
+                attempts += 1
+                start = rng.randint(low, high)
+                row = conn.execute(
+                    text(f"{select} WHERE {where} AND id >= :start ORDER BY id LIMIT 1"),
+                    {**params, "start": start}
+                ).fetchone()
+                if row is not None:
+                    rows.setdefault(row[0], row)
+
+        return _to_records(list(rows.values()), projection)
+    except Exception as e:
+        logger.error("Error while sampling entry records: %s", e)
+        return []
@@ -0,0 +1,70 @@
+from src.db.compression import is_compressed
+from src.db.schema import ENTRY_COLUMNS
+from typing import Optional
+from typing import Dict
+from typing import List
+from typing import Any
+
+
+# Projections accepted by `fetch_entry_records`.
+SUMMARY = "summary"
+FULL = "full"
+
+# Columns loaded for every record; the rest are only read when accessed.
+SUMMARY_COLUMNS: List[str] = ["name", "category", "description"]
+DETAIL_COLUMNS: List[str] = [col for col in ENTRY_COLUMNS if col not in SUMMARY_COLUMNS]
+
+
+class ApiEntry:
+    """
+    Compact record for one catalog row.
+
+    Only the summary columns are stored up front. The detail columns (endpoint, query parameters and
+    the potentially large example request/response) are fetched together on first access to any of
+    them, unless the record was loaded with the full projection, and compressed example payloads are
+    only decompressed when read. Supports both attribute and item access (`entry.name`,
+    `entry['name']`), so it can be passed where entry dicts were used.
+    """
+
+    __slots__ = ("id", "name", "category", "description", "_details")
+
+    def __init__(
+        self,
+        id: int,
+        name: str,
+        category: Optional[str],
+        description: Optional[str],
+        details: Optional[Dict[str, Any]] = None
+    ) -> None:
+        self.id = id
+        self.name = name
+        self.category = category
+        self.description = description
+        self._details = details
+
+    def __getattr__(self, attr: str) -> Any:
+        # Only reached when normal lookup fails, i.e. for the detail columns.
+        if attr in DETAIL_COLUMNS:
+            if self._details is None:
+                from src.db.crud import fetch_entry_details
+                self._details = fetch_entry_details(self.id)
+            value = self._details.get(attr)
+            if is_compressed(value):
+                from src.db.crud import decode_payload
+                value = self._details[attr] = decode_payload(value)
+            return value
+        raise AttributeError(f"'{type(self).__name__}' object has no attribute '{attr}'")
+
+    def __getitem__(self, key: str) -> Any:
+        if key != "id" and key not in ENTRY_COLUMNS:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Returns the entry as a dict with `id` and all catalog columns, loading the details if needed.
+        """
+        return {"id": self.id, **{col: getattr(self, col) for col in ENTRY_COLUMNS}}
+
+    def __repr__(self) -> str:
+        return f"ApiEntry(id={self.id!r}, name={self.name!r}, category={self.category!r})"
@@ -0,0 +1,169 @@
+from sqlalchemy.engine import Connection
+from src.db.compression import compress_existing_rows
+from src.db.compression import ZDICT_DDL
+from src.config.logging import logger
+from sqlalchemy import text
+from typing import List
+import time
+
+
+SCHEMA_VERSION = 5
+
+# SQLite's default SQLITE_MAX_VARIABLE_NUMBER is 999 on older builds; stay well below it.
+MAX_BOUND_PARAMETERS = 500
+
+ENTRY_COLUMNS: List[str] = [
+    "name", "category", "base_url", "endpoint",
+    "description", "query_parameters", "example_request", "example_response"
+]
+
+APIENTRY_DDL = """
+    CREATE TABLE IF NOT EXISTS apientry (
+        id INTEGER PRIMARY KEY,
+        name TEXT NOT NULL,
+        category TEXT,
+        base_url TEXT,
+        endpoint TEXT,
+        description TEXT,
+        query_parameters TEXT,
+        example_request TEXT,
+        example_response TEXT,
+        row_hash TEXT,
+        UNIQUE (name, endpoint)
+    )
+"""
+
+# Lookups by name use the (name, endpoint) unique index, whose leading column is name.
+APIENTRY_INDEXES: List[str] = [
+    "CREATE INDEX IF NOT EXISTS idx_apientry_category ON apientry (category)",
+]
+
+
+# Full-text index over the searchable columns, kept in sync with 'apientry' by triggers.
+FTS_COLUMNS: List[str] = ["name", "category", "description", "query_parameters"]
+
+APIENTRY_FTS_DDL: List[str] = [
+    f"""
+    CREATE VIRTUAL TABLE IF NOT EXISTS apientry_fts USING fts5(
+        {', '.join(FTS_COLUMNS)},
+        content='apientry', content_rowid='id', tokenize='porter unicode61'
+    )
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS apientry_fts_insert AFTER INSERT ON apientry BEGIN
+        INSERT INTO apientry_fts (rowid, {', '.join(FTS_COLUMNS)})
+        VALUES (new.id, {', '.join(f'new.{col}' for col in FTS_COLUMNS)});
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS apientry_fts_delete AFTER DELETE ON apientry BEGIN
+        INSERT INTO apientry_fts (apientry_fts, rowid, {', '.join(FTS_COLUMNS)})
+        VALUES ('delete', old.id, {', '.join(f'old.{col}' for col in FTS_COLUMNS)});
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS apientry_fts_update AFTER UPDATE OF {', '.join(FTS_COLUMNS)} ON apientry BEGIN
+        INSERT INTO apientry_fts (apientry_fts, rowid, {', '.join(FTS_COLUMNS)})
+        VALUES ('delete', old.id, {', '.join(f'old.{col}' for col in FTS_COLUMNS)});
+        INSERT INTO apientry_fts (rowid, {', '.join(FTS_COLUMNS)})
+        VALUES (new.id, {', '.join(f'new.{col}' for col in FTS_COLUMNS)});
+    END
+    """,
+]
+
+
+# Catalog generation, bumped by every ingest that changes 'apientry', and the per-row change log
+# written alongside it, so caches can validate themselves or apply just the changed rows.
+CATALOG_META_DDL = """
+    CREATE TABLE IF NOT EXISTS catalog_meta (
+        id INTEGER PRIMARY KEY CHECK (id = 1),
+        generation INTEGER NOT NULL,
+        updated_at REAL NOT NULL
+    )
+"""
+
+APIENTRY_CHANGES_DDL = """
+    CREATE TABLE IF NOT EXISTS apientry_changes (
+        generation INTEGER NOT NULL,
+        entry_id INTEGER NOT NULL,
+        op TEXT NOT NULL CHECK (op IN ('insert', 'update', 'delete')),
+        PRIMARY KEY (generation, entry_id)
+    ) WITHOUT ROWID
+"""
+
+
+def fts5_available(conn: Connection) -> bool:
+    """
+    Whether the SQLite library was built with the FTS5 extension.
+    """
+    return bool(conn.execute(text("SELECT sqlite_compileoption_used('ENABLE_FTS5')")).scalar())
+
+
+def _table_columns(conn: Connection, table: str) -> List[str]:
+    return [row[1] for row in conn.execute(text(f"PRAGMA table_info({table})"))]
+
+
+def _rebuild_legacy_table(conn: Connection, columns: List[str]) -> None:
+    """
+    Copy a table created by `DataFrame.to_sql` (no keys, no indexes) into the managed schema.
+    Rows sharing a (name, endpoint) key are collapsed, keeping the last one.
+    """
+    logger.info("Migrating legacy 'apientry' table to schema version %d.", SCHEMA_VERSION)
+    copied_columns = [col for col in ENTRY_COLUMNS + ["row_hash"] if col in columns]
+    column_list = ", ".join(copied_columns)
+
+    conn.execute(text("ALTER TABLE apientry RENAME TO apientry_legacy"))
+    conn.execute(text("DROP INDEX IF EXISTS idx_apientry_key"))
+    conn.execute(text(APIENTRY_DDL))
+    conn.execute(text(
+        f"INSERT OR REPLACE INTO apientry ({column_list}) "
+        f"SELECT {column_list} FROM apientry_legacy WHERE name IS NOT NULL ORDER BY rowid"
+    ))
+    conn.execute(text("DROP TABLE apientry_legacy"))
+
+
+def ensure_schema(conn: Connection) -> None:
+    """
+    Create the managed 'apientry' schema (surrogate primary key, unique (name, endpoint) key, secondary
+    indexes, the FTS5 search index, compressed example payloads and the catalog generation and change
+    log), migrating older databases in place. Safe to call repeatedly.
+
+    Args:
+        conn (Connection): A connection inside a transaction.
+    """
+    version = conn.execute(text("PRAGMA user_version")).scalar() or 0
+    if version >= SCHEMA_VERSION:
+        return
+
+    if version < 2:
+        columns = _table_columns(conn, "apientry")
+        if columns and "id" not in columns:
+            _rebuild_legacy_table(conn, columns)
+        else:
+            conn.execute(text(APIENTRY_DDL))
+
+        for statement in APIENTRY_INDEXES:
+            conn.execute(text(statement))
+
+    if version < 3:
+        if fts5_available(conn):
+            for statement in APIENTRY_FTS_DDL:
+                conn.execute(text(statement))
+            conn.execute(text("INSERT INTO apientry_fts (apientry_fts) VALUES ('rebuild')"))
+        else:
+            logger.warning("SQLite was built without FTS5; catalog search falls back to LIKE filtering.")
+
+    if version < 4:
+        conn.execute(text(ZDICT_DDL))
+        compress_existing_rows(conn)
+
+    if version < 5:
+        conn.execute(text(CATALOG_META_DDL))
+        conn.execute(text(APIENTRY_CHANGES_DDL))
+        conn.execute(
+            text("INSERT OR IGNORE INTO catalog_meta (id, generation, updated_at) VALUES (1, 1, :now)"),
+            {"now": time.time()}
+        )
+
+    conn.execute(text(f"PRAGMA user_version = {SCHEMA_VERSION}"))
+    logger.info("Database schema is at version %d.", SCHEMA_VERSION)
@@ -1,10 +1,21 @@
 from src.config.setup import initialize_genai_client
+from src.config.logging import get_logger
 from src.config.logging import logger
-from google import genai
+from src.utils.profiling import stage
+from src.utils.tracing import span
+from typing import TYPE_CHECKING
+import logging
 import time
 
+if TYPE_CHECKING:
+    from google import genai
 
-def generate_content(client: genai.Client, model_id: str, prompt: str) -> str:
+# Called once per generated idea or app and from every generated app, so routine records are
+# rate-limited per call site; the response itself is only logged at DEBUG (and truncated).
+llm_logger = get_logger(__name__, max_per_minute=60)
+
+
+def generate_content(client: "genai.Client", model_id: str, prompt: str) -> str:
     """
     Generates content using the GenAI client and specified model.
 
@@ -20,13 +31,17 @@ def generate_content(client: genai.Client, model_id: str, prompt: str) -> str:
         Exception: If content generation fails.
     """
     try:
-        logger.info(f"Generating content using model: {model_id}")
+        llm_logger.debug("Generating content using model: %s", model_id)
         start_time = time.time()  # Start the timer
-        response = client.models.generate_content(model=model_id, contents=prompt)
+        with stage("llm.generate_content"), span("llm.generate_content", model=model_id, prompt_chars=len(prompt)) as call:
+            response = client.models.generate_content(model=model_id, contents=prompt)
+            if call is not None:
+                call.attributes["response_chars"] = len(response.text or "")
         end_time = time.time()  # End the timer
         elapsed_time = end_time - start_time  # Calculate elapsed time
-        logger.info(f"Content generated successfully in {elapsed_time:.2f} seconds.")
-        logger.info(f"Response: {response.text.strip()}")
+        llm_logger.info("Content generated successfully with %s in %.2f seconds.", model_id, elapsed_time)
+        if llm_logger.isEnabledFor(logging.DEBUG):
+            llm_logger.debug("Response: %s", response.text.strip())
         return response
     except Exception as e:
         logger.error("Failed to generate content.")
@@ -41,7 +56,7 @@ def generate_content(client: genai.Client, model_id: str, prompt: str) -> str:
 
 if __name__ == "__main__":
     try:
-        gemini_client: genai.Client = initialize_genai_client()
+        gemini_client = initialize_genai_client()
 
         MODEL_ID: str = "gemini-2.0-flash-exp"
         prompt: str = "What's the largest planet in our solar system?"
@@ -1,7 +1,6 @@
-from src.config.setup import initialize_genai_client
+from src.config.setup import get_genai_client
 from src.config.logging import logger
 from pathlib import Path
-from PIL import Image
 
 
 def generate_multimodal_content(prompt: str, image_path: str) -> str:
@@ -15,8 +14,10 @@ def generate_multimodal_content(prompt: str, image_path: str) -> str:
     Returns:
         str: Generated content text
     """
+    from PIL import Image
+
     try:
-        client = initialize_genai_client()
+        client = get_genai_client()
         image = Image.open(Path(image_path))
         
         response = client.models.generate_content(
@@ -0,0 +1,182 @@
+from src.config.setup import FANOUT_DEADLINE_SECONDS
+from src.config.setup import FANOUT_MAX_WORKERS
+from src.utils.tracing import TracingThreadPoolExecutor
+from src.config.logging import logger
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from concurrent.futures import Future
+from src.utils.tracing import span
+from dataclasses import dataclass
+from dataclasses import field
+from typing import Hashable
+from typing import Callable
+from typing import Iterator
+from typing import Optional
+from typing import Tuple
+from typing import Dict
+from typing import List
+from typing import Any
+import threading
+import queue
+import time
+
+
+@dataclass
+class FanOutResult:
+    """
+    Outcome of the calls of a `FanOut`.
+
+    Attributes:
+        results (Dict[Hashable, Any]): Return values of the calls that finished, by key.
+        errors (Dict[Hashable, str]): Exceptions of the calls that failed, by key.
+        timed_out (List[Hashable]): Keys of the calls still running (or queued) at the deadline.
+        seconds (float): Time from the start of the fan-out until the results were collected.
+    """
+    results: Dict[Hashable, Any] = field(default_factory=dict)
+    errors: Dict[Hashable, str] = field(default_factory=dict)
+    timed_out: List[Hashable] = field(default_factory=list)
+    seconds: float = 0.0
+
+    @property
+    def complete(self) -> bool:
+        """
+        True if every call finished before the deadline, successfully or not.
+        """
+        return not self.timed_out
+
+
+class FanOut:
+    """
+    Runs independent calls (typically API requests) concurrently, at most `max_workers` at a time,
+    under one deadline for the whole group. Whatever has not finished by the deadline is abandoned and
+    reported as timed out, so callers can return partial results instead of waiting on a slow upstream.
+
+    Calls run in copies of the caller's context, so their spans and log lines belong to the caller's
+    trace. Use as a context manager so queued calls are cancelled when the caller is done:
+
+        with FanOut(timeout=10) as fanout:
+            for place_id in place_ids:
+                fanout.submit(place_id, get_details, place_id)
+            outcome = fanout.collect()
+    """
+
+    def __init__(
+        self,
+        max_workers: int = FANOUT_MAX_WORKERS,
+        timeout: float = FANOUT_DEADLINE_SECONDS,
+        name: str = "fanout"
+    ) -> None:
+        """
+        Args:
+            max_workers (int): Maximum number of calls running at once.
+            timeout (float): Seconds from now until the deadline.
+            name (str): Prefix of the worker thread and span names.
+        """
+        self.name = name
+        self.started = time.monotonic()
+        self.deadline = self.started + timeout
+        self._executor = TracingThreadPoolExecutor(max_workers=max_workers, thread_name_prefix=name)
+        self._futures: Dict[Hashable, Future] = {}
+        self._finished: "queue.SimpleQueue[Hashable]" = queue.SimpleQueue()
+        self._lock = threading.Lock()
+
+    def __enter__(self) -> "FanOut":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    def __contains__(self, key: Hashable) -> bool:
+        with self._lock:
+            return key in self._futures
+
+    def remaining(self) -> float:
+        """
+        Returns the seconds left until the deadline, 0 once it has passed.
+        """
+        return max(0.0, self.deadline - time.monotonic())
+
+    def _call(self, key: Hashable, fn: Callable, args: Tuple, kwargs: Dict[str, Any]) -> Any:
+        with span(f"{self.name}.call", key=str(key)):
+            return fn(*args, **kwargs)
+
+    def submit(self, key: Hashable, fn: Callable, *args: Any, **kwargs: Any) -> None:
+        """
+        Starts `fn(*args, **kwargs)` as soon as a worker is free. Calls may be submitted at any time,
+        including while iterating over `as_completed`.
+
+        Raises:
+            ValueError: If a call was already submitted under `key`.
+        """
+        with self._lock:
+            if key in self._futures:
+                raise ValueError(f"A call was already submitted under key {key!r}.")
+            future = self._futures[key] = self._executor.submit(self._call, key, fn, args, kwargs)
+        future.add_done_callback(lambda _: self._finished.put(key))
+
+    def result(self, key: Hashable, default: Any = None) -> Any:
+        """
+        Waits (until the deadline at most) for the call submitted under `key`.
+
+        Returns:
+            Any: Its return value, or `default` if it failed or did not finish in time.
+        """
+        future = self._futures[key]
+        try:
+            return future.result(timeout=self.remaining())
+        except FutureTimeoutError:
+            logger.warning(f"{self.name}: '{key}' did not finish before the deadline.")
+        except Exception as e:
+            logger.warning(f"{self.name}: '{key}' failed: {e}")
+        return default
+
+    def as_completed(self) -> Iterator[Tuple[Hashable, Any, Optional[BaseException]]]:
+        """
+        Yields (key, return value, None) or (key, None, exception) for each call as it finishes, until
+        every submitted call has been yielded or the deadline passes. Each call is yielded once, so
+        iterate only once per fan-out (`collect` iterates too).
+        """
+        yielded = 0
+        while True:
+            with self._lock:
+                if yielded >= len(self._futures):
+                    return
+            try:
+                key = self._finished.get(timeout=self.remaining())
+            except queue.Empty:
+                return
+            yielded += 1
+            future = self._futures[key]
+            error = future.exception()
+            yield key, (None if error else future.result()), error
+
+    def collect(self) -> FanOutResult:
+        """
+        Waits until every submitted call has finished or the deadline has passed, whichever is first.
+
+        Returns:
+            FanOutResult: Results and errors of the finished calls and the keys of the unfinished ones.
+        """
+        outcome = FanOutResult()
+        for key, value, error in self.as_completed():
+            if error is None:
+                outcome.results[key] = value
+            else:
+                outcome.errors[key] = f"{type(error).__name__}: {error}"
+                logger.warning(f"{self.name}: '{key}' failed: {error}")
+        with self._lock:
+            outcome.timed_out = [
+                key for key in self._futures if key not in outcome.results and key not in outcome.errors
+            ]
+        outcome.seconds = time.monotonic() - self.started
+        if outcome.timed_out:
+            logger.warning(
+                f"{self.name}: deadline reached after {outcome.seconds:.1f}s with "
+                f"{len(outcome.timed_out)} of {len(self._futures)} calls unfinished; returning partial results."
+            )
+        return outcome
+
+    def close(self) -> None:
+        """
+        Cancels queued calls without waiting for running ones, whose results are discarded.
+        """
+        self._executor.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,138 @@
+from src.config.setup import HTTP_CONNECT_TIMEOUT_SECONDS
+from src.config.setup import HTTP_READ_TIMEOUT_SECONDS
+from src.config.setup import HTTP_BACKOFF_SECONDS
+from src.config.setup import HTTP_POOL_SIZE
+from src.config.setup import HTTP_RETRIES
+from requests.adapters import HTTPAdapter
+from urllib.parse import urlsplit
+from urllib3.util import Retry
+from typing import Optional
+from typing import Tuple
+from typing import Dict
+from typing import Any
+import threading
+import requests
+import os
+
+
+DEFAULT_TIMEOUT: Tuple[float, float] = (HTTP_CONNECT_TIMEOUT_SECONDS, HTTP_READ_TIMEOUT_SECONDS)
+
+# Retried with exponential backoff (honouring Retry-After), as are failed connection attempts. A read
+# timeout is not retried, so a hung upstream costs one read timeout rather than one per attempt.
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+RETRY_METHODS = frozenset({"GET", "HEAD", "OPTIONS"})
+
+DEFAULT_HEADERS: Dict[str, str] = {
+    "Accept-Encoding": "gzip, deflate",
+    "User-Agent": "agentic-app-builder",
+}
+
+_sessions: Dict[Tuple[str, str], requests.Session] = {}
+_sessions_lock = threading.Lock()
+
+
+def _new_session() -> requests.Session:
+    retry = Retry(
+        total=HTTP_RETRIES,
+        read=False,
+        backoff_factor=HTTP_BACKOFF_SECONDS,
+        status_forcelist=RETRY_STATUSES,
+        allowed_methods=RETRY_METHODS,
+        respect_retry_after_header=True,
+        raise_on_status=False
+    )
+    adapter = HTTPAdapter(pool_connections=1, pool_maxsize=HTTP_POOL_SIZE, max_retries=retry)
+    session = requests.Session()
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    session.headers.update(DEFAULT_HEADERS)
+    return session
+
+
+def get_session(url: str) -> requests.Session:
+    """
+    Return the shared session for the URL's scheme and host, creating it on first use.
+
+    Each host gets its own connection pool, so repeated calls reuse kept-alive connections instead of
+    paying a new TCP and TLS handshake, and a slow host cannot exhaust the connections of another.
+
+    Args:
+        url (str): Any URL on the host.
+
+    Returns:
+        requests.Session: The host's session. Do not close it or change its shared state.
+    """
+    parts = urlsplit(url)
+    key = (parts.scheme, parts.netloc)
+    session = _sessions.get(key)
+    if session is None:
+        with _sessions_lock:
+            session = _sessions.get(key)
+            if session is None:
+                session = _sessions[key] = _new_session()
+    return session
+
+
+def request(method: str, url: str, timeout: Optional[Any] = None, **kwargs: Any) -> requests.Response:
+    """
+    Send a request through the host's pooled session.
+
+    Requests that fail to connect, and idempotent requests that get a 429 or 5xx response, are retried
+    up to `HTTP_RETRIES` times with exponential backoff. A read timeout is raised without retrying.
+    Responses are gzip-decompressed transparently.
+
+    Args:
+        method (str): HTTP method.
+        url (str): Request URL.
+        timeout (Optional[Any]): Seconds, or a (connect, read) tuple. Defaults to `DEFAULT_TIMEOUT`;
+            there is no way to wait forever.
+        **kwargs: Passed to `requests.Session.request` (params, headers, json, ...).
+
+    Returns:
+        requests.Response: The final response; call `raise_for_status()` to turn errors into exceptions.
+
+    Raises:
+        requests.exceptions.RequestException: If the request could not be completed.
+    """
+    return get_session(url).request(method, url, timeout=timeout or DEFAULT_TIMEOUT, **kwargs)
+
+
+def get(url: str, params: Optional[Dict[str, Any]] = None, **kwargs: Any) -> requests.Response:
+    """
+    Send a GET request through the host's pooled session. See `request`.
+    """
+    return request("GET", url, params=params, **kwargs)
+
+
+def get_json(url: str, params: Optional[Dict[str, Any]] = None, **kwargs: Any) -> Any:
+    """
+    Send a GET request and return the decoded JSON body.
+
+    Raises:
+        requests.exceptions.RequestException: If the request failed or returned an error status.
+        ValueError: If the body is not valid JSON.
+    """
+    response = get(url, params=params, **kwargs)
+    response.raise_for_status()
+    return response.json()
+
+
+def close_sessions() -> None:
+    """
+    Close all pooled sessions and their connections.
+    """
+    with _sessions_lock:
+        sessions = list(_sessions.values())
+        _sessions.clear()
+    for session in sessions:
+        session.close()
+
+
+def _reset_in_child() -> None:
+    # Pooled sockets must not be shared with a forked child; it opens its own.
+    global _sessions_lock
+    _sessions.clear()
+    _sessions_lock = threading.Lock()
+
+
+os.register_at_fork(after_in_child=_reset_in_child)
@@ -1,15 +1,115 @@
 from src.config.logging import logger 
+from collections import OrderedDict
+from typing import Callable
 from typing import Optional
+from typing import Tuple
+from typing import Union
 from typing import Dict 
 from typing import Any 
+import threading
 import json 
+import mmap
 import yaml
 import os
 
 
+# Parsed file contents are cached per path and parser, keyed by (inode, mtime, size), so a file
+# is only re-read and re-parsed after it changes on disk.
+FILE_CACHE_MAX_ENTRIES = 128
+
+# Files at least this large are memory-mapped and parsed from the mapping instead of being read
+# into an intermediate buffer first.
+MMAP_MIN_BYTES = 1024 * 1024
+
+_file_cache: "OrderedDict[Tuple[str, str], Tuple[Tuple[int, int, int], Any]]" = OrderedDict()
+_file_cache_lock = threading.Lock()
+_json_loads: Optional[Callable[[Union[bytes, memoryview]], Any]] = None
+
+
+def _stdlib_json_loads(data: Union[bytes, memoryview]) -> Any:
+    return json.loads(str(data, 'utf-8'))
+
+
+def _get_json_loads() -> Callable[[Union[bytes, memoryview]], Any]:
+    # orjson, if installed, is several times faster and parses bytes and memoryviews without
+    # decoding them first. Its decode error subclasses json.JSONDecodeError, so callers handle
+    # both the same way.
+    global _json_loads
+    if _json_loads is None:
+        try:
+            import orjson
+            _json_loads = orjson.loads
+        except ImportError:
+            _json_loads = _stdlib_json_loads
+    return _json_loads
+
+
+def _read_and_parse(path: str, size: int, parser: Callable[[Union[bytes, memoryview]], Any]) -> Any:
+    with open(path, 'rb') as file:
+        if size < MMAP_MIN_BYTES:
+            return parser(file.read())
+        # Parse straight from the page cache; the view must be released before the mapping closes.
+        with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapping, memoryview(mapping) as view:
+            return parser(view)
+
+
+def _parse_text(data: Union[bytes, memoryview]) -> str:
+    text = str(data, 'utf-8')
+    # Match text-mode reads, which translate "\r\n" and lone "\r" to "\n".
+    if "\r" in text:
+        text = text.replace("\r\n", "\n").replace("\r", "\n")
+    return text
+
+
+def _parse_yaml(data: Union[bytes, memoryview]) -> Any:
+    return yaml.load(str(data, 'utf-8'), Loader=getattr(yaml, "CSafeLoader", yaml.SafeLoader))
+
+
+def _parse_json(data: Union[bytes, memoryview]) -> Any:
+    return _get_json_loads()(data)
+
+
+def _load_cached(path: str, parser: Callable[[Union[bytes, memoryview]], Any]) -> Any:
+    """
+    Return `parser` applied to the file's bytes, reusing the previous result while the file's inode,
+    mtime and size are unchanged. The result is shared between callers and must not be mutated.
+
+    Raises:
+        OSError: If the file cannot be read.
+        Exception: Whatever `parser` raises; failed parses are not cached.
+    """
+    path = os.path.abspath(path)
+    stat = os.stat(path)
+    key = (stat.st_ino, stat.st_mtime_ns, stat.st_size)
+    cache_key = (path, parser.__name__)
+
+    with _file_cache_lock:
+        cached = _file_cache.get(cache_key)
+        if cached is not None and cached[0] == key:
+            _file_cache.move_to_end(cache_key)
+            return cached[1]
+
+    value = _read_and_parse(path, stat.st_size, parser)
+    with _file_cache_lock:
+        _file_cache[cache_key] = (key, value)
+        _file_cache.move_to_end(cache_key)
+        while len(_file_cache) > FILE_CACHE_MAX_ENTRIES:
+            _file_cache.popitem(last=False)
+    return value
+
+
+def clear_file_cache() -> None:
+    """
+    Drop all cached file contents.
+    """
+    with _file_cache_lock:
+        _file_cache.clear()
+
+
 def load_yaml(filename: str) -> Dict[str, Any]:
     """
-    Load a YAML file and return its contents.
+    Load a YAML file and return its contents. The parsed object is cached until the file changes, so
+    it is shared between callers and must not be mutated.
 
     Args:
         filename (str): The path to the YAML file.
@@ -23,8 +123,7 @@ def load_yaml(filename: str) -> Dict[str, Any]:
         Exception: For any other exceptions.
     """
     try:
-        with open(filename, 'r') as file:
-            return yaml.safe_load(file)
+        return _load_cached(filename, _parse_yaml)
     except FileNotFoundError:
         logger.error(f"File '{filename}' not found.")
         raise
@@ -38,7 +137,8 @@ def load_yaml(filename: str) -> Dict[str, Any]:
 
 def load_json(filename: str) -> Optional[Dict[str, Any]]:
     """
-    Load a JSON file and return its contents.
+    Load a JSON file and return its contents, using orjson when it is installed. The parsed object is
+    cached until the file changes, so it is shared between callers and must not be mutated.
 
     Args:
         filename (str): The path to the JSON file.
@@ -52,8 +152,7 @@ def load_json(filename: str) -> Optional[Dict[str, Any]]:
         Exception: For any other exceptions.
     """
     try:
-        with open(filename, 'r') as file:
-            return json.load(file)
+        return _load_cached(filename, _parse_json)
     except FileNotFoundError:
         logger.error(f"File '{filename}' not found.")
         return None
@@ -67,7 +166,8 @@ def load_json(filename: str) -> Optional[Dict[str, Any]]:
 
 def read_file(path: str) -> Optional[str]:
     """
-    Reads the content of a markdown file and returns it as a text object.
+    Reads the content of a markdown file and returns it as a text object. The content is cached until
+    the file changes.
 
     Args:
         path (str): The path to the markdown file.
@@ -76,9 +176,7 @@ def read_file(path: str) -> Optional[str]:
         Optional[str]: The content of the file as a string, or None if the file could not be read.
     """
     try:
-        with open(path, 'r', encoding='utf-8') as file:
-            content: str = file.read()
-        return content
+        return _load_cached(path, _parse_text)
     except FileNotFoundError:
         logger.info(f"File not found: {path}")
         return None
@@ -0,0 +1,187 @@
+from src.config.setup import PROFILES_DIR
+from src.config.logging import logger
+from contextlib import contextmanager
+from dataclasses import dataclass
+from dataclasses import field
+from typing import ContextManager
+from typing import Callable
+from typing import Iterator
+from typing import Optional
+from typing import List
+from typing import Any
+import functools
+import threading
+import inspect
+import cProfile
+import pstats
+import time
+import os
+
+
+@dataclass
+class StageTiming:
+    """
+    Wall-clock duration of one instrumented stage.
+
+    Attributes:
+        name (str): Stage name.
+        start (float): Offset in seconds from the start of the rerun.
+        seconds (float): Elapsed wall-clock time.
+        depth (int): Nesting depth, 0 for top-level stages.
+    """
+    name: str
+    start: float
+    seconds: float
+    depth: int
+
+
+@dataclass
+class RerunProfile:
+    """
+    Timings collected during one rerun of the builder app.
+
+    Attributes:
+        stages (List[StageTiming]): Stages in the order they finished.
+        started_at (float): `time.perf_counter()` value when the rerun started.
+        total_seconds (float): Wall-clock time of the whole rerun.
+        profile_path (Optional[str]): Path of the pstats dump, if one was captured.
+    """
+    stages: List[StageTiming] = field(default_factory=list)
+    started_at: float = 0.0
+    total_seconds: float = 0.0
+    profile_path: Optional[str] = None
+    _depth: int = field(default=0, repr=False)
+
+
+_local = threading.local()
+
+
+def _current() -> Optional[RerunProfile]:
+    return getattr(_local, "rerun", None)
+
+
+def is_recording() -> bool:
+    """
+    Returns True inside `record_rerun` on the current thread.
+    """
+    return _current() is not None
+
+
+@contextmanager
+def stage(name: str) -> Iterator[None]:
+    """
+    Times the enclosed block as a stage of the current rerun. Does nothing outside `record_rerun`, so
+    instrumented code pays only an attribute lookup when profiling is off.
+
+    Args:
+        name (str): Stage name shown in the timing panel.
+    """
+    rerun = _current()
+    if rerun is None:
+        yield
+        return
+
+    depth = rerun._depth
+    rerun._depth += 1
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        rerun._depth = depth
+        rerun.stages.append(StageTiming(
+            name=name,
+            start=start - rerun.started_at,
+            seconds=time.perf_counter() - start,
+            depth=depth
+        ))
+
+
+def instrument(context: Callable[[str], ContextManager], name: Optional[str] = None) -> Callable:
+    """
+    Decorator factory that runs each call of the wrapped function inside `context(name)`. Generator
+    functions are wrapped across their whole iteration rather than just the call that creates the
+    generator.
+
+    Args:
+        context (Callable[[str], ContextManager]): Context manager factory taking the name, e.g. `stage`.
+        name (Optional[str]): Name passed to `context`, defaults to the function's name.
+    """
+    def decorator(func: Callable) -> Callable:
+        context_name = name or func.__name__
+
+        if inspect.isgeneratorfunction(func):
+            @functools.wraps(func)
+            def generator_wrapper(*args: Any, **kwargs: Any):
+                with context(context_name):
+                    yield from func(*args, **kwargs)
+            return generator_wrapper
+
+        @functools.wraps(func)
+        def wrapper(*args: Any, **kwargs: Any):
+            with context(context_name):
+                return func(*args, **kwargs)
+        return wrapper
+
+    return decorator
+
+
+def timed(name: Optional[str] = None) -> Callable:
+    """
+    Decorator that records each call of the wrapped function as a stage of the current rerun.
+
+    Args:
+        name (Optional[str]): Stage name, defaults to the function's name.
+    """
+    return instrument(stage, name)
+
+
+@contextmanager
+def record_rerun(capture_profile: bool = False, slow_rerun_seconds: Optional[float] = None) -> Iterator[RerunProfile]:
+    """
+    Collects stage timings for the enclosed rerun and optionally captures a cProfile dump of it.
+
+    Args:
+        capture_profile (bool): Always write a pstats dump of this rerun.
+        slow_rerun_seconds (Optional[float]): Profile the rerun and keep the dump only if it takes longer
+            than this many seconds.
+
+    Yields:
+        RerunProfile: The timings, filled in as stages complete.
+    """
+    rerun = RerunProfile(started_at=time.perf_counter())
+    profiler = cProfile.Profile() if capture_profile or slow_rerun_seconds is not None else None
+    _local.rerun = rerun
+    if profiler:
+        profiler.enable()
+    try:
+        yield rerun
+    finally:
+        if profiler:
+            profiler.disable()
+        rerun.total_seconds = time.perf_counter() - rerun.started_at
+        _local.rerun = None
+
+        is_slow = slow_rerun_seconds is not None and rerun.total_seconds > slow_rerun_seconds
+        if profiler and (capture_profile or is_slow):
+            rerun.profile_path = dump_profile(profiler)
+
+
+def dump_profile(profiler: cProfile.Profile) -> Optional[str]:
+    """
+    Writes a profiler's stats to a timestamped `.pstats` file in the profiles directory.
+
+    Args:
+        profiler (cProfile.Profile): A disabled profiler.
+
+    Returns:
+        Optional[str]: Path of the dump, or None if it could not be written.
+    """
+    try:
+        os.makedirs(PROFILES_DIR, exist_ok=True)
+        path = os.path.join(PROFILES_DIR, f"rerun-{time.strftime('%Y%m%d-%H%M%S')}-{os.getpid()}.pstats")
+        pstats.Stats(profiler).dump_stats(path)
+        logger.info(f"Rerun profile written to {path}")
+        return path
+    except Exception as e:
+        logger.error(f"Failed to write rerun profile: {e}")
+        return None
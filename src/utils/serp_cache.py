@@ -0,0 +1,431 @@
+from src.config.setup import SERP_CACHE_DEFAULT_TTL_SECONDS
+from src.config.setup import SERP_CACHE_MEMORY_ENTRIES
+from src.config.setup import SERP_CACHE_MAX_STALE_SECONDS
+from src.config.setup import SERP_CACHE_STALE_TTL_FACTOR
+from src.config.setup import SERP_CACHE_TTL_SECONDS
+from src.config.setup import SERP_CACHE_ENABLED
+from src.config.setup import SERP_CACHE_PATH
+from src.config.setup import SERP_SEARCH_URL
+from src.config.setup import get_serp_api_key
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import Future
+from src.config.logging import logger
+from collections import OrderedDict
+from dataclasses import dataclass
+from src.utils import http
+from typing import Callable
+from typing import Optional
+from typing import Tuple
+from typing import Dict
+from typing import Any
+import functools
+import threading
+import sqlite3
+import hashlib
+import atexit
+import json
+import time
+import zlib
+import os
+
+
+# Parameters that do not change the results and must never end up in a cache key or on disk.
+EXCLUDED_PARAMS = frozenset({"api_key", "no_cache", "async"})
+
+# Google vertical selected with `tbm`, for TTL lookup.
+TBM_ENGINES = {"isch": "google_images", "nws": "google_news", "shop": "google_shopping", "lcl": "google_local"}
+
+# Expired rows are purged after this many writes.
+PURGE_EVERY_WRITES = 100
+
+CACHE_DDL = """
+    CREATE TABLE IF NOT EXISTS serp_cache (
+        key TEXT PRIMARY KEY,
+        engine TEXT NOT NULL,
+        body BLOB NOT NULL,
+        fetched_at REAL NOT NULL,
+        expires_at REAL NOT NULL
+    ) WITHOUT ROWID
+"""
+
+
+@dataclass
+class CacheEntry:
+    """
+    A cached response body.
+
+    Attributes:
+        body (bytes): The JSON response, UTF-8 encoded.
+        fetched_at (float): Epoch timestamp of the fetch.
+        expires_at (float): Epoch timestamp after which the entry is stale.
+    """
+    body: bytes
+    fetched_at: float
+    expires_at: float
+
+
+def _normalize(value: Any) -> Any:
+    if isinstance(value, str):
+        return " ".join(value.split())
+    if isinstance(value, bool):
+        return str(value).lower()
+    if isinstance(value, (int, float)):
+        return str(value)
+    if isinstance(value, (list, tuple)):
+        return [_normalize(item) for item in value]
+    if isinstance(value, dict):
+        return {str(key): _normalize(item) for key, item in value.items()}
+    return str(value)
+
+
+def engine_for(params: Dict[str, Any]) -> str:
+    """
+    Returns the SERP API engine a request goes to, resolving Google verticals selected with `tbm`.
+    """
+    engine = str(params.get("engine") or "google")
+    if engine == "google" and params.get("tbm") in TBM_ENGINES:
+        return TBM_ENGINES[params["tbm"]]
+    return engine
+
+
+def cache_key(namespace: str, params: Dict[str, Any]) -> str:
+    """
+    Returns the cache key of a request: a hash of the namespace and the parameters with the API key and
+    other result-neutral parameters removed, whitespace collapsed, values stringified and keys sorted,
+    so equivalent requests share an entry.
+    """
+    normalized = {
+        str(key): _normalize(value) for key, value in params.items()
+        if key not in EXCLUDED_PARAMS and value is not None
+    }
+    payload = json.dumps([namespace, normalized], sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class SerpCache:
+    """
+    Two-level (memory, then SQLite on disk) TTL cache for SERP API responses, shared by every generated
+    app and process on the machine.
+
+    A fresh entry is returned as is. An entry past its TTL but within the stale window is returned
+    immediately and refreshed in the background. Anything older, or missing, is fetched while the
+    caller waits; concurrent requests for the same key share one fetch.
+    """
+
+    def __init__(
+        self,
+        path: str = SERP_CACHE_PATH,
+        ttls: Optional[Dict[str, float]] = None,
+        default_ttl: float = SERP_CACHE_DEFAULT_TTL_SECONDS,
+        stale_factor: float = SERP_CACHE_STALE_TTL_FACTOR,
+        max_stale_seconds: float = SERP_CACHE_MAX_STALE_SECONDS,
+        memory_entries: int = SERP_CACHE_MEMORY_ENTRIES
+    ) -> None:
+        """
+        Args:
+            path (str): Path of the SQLite file.
+            ttls (Optional[Dict[str, float]]): TTL in seconds per engine. Defaults to `SERP_CACHE_TTL_SECONDS`.
+            default_ttl (float): TTL of engines not in `ttls`.
+            stale_factor (float): An entry may be served for its TTL times this factor past its TTL
+                while it is refreshed.
+            max_stale_seconds (float): Upper bound of that stale window.
+            memory_entries (int): Entries kept in memory in front of the SQLite file.
+        """
+        self.path = path
+        self.ttls = SERP_CACHE_TTL_SECONDS if ttls is None else ttls
+        self.default_ttl = default_ttl
+        self.stale_factor = stale_factor
+        self.max_stale_seconds = max_stale_seconds
+        self.memory_entries = memory_entries
+        self._memory: "OrderedDict[str, CacheEntry]" = OrderedDict()
+        self._inflight: Dict[str, Future] = {}
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._refresher = ThreadPoolExecutor(max_workers=2, thread_name_prefix="serp-refresh")
+        self._writes = 0
+        self._stats = {"fresh_hits": 0, "stale_hits": 0, "misses": 0, "refreshes": 0, "errors": 0}
+
+    def ttl_for(self, engine: str) -> float:
+        return self.ttls.get(engine, self.default_ttl)
+
+    def stale_for(self, ttl: float) -> float:
+        """
+        Returns how long past a TTL of `ttl` seconds an entry may be served while it is refreshed.
+        """
+        return min(ttl * self.stale_factor, self.max_stale_seconds)
+
+    def _connection(self) -> Optional[sqlite3.Connection]:
+        # SQLite connections cannot be shared between threads, so each thread opens its own.
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            try:
+                os.makedirs(os.path.dirname(self.path), exist_ok=True)
+                conn = sqlite3.connect(self.path, timeout=5.0, isolation_level=None)
+                conn.execute("PRAGMA journal_mode=WAL")
+                conn.execute("PRAGMA synchronous=NORMAL")
+                conn.execute(CACHE_DDL)
+            except sqlite3.Error as e:
+                logger.warning(f"SERP cache at '{self.path}' is unavailable, using memory only: {e}")
+                conn = False
+            self._local.conn = conn
+        return conn or None
+
+    def _load(self, key: str) -> Optional[CacheEntry]:
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                self._memory.move_to_end(key)
+                return entry
+
+        conn = self._connection()
+        if conn is None:
+            return None
+        try:
+            row = conn.execute(
+                "SELECT body, fetched_at, expires_at FROM serp_cache WHERE key = ?", (key,)
+            ).fetchone()
+        except sqlite3.Error as e:
+            logger.warning(f"Could not read the SERP cache: {e}")
+            return None
+        if row is None:
+            return None
+        entry = CacheEntry(zlib.decompress(row[0]), row[1], row[2])
+        self._remember(key, entry)
+        return entry
+
+    def _remember(self, key: str, entry: CacheEntry) -> None:
+        with self._lock:
+            self._memory[key] = entry
+            self._memory.move_to_end(key)
+            while len(self._memory) > self.memory_entries:
+                self._memory.popitem(last=False)
+
+    def _store(self, key: str, engine: str, entry: CacheEntry) -> None:
+        self._remember(key, entry)
+        conn = self._connection()
+        if conn is None:
+            return
+        try:
+            conn.execute(
+                "INSERT OR REPLACE INTO serp_cache (key, engine, body, fetched_at, expires_at) VALUES (?, ?, ?, ?, ?)",
+                (key, engine, zlib.compress(entry.body, 1), entry.fetched_at, entry.expires_at)
+            )
+            with self._lock:
+                self._writes += 1
+                purge = self._writes % PURGE_EVERY_WRITES == 0
+            if purge:
+                conn.execute("DELETE FROM serp_cache WHERE expires_at < ?", (time.time() - self.max_stale_seconds,))
+        except sqlite3.Error as e:
+            logger.warning(f"Could not write to the SERP cache: {e}")
+
+    def _count(self, stat: str) -> None:
+        with self._lock:
+            self._stats[stat] += 1
+
+    def _fetch(self, key: str, engine: str, ttl: float, fetch: Callable[[], Tuple[bytes, bool]]) -> bytes:
+        """
+        Runs `fetch` once for all concurrent callers of `key`, caching the body if it is cacheable.
+        """
+        with self._lock:
+            future = self._inflight.get(key)
+            owner = future is None
+            if owner:
+                future = self._inflight[key] = Future()
+        if not owner:
+            return future.result()
+
+        try:
+            body, cacheable = fetch()
+            if cacheable:
+                now = time.time()
+                self._store(key, engine, CacheEntry(body, now, now + ttl))
+            future.set_result(body)
+            return body
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        finally:
+            with self._lock:
+                self._inflight.pop(key, None)
+
+    def _refresh(self, key: str, engine: str, ttl: float, fetch: Callable[[], Tuple[bytes, bool]]) -> None:
+        try:
+            self._fetch(key, engine, ttl, fetch)
+            self._count("refreshes")
+        except Exception as e:
+            self._count("errors")
+            logger.warning(f"Background refresh of a cached {engine} response failed, keeping the stale one: {e}")
+
+    def get_or_fetch(
+        self,
+        key: str,
+        engine: str,
+        fetch: Callable[[], Tuple[bytes, bool]],
+        ttl: Optional[float] = None
+    ) -> bytes:
+        """
+        Returns the cached body for `key`, fetching or refreshing it as needed.
+
+        Args:
+            key (str): Cache key, see `cache_key`.
+            engine (str): Engine of the request, which selects the TTL.
+            fetch (Callable[[], Tuple[bytes, bool]]): Returns the response body and whether it may be cached.
+            ttl (Optional[float]): Overrides the engine's TTL.
+
+        Returns:
+            bytes: The response body.
+
+        Raises:
+            Exception: Whatever `fetch` raises when there is no usable cached entry.
+        """
+        ttl = self.ttl_for(engine) if ttl is None else ttl
+        if not SERP_CACHE_ENABLED or ttl <= 0:
+            return fetch()[0]
+
+        entry = self._load(key)
+        now = time.time()
+        if entry is not None and now < entry.expires_at:
+            self._count("fresh_hits")
+            return entry.body
+        if entry is not None and now < entry.expires_at + self.stale_for(ttl):
+            self._count("stale_hits")
+            with self._lock:
+                refreshing = key in self._inflight
+            if not refreshing:
+                self._refresher.submit(self._refresh, key, engine, ttl, fetch)
+            return entry.body
+
+        self._count("misses")
+        try:
+            return self._fetch(key, engine, ttl, fetch)
+        except Exception:
+            self._count("errors")
+            raise
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Returns the hit, miss, refresh and error counts of this process and its hit rate.
+        """
+        with self._lock:
+            stats = dict(self._stats)
+        lookups = stats["fresh_hits"] + stats["stale_hits"] + stats["misses"]
+        stats["hit_rate"] = (stats["fresh_hits"] + stats["stale_hits"]) / lookups if lookups else 0.0
+        return stats
+
+    def clear(self) -> None:
+        """
+        Drops every cached response, in memory and on disk.
+        """
+        with self._lock:
+            self._memory.clear()
+        conn = self._connection()
+        if conn is not None:
+            conn.execute("DELETE FROM serp_cache")
+
+
+_cache: Optional[SerpCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_serp_cache() -> SerpCache:
+    """
+    Returns the process-wide SERP cache.
+    """
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                _cache = SerpCache()
+    return _cache
+
+
+def _fetch_json(url: str, params: Dict[str, Any]) -> Tuple[bytes, bool]:
+    response = http.get(url, params=params)
+    response.raise_for_status()
+    body = response.content
+    # `response.json()` raises `requests.exceptions.JSONDecodeError`, a `RequestException`, like the
+    # uncached call did; the body is then neither cached nor returned.
+    data = response.json()
+    # SerpApi reports problems such as an empty result set as a JSON `error`; those are not cached.
+    return body, not (isinstance(data, dict) and data.get("error"))
+
+
+def _is_truthy(value: Any) -> bool:
+    if isinstance(value, str):
+        return value.strip().lower() not in ("", "0", "false", "no")
+    return bool(value)
+
+
+def search(params: Dict[str, Any], url: str = SERP_SEARCH_URL, ttl: Optional[float] = None) -> Dict[str, Any]:
+    """
+    Sends a SERP API request through the shared HTTP client, answering it from the cache when possible.
+
+    Args:
+        params (Dict[str, Any]): Request parameters. The API key is added if missing and is never part
+            of the cache key.
+        url (str): Endpoint, `https://serpapi.com/search` by default.
+        ttl (Optional[float]): Overrides the engine's TTL; 0 bypasses the cache, as does a truthy
+            `no_cache` parameter.
+
+    Returns:
+        Dict[str, Any]: The decoded JSON response, a new object on every call.
+
+    Raises:
+        requests.exceptions.RequestException: If the request failed or its response is not valid JSON
+            (`requests.exceptions.JSONDecodeError`), and nothing usable is cached.
+    """
+    if not params.get("api_key"):
+        params = {**params, "api_key": get_serp_api_key()}
+    if _is_truthy(params.get("no_cache")):
+        # The caller explicitly asked SerpApi for fresh results; don't answer from the cache.
+        ttl = 0
+    body = get_serp_cache().get_or_fetch(
+        cache_key(url, params), engine_for(params), lambda: _fetch_json(url, params), ttl
+    )
+    return json.loads(body)
+
+
+def serp_cached(engine: str, ttl: Optional[float] = None) -> Callable:
+    """
+    Decorator that caches a function's JSON-serializable return value in the SERP cache, keyed by the
+    function and its arguments (an `api_key` argument is ignored) and using the engine's TTL. None
+    results are not cached.
+
+    Args:
+        engine (str): Engine the function queries, which selects the TTL.
+        ttl (Optional[float]): Overrides the engine's TTL.
+    """
+    def decorator(func: Callable) -> Callable:
+        namespace = f"{func.__module__}.{func.__qualname__}"
+
+        @functools.wraps(func)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            def fetch() -> Tuple[bytes, bool]:
+                result = func(*args, **kwargs)
+                return json.dumps(result).encode("utf-8"), result is not None
+
+            key = cache_key(namespace, {"args": list(args), **kwargs})
+            return json.loads(get_serp_cache().get_or_fetch(key, engine, fetch, ttl))
+        return wrapper
+
+    return decorator
+
+
+def _log_stats() -> None:
+    if _cache is not None:
+        stats = _cache.stats()
+        if stats["hit_rate"] or stats["misses"]:
+            logger.info(
+                "SERP cache: %.0f%% hit rate (%d fresh, %d stale, %d misses, %d refreshes, %d errors).",
+                stats["hit_rate"] * 100, stats["fresh_hits"], stats["stale_hits"], stats["misses"],
+                stats["refreshes"], stats["errors"]
+            )
+
+
+def _reset_in_child() -> None:
+    global _cache, _cache_lock
+    _cache, _cache_lock = None, threading.Lock()
+
+
+atexit.register(_log_stats)
+os.register_at_fork(after_in_child=_reset_in_child)
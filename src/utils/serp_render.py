@@ -0,0 +1,281 @@
+from typing import Callable
+from typing import Optional
+from typing import Tuple
+from typing import Dict
+from typing import List
+from typing import Any
+
+
+# Rows shown per table unless the caller asks for more.
+DEFAULT_LIMIT = 5
+
+# Longest cell text before it is cut off with an ellipsis.
+MAX_CELL_CHARS = 80
+
+# Columns holding URLs (rendered as links) and image URLs (rendered as thumbnails).
+LINK_COLUMNS = ("Link",)
+IMAGE_COLUMNS = ("Image",)
+
+
+def _get(*path: str) -> Callable[[Dict[str, Any]], Any]:
+    def getter(item: Dict[str, Any]) -> Any:
+        value = item
+        for key in path:
+            if not isinstance(value, dict):
+                return None
+            value = value.get(key)
+        return value
+    return getter
+
+
+def _first(*getters: Callable[[Dict[str, Any]], Any]) -> Callable[[Dict[str, Any]], Any]:
+    def getter(item: Dict[str, Any]) -> Any:
+        for get in getters:
+            value = get(item)
+            if value not in (None, "", [], {}):
+                return value
+        return None
+    return getter
+
+
+def _walmart_price(item: Dict[str, Any]) -> Any:
+    price = _get("primary_offer", "offer_price")(item)
+    return f"${price:,.2f}" if isinstance(price, (int, float)) else price
+
+
+def _market_change(item: Dict[str, Any]) -> Any:
+    movement = item.get("price_movement")
+    if not isinstance(movement, dict) or movement.get("percentage") is None:
+        return item.get("changePercent")
+    percentage = movement["percentage"]
+    if not isinstance(percentage, (int, float)):
+        return percentage
+    return f"{'-' if movement.get('movement') == 'Down' else '+'}{percentage:.2f}%"
+
+
+# Result kind -> (key of the result list in the SerpApi response, [(column, getter), ...]).
+LAYOUTS: Dict[str, Tuple[str, List[Tuple[str, Callable[[Dict[str, Any]], Any]]]]] = {
+    "shopping": ("shopping_results", [
+        ("Title", _get("title")),
+        ("Price", _get("price")),
+        ("Store", _get("source")),
+        ("Rating", _get("rating")),
+        ("Reviews", _get("reviews")),
+        ("Link", _first(_get("product_link"), _get("link"))),
+    ]),
+    "walmart": ("organic_results", [
+        ("Title", _get("title")),
+        ("Price", _walmart_price),
+        ("Seller", _get("seller_name")),
+        ("Rating", _get("rating")),
+        ("Reviews", _get("reviews")),
+        ("Link", _first(_get("product_page_url"), _get("link"))),
+    ]),
+    "events": ("events_results", [
+        ("Title", _get("title")),
+        ("When", _first(_get("date", "when"), _get("date", "start_date"))),
+        ("Venue", _get("venue", "name")),
+        ("Address", lambda item: ", ".join(item.get("address") or []) or None),
+        ("Link", _get("link")),
+    ]),
+    "local": ("local_results", [
+        ("Name", _get("title")),
+        ("Rating", _get("rating")),
+        ("Reviews", _get("reviews")),
+        ("Type", _get("type")),
+        ("Address", _get("address")),
+        ("Phone", _get("phone")),
+        ("About", _get("description")),
+        ("Hours", _get("hours")),
+        ("Link", _first(_get("website"), _get("links", "website"))),
+    ]),
+    "news": ("news_results", [
+        ("Title", _get("title")),
+        ("Source", _first(_get("source", "name"), _get("source"))),
+        ("Date", _get("date")),
+        ("Link", _get("link")),
+    ]),
+    "images": ("images_results", [
+        ("Image", _first(_get("thumbnail"), _get("original"))),
+        ("Title", _get("title")),
+        ("Source", _get("source")),
+        ("Link", _get("link")),
+    ]),
+    "organic": ("organic_results", [
+        ("Title", _get("title")),
+        ("Source", _first(_get("displayed_link"), _get("source"))),
+        ("Snippet", _get("snippet")),
+        ("Link", _get("link")),
+    ]),
+    "markets": ("markets", [
+        ("Symbol", _first(_get("stock"), _get("symbol"))),
+        ("Name", _get("name")),
+        ("Price", _get("price")),
+        ("Change", _market_change),
+    ]),
+}
+
+
+# Order in which kinds are looked for; Walmart also uses "organic_results", so it is checked before organic.
+DETECTION_ORDER = ("shopping", "walmart", "events", "organic", "local", "news", "images", "markets")
+
+
+def _items(results: Dict[str, Any], key: str) -> List[Dict[str, Any]]:
+    items = results.get(key)
+    if isinstance(items, dict):
+        # Google search nests local results under "places"; finance groups markets by region.
+        items = items.get("places") or [item for group in items.values() if isinstance(group, list) for item in group]
+    return [item for item in items or [] if isinstance(item, dict)]
+
+
+def _is_walmart(results: Dict[str, Any]) -> bool:
+    items = _items(results, "organic_results")
+    return bool(items) and ("primary_offer" in items[0] or "product_page_url" in items[0])
+
+
+def detect_kinds(results: Optional[Dict[str, Any]]) -> List[str]:
+    """
+    Returns the kinds of results (keys of `LAYOUTS`) present in a SerpApi response, most specific first.
+    """
+    if not isinstance(results, dict):
+        return []
+    kinds = []
+    for kind in DETECTION_ORDER:
+        key = LAYOUTS[kind][0]
+        if kind == "walmart" and not _is_walmart(results):
+            continue
+        if kind == "organic" and "walmart" in kinds:
+            continue
+        if _items(results, key):
+            kinds.append(kind)
+    return kinds
+
+
+def _cell(value: Any, column: str) -> Any:
+    if value is None:
+        return ""
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return value
+    if column in LINK_COLUMNS + IMAGE_COLUMNS:
+        # Cutting a URL short would break it.
+        return str(value)
+    if isinstance(value, dict):
+        value = "; ".join(f"{key}: {part}" for key, part in value.items())
+    elif isinstance(value, (list, tuple)):
+        value = ", ".join(str(part) for part in value)
+    text = " ".join(str(value).split())
+    return text if len(text) <= MAX_CELL_CHARS else text[:MAX_CELL_CHARS - 1] + "…"
+
+
+def extract_rows(
+    results: Optional[Dict[str, Any]],
+    kind: Optional[str] = None,
+    limit: int = DEFAULT_LIMIT
+) -> List[Dict[str, Any]]:
+    """
+    Flattens the top results of a SerpApi response into table rows with a fixed set of columns per kind.
+    Columns that are empty in every row are dropped.
+
+    Args:
+        results (Optional[Dict[str, Any]]): The SerpApi response.
+        kind (Optional[str]): Result kind to extract (a key of `LAYOUTS`); defaults to the first detected.
+        limit (int): Maximum number of rows.
+
+    Returns:
+        List[Dict[str, Any]]: One dict per result, or an empty list if there is nothing to show.
+
+    Raises:
+        ValueError: If `kind` is not a known result kind.
+    """
+    if kind is not None and kind not in LAYOUTS:
+        raise ValueError(f"Unknown SERP result kind '{kind}'; expected one of: {', '.join(LAYOUTS)}")
+    if kind is None:
+        kinds = detect_kinds(results)
+        if not kinds:
+            return []
+        kind = kinds[0]
+    if not isinstance(results, dict):
+        return []
+
+    key, columns = LAYOUTS[kind]
+    rows = [{column: _cell(get(item), column) for column, get in columns} for item in _items(results, key)[:limit]]
+    used = [column for column, _ in columns if any(row[column] != "" for row in rows)]
+    return [{column: row[column] for column in used} for row in rows]
+
+
+def to_markdown(rows: List[Dict[str, Any]]) -> str:
+    """
+    Renders rows as a Markdown table, with link columns shown as "open" links.
+    """
+    if not rows:
+        return ""
+    columns = list(rows[0])
+
+    def escape(value: Any, column: str) -> str:
+        text = str(value).replace("|", "\\|")
+        if column in LINK_COLUMNS + IMAGE_COLUMNS and text:
+            return f"[open]({text})"
+        return text
+
+    lines = ["| " + " | ".join(columns) + " |", "|" + "---|" * len(columns)]
+    lines += ["| " + " | ".join(escape(row[column], column) for column in columns) + " |" for row in rows]
+    return "\n".join(lines)
+
+
+def render_table(
+    results: Optional[Dict[str, Any]],
+    kind: Optional[str] = None,
+    limit: int = DEFAULT_LIMIT,
+    empty_message: str = "No results found."
+) -> bool:
+    """
+    Shows the top results of a SerpApi response as a compact Streamlit table, with clickable links and
+    image thumbnails. Rendering is local and instant; no LLM is involved.
+
+    Args:
+        results (Optional[Dict[str, Any]]): The SerpApi response.
+        kind (Optional[str]): Result kind to show; defaults to the first detected.
+        limit (int): Maximum number of rows.
+        empty_message (str): Shown instead of a table when there is nothing to show.
+
+    Returns:
+        bool: True if a table was shown.
+    """
+    import streamlit as st
+
+    rows = extract_rows(results, kind, limit)
+    if not rows:
+        st.write(empty_message)
+        return False
+
+    column_config = {}
+    for column in rows[0]:
+        if column in LINK_COLUMNS:
+            column_config[column] = st.column_config.LinkColumn(column, display_text="open")
+        elif column in IMAGE_COLUMNS:
+            column_config[column] = st.column_config.ImageColumn(column)
+    st.dataframe(rows, hide_index=True, column_config=column_config)
+    return True
+
+
+def render_side_by_side(
+    sections: Dict[str, Optional[Dict[str, Any]]],
+    limit: int = DEFAULT_LIMIT,
+    per_row: int = 2
+) -> None:
+    """
+    Shows several SerpApi responses as tables in a grid, `per_row` tables per row, each under its title.
+
+    Args:
+        sections (Dict[str, Optional[Dict[str, Any]]]): Section titles and their responses.
+        limit (int): Maximum number of rows per table.
+        per_row (int): Tables per row.
+    """
+    import streamlit as st
+
+    titles = list(sections)
+    for start in range(0, len(titles), per_row):
+        for column, title in zip(st.columns(per_row), titles[start:start + per_row]):
+            with column:
+                st.subheader(title)
+                render_table(sections[title], limit=limit)
@@ -0,0 +1,152 @@
+from src.config.logging import logger
+from src.utils.io import read_file
+from string import Formatter
+from typing import FrozenSet
+from typing import Iterable
+from typing import Optional
+from typing import Tuple
+from typing import Dict
+from typing import List
+from typing import Any
+import threading
+
+
+class PromptTemplate:
+    """
+    A `str.format` template whose placeholders are parsed once. Rendering fills the parsed segments
+    directly instead of re-parsing the template text on every call, and checks the supplied values
+    against the placeholders first.
+
+    Attributes:
+        name (str): Name the template is registered under.
+        fields (FrozenSet[str]): Placeholder names used by the template.
+    """
+
+    def __init__(self, name: str, text: str) -> None:
+        """
+        Args:
+            name (str): Name used in error messages.
+            text (str): Template text in `str.format` syntax.
+
+        Raises:
+            ValueError: If the template is malformed or uses positional, attribute or index placeholders.
+        """
+        self.name = name
+        # (literal text, field name, format spec, conversion) per segment, as returned by Formatter.parse.
+        self._segments: List[Tuple[str, Optional[str], str, Optional[str]]] = []
+        try:
+            for literal, field_name, format_spec, conversion in Formatter().parse(text):
+                if field_name is not None and not field_name.isidentifier():
+                    raise ValueError(f"placeholder '{{{field_name}}}' must be a plain name")
+                if format_spec and "{" in format_spec:
+                    raise ValueError(f"placeholder '{{{field_name}}}' has a nested format spec")
+                self._segments.append((literal, field_name, format_spec or "", conversion))
+        except ValueError as e:
+            raise ValueError(f"Template '{name}' is malformed: {e}") from e
+        self.fields: FrozenSet[str] = frozenset(field for _, field, _, _ in self._segments if field is not None)
+
+    def render(self, **values: Any) -> str:
+        """
+        Fill in the placeholders.
+
+        Raises:
+            KeyError: If a placeholder has no value.
+            ValueError: If values are given for names the template does not use.
+        """
+        missing = self.fields - values.keys()
+        if missing:
+            raise KeyError(f"Template '{self.name}' is missing values for: {', '.join(sorted(missing))}")
+        unknown = values.keys() - self.fields
+        if unknown:
+            raise ValueError(f"Template '{self.name}' has no placeholders for: {', '.join(sorted(unknown))}")
+
+        parts = []
+        for literal, field_name, format_spec, conversion in self._segments:
+            parts.append(literal)
+            if field_name is None:
+                continue
+            value = values[field_name]
+            if conversion == "r":
+                value = repr(value)
+            elif conversion == "a":
+                value = ascii(value)
+            elif conversion == "s":
+                value = str(value)
+            parts.append(value if type(value) is str and not format_spec else format(value, format_spec))
+        return "".join(parts)
+
+
+class TemplateRegistry:
+    """
+    Named prompt templates loaded from files. A template is parsed and its placeholders validated when
+    it is first used and again only after its file changes, so a template edited to drop or rename a
+    placeholder fails with a clear error before any prompt is sent.
+    """
+
+    def __init__(self) -> None:
+        self._specs: Dict[str, Tuple[str, FrozenSet[str]]] = {}
+        self._loaded: Dict[str, Tuple[str, PromptTemplate]] = {}
+        self._lock = threading.Lock()
+
+    def register(self, name: str, path: str, fields: Iterable[str]) -> None:
+        """
+        Register a template file and the placeholders it must use.
+
+        Args:
+            name (str): Name to look the template up by.
+            path (str): Path of the template file.
+            fields (Iterable[str]): Exactly the placeholder names callers will supply.
+        """
+        with self._lock:
+            self._specs[name] = (path, frozenset(fields))
+            self._loaded.pop(name, None)
+
+    def get(self, name: str) -> PromptTemplate:
+        """
+        Return the parsed template, reloading it if its file changed.
+
+        Raises:
+            KeyError: If no template is registered under `name`.
+            FileNotFoundError: If the template file cannot be read.
+            ValueError: If the template is malformed or its placeholders differ from the registered ones.
+        """
+        path, fields = self._specs[name]
+        # read_file returns the same cached string until the file changes.
+        text = read_file(path)
+        if text is None:
+            raise FileNotFoundError(f"Template '{name}' could not be read from '{path}'.")
+
+        loaded = self._loaded.get(name)
+        if loaded is not None and loaded[0] is text:
+            return loaded[1]
+
+        template = PromptTemplate(name, text)
+        if template.fields != fields:
+            problems = []
+            if fields - template.fields:
+                problems.append(f"missing {', '.join(sorted(fields - template.fields))}")
+            if template.fields - fields:
+                problems.append(f"unexpected {', '.join(sorted(template.fields - fields))}")
+            logger.error(f"Template '{name}' at '{path}' has invalid placeholders: {'; '.join(problems)}")
+            raise ValueError(f"Template '{name}' has invalid placeholders: {'; '.join(problems)}.")
+
+        with self._lock:
+            self._loaded[name] = (text, template)
+        return template
+
+    def render(self, name: str, **values: Any) -> str:
+        """
+        Render the named template with `values`. See `get` and `PromptTemplate.render` for errors.
+        """
+        return self.get(name).render(**values)
+
+    def validate(self) -> None:
+        """
+        Load and validate every registered template, raising on the first invalid one.
+        """
+        for name in list(self._specs):
+            self.get(name)
+
+
+# Process-wide registry used by the agents.
+templates = TemplateRegistry()
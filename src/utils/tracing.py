@@ -0,0 +1,304 @@
+from src.config.setup import TRACE_SPANS_PATH
+from src.config.setup import TRACING_ENABLED
+from src.config.setup import TRACE_FLUSH_SECONDS
+from src.config.setup import TRACE_MAX_BYTES
+from src.config.logging import add_record_filter
+from src.config.logging import logger
+from src.utils.profiling import instrument
+from src.utils.profiling import stage
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+from dataclasses import asdict
+from dataclasses import field
+from typing import Callable
+from typing import Iterator
+from typing import Optional
+from typing import Dict
+from typing import List
+from typing import Any
+import contextvars
+import threading
+import argparse
+import logging
+import atexit
+import queue
+import json
+import time
+import uuid
+import os
+
+
+@dataclass
+class Span:
+    """
+    One timed operation of a trace. Spans started while another span is current become its children
+    and share its trace id, including across `TracingThreadPoolExecutor` submissions.
+
+    Attributes:
+        name (str): Operation name.
+        trace_id (str): Id shared by all spans of one trace.
+        span_id (str): Id of this span.
+        parent_id (Optional[str]): Id of the enclosing span, None for the root of a trace.
+        start (float): Epoch timestamp when the span started.
+        seconds (float): Elapsed wall-clock time.
+        pid (int): Process the span ran in.
+        thread_id (int): Thread the span ran on.
+        thread_name (str): Name of that thread.
+        attributes (Dict[str, Any]): JSON-serializable details about the operation.
+        error (Optional[str]): The exception that ended the span, if any.
+    """
+    name: str
+    trace_id: str
+    span_id: str
+    parent_id: Optional[str] = None
+    start: float = 0.0
+    seconds: float = 0.0
+    pid: int = 0
+    thread_id: int = 0
+    thread_name: str = ""
+    attributes: Dict[str, Any] = field(default_factory=dict)
+    error: Optional[str] = None
+
+
+_current_span: ContextVar[Optional[Span]] = ContextVar("current_span", default=None)
+
+# Finished spans are appended to the JSON lines file by a background thread, so ending a span never
+# waits on disk I/O. The thread is started on first use (and again in forked children).
+_pending: "queue.SimpleQueue[Optional[Span]]" = queue.SimpleQueue()
+_writer: Optional[threading.Thread] = None
+_writer_lock = threading.Lock()
+_flush_requested = threading.Event()
+
+
+def current_span() -> Optional[Span]:
+    """
+    Returns the span of the enclosing `span` block or `traced` call, if any.
+    """
+    return _current_span.get()
+
+
+def annotate(**attributes: Any) -> None:
+    """
+    Adds attributes to the current span. Does nothing outside a span.
+    """
+    current = _current_span.get()
+    if current is not None:
+        current.attributes.update(attributes)
+
+
+@contextmanager
+def span(name: str, **attributes: Any) -> Iterator[Optional[Span]]:
+    """
+    Records the enclosed block as a span, a child of the current span if there is one. An exception
+    leaving the block is recorded on the span and re-raised.
+
+    Args:
+        name (str): Operation name.
+        **attributes: JSON-serializable details stored with the span.
+
+    Yields:
+        Optional[Span]: The span, or None when tracing is disabled.
+    """
+    if not TRACING_ENABLED:
+        yield None
+        return
+
+    parent = _current_span.get()
+    thread = threading.current_thread()
+    current = Span(
+        name=name,
+        trace_id=parent.trace_id if parent else uuid.uuid4().hex,
+        span_id=os.urandom(8).hex(),
+        parent_id=parent.span_id if parent else None,
+        start=time.time(),
+        pid=os.getpid(),
+        thread_id=thread.ident,
+        thread_name=thread.name,
+        attributes=attributes
+    )
+    token = _current_span.set(current)
+    started = time.perf_counter()
+    try:
+        yield current
+    except Exception as e:
+        current.error = f"{type(e).__name__}: {e}"
+        raise
+    finally:
+        current.seconds = time.perf_counter() - started
+        try:
+            _current_span.reset(token)
+        except ValueError:
+            # A generator finished in a different context than it started in.
+            _current_span.set(parent)
+        _export(current)
+
+
+@contextmanager
+def _stage_and_span(name: str) -> Iterator[None]:
+    with stage(name), span(name):
+        yield
+
+
+def traced(name: Optional[str] = None) -> Callable:
+    """
+    Decorator that records each call of the wrapped function both as a span and as a stage of the
+    current rerun (see `src.utils.profiling.timed`), so it needs no separate `@timed()`.
+
+    Args:
+        name (Optional[str]): Span and stage name, defaults to the function's name.
+    """
+    return instrument(_stage_and_span, name)
+
+
+class TracingThreadPoolExecutor(ThreadPoolExecutor):
+    """
+    ThreadPoolExecutor that runs each submitted call in a copy of the submitter's context, so spans
+    started by the call are children of the span that was current when it was submitted.
+    """
+
+    def submit(self, fn: Callable, /, *args: Any, **kwargs: Any):
+        return super().submit(contextvars.copy_context().run, fn, *args, **kwargs)
+
+
+class TraceLogFilter(logging.Filter):
+    """
+    Adds the short id of the current trace to log records, so interleaved lines from concurrent
+    builds can be told apart and matched to their spans.
+    """
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        current = _current_span.get()
+        record.trace_id = current.trace_id[:8] if current else "-"
+        return True
+
+
+def _export(finished: Span) -> None:
+    global _writer
+    _pending.put(finished)
+    if _writer is None:
+        with _writer_lock:
+            if _writer is None:
+                _writer = threading.Thread(target=_write_spans, name="trace-writer", daemon=True)
+                _writer.start()
+
+
+def _write_spans() -> None:
+    while True:
+        batch = [_pending.get()]
+        if batch[0] is not None:
+            # Let spans accumulate so the file is opened once per batch rather than once per span.
+            _flush_requested.wait(TRACE_FLUSH_SECONDS)
+        while not _pending.empty() and len(batch) < 10000:
+            batch.append(_pending.get())
+        spans = [finished for finished in batch if finished is not None]
+        if spans:
+            try:
+                os.makedirs(os.path.dirname(TRACE_SPANS_PATH), exist_ok=True)
+                if os.path.exists(TRACE_SPANS_PATH) and os.path.getsize(TRACE_SPANS_PATH) > TRACE_MAX_BYTES:
+                    os.replace(TRACE_SPANS_PATH, f"{TRACE_SPANS_PATH}.1")
+                with open(TRACE_SPANS_PATH, 'a', encoding='utf-8') as f:
+                    f.writelines(json.dumps(asdict(finished), default=str) + "\n" for finished in spans)
+            except OSError as e:
+                logger.warning(f"Could not write trace spans: {e}")
+        if None in batch:
+            return
+
+
+def flush_spans(timeout: float = 5.0) -> None:
+    """
+    Waits for the spans finished so far to be written. Registered to run at exit.
+    """
+    global _writer
+    with _writer_lock:
+        writer, _writer = _writer, None
+    if writer is not None:
+        _pending.put(None)
+        _flush_requested.set()
+        writer.join(timeout)
+        _flush_requested.clear()
+
+
+def _reset_writer_in_child() -> None:
+    global _writer, _pending, _flush_requested
+    _writer, _pending, _flush_requested = None, queue.SimpleQueue(), threading.Event()
+
+
+def load_spans(path: str = TRACE_SPANS_PATH, trace_id: Optional[str] = None) -> List[Span]:
+    """
+    Reads spans from a JSON lines file.
+
+    Args:
+        path (str): Path of the spans file.
+        trace_id (Optional[str]): Only return spans of the trace whose id starts with this prefix.
+
+    Returns:
+        List[Span]: The spans in the order they finished.
+    """
+    spans = []
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            if not line.strip():
+                continue
+            finished = Span(**json.loads(line))
+            if trace_id is None or finished.trace_id.startswith(trace_id):
+                spans.append(finished)
+    return spans
+
+
+def to_chrome_trace(spans: List[Span]) -> Dict[str, Any]:
+    """
+    Converts spans to the Chrome trace-event format, viewable as a flame chart in chrome://tracing,
+    Perfetto (ui.perfetto.dev) or speedscope.
+
+    Args:
+        spans (List[Span]): Spans to convert.
+
+    Returns:
+        Dict[str, Any]: The trace, ready to be dumped as JSON.
+    """
+    events, threads = [], {}
+    for finished in spans:
+        threads[(finished.pid, finished.thread_id)] = finished.thread_name
+        events.append({
+            "name": finished.name,
+            "cat": "app_builder",
+            "ph": "X",
+            "ts": finished.start * 1e6,
+            "dur": finished.seconds * 1e6,
+            "pid": finished.pid,
+            "tid": finished.thread_id,
+            "args": {
+                "trace_id": finished.trace_id,
+                "span_id": finished.span_id,
+                "parent_id": finished.parent_id,
+                **({"error": finished.error} if finished.error else {}),
+                **finished.attributes
+            }
+        })
+    for (pid, thread_id), thread_name in threads.items():
+        events.append({"name": "thread_name", "ph": "M", "pid": pid, "tid": thread_id, "args": {"name": thread_name}})
+    return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+
+add_record_filter(TraceLogFilter())
+atexit.register(flush_spans)
+os.register_at_fork(after_in_child=_reset_writer_in_child)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Convert recorded spans to a Chrome trace-event file.")
+    parser.add_argument("--spans", default=TRACE_SPANS_PATH, help="JSON lines file of recorded spans.")
+    parser.add_argument("--trace", help="Trace id (or prefix) to export; defaults to the most recent trace.")
+    parser.add_argument("--all", action="store_true", help="Export every recorded trace.")
+    parser.add_argument("--out", default="trace.json", help="Output path.")
+    args = parser.parse_args()
+
+    spans = load_spans(args.spans)
+    if not args.all and spans:
+        trace_id = args.trace or spans[-1].trace_id
+        spans = [finished for finished in spans if finished.trace_id.startswith(trace_id)]
+    with open(args.out, 'w', encoding='utf-8') as f:
+        json.dump(to_chrome_trace(spans), f)
+    print(f"Wrote {len(spans)} spans to {args.out}")
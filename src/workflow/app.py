@@ -1,30 +1,19 @@
+from src.config.setup import PROFILE_SLOW_RERUN_SECONDS
+from src.config.setup import APP_EXECUTION_MODES
+from src.config.setup import PROFILING_ENABLED
 from src.config.setup import GOOGLE_ICON_PATH
 from src.config.logging import logger 
-from src.db.crud import get_entries 
+from src.utils.profiling import record_rerun
 from src.workflow.helper import * 
+from src.utils.profiling import is_recording
+from src.utils.profiling import stage
+from typing import Callable
+import streamlit.components.v1 as components
 import streamlit as st 
+import functools
 import os 
 
-def run() -> None:
-    """
-    Main entry point for the Agentic App Builder Streamlit application. Sets up the page configuration,
-    loads session state variables, and provides UI functionality for uploading CSV files, generating
-    ideas, and running or building apps.
-
-    Raises:
-        Exception: Handles exceptions for refreshing entries, running apps, or other UI interactions.
-    """
-    # Configure the page
-    st.set_page_config(
-        page_title="Agentic App Builder",
-        layout="wide",
-        page_icon="💡",
-        initial_sidebar_state="expanded"
-    )
-
-    # Load CSS styles
-    st.markdown(
-        """
+PAGE_STYLE = """
         <style>
         @import url('https://fonts.googleapis.com/css2?family=Inter:wght@400;700&display=swap');
         body {
@@ -52,15 +41,134 @@ def run() -> None:
         color: transparent;
         }
         </style>
-        """,
-        unsafe_allow_html=True
-    )
+        """
+
+
+def profiling_requested() -> bool:
+    """
+    Returns True if rerun instrumentation is enabled (APP_BUILDER_PROFILE=1 or the `?profile=1` query parameter).
+    """
+    return PROFILING_ENABLED or st.query_params.get("profile") == "1"
+
+
+def profiled_fragment(name: str) -> Callable:
+    """
+    Decorator for fragment bodies (applied below `@st.fragment`). A fragment rerun skips `main()`, so
+    when instrumentation is enabled the fragment records its own rerun and shows the timings in place.
+    During a full rerun the fragment is timed as part of `main()`'s rerun.
+
+    Args:
+        name (str): Fragment name shown in the timing panel.
+    """
+    def decorator(func: Callable) -> Callable:
+        @functools.wraps(func)
+        def wrapper() -> None:
+            if is_recording() or not profiling_requested():
+                func()
+                return
+            capture_profile = st.session_state.pop("capture_profile", False)
+            with record_rerun(capture_profile=capture_profile, slow_rerun_seconds=PROFILE_SLOW_RERUN_SECONDS or None) as rerun:
+                with stage(name):
+                    func()
+            display_profiling_panel(rerun, fragment=name)
+        return wrapper
+
+    return decorator
+
+
+@st.fragment
+@profiled_fragment("app runner")
+def sidebar_app_runner() -> None:
+    """
+    Sidebar region for picking and running a generated app. Interactions with the picker, or with an
+    app running inline, only rerun this fragment.
+    """
+    st.subheader("Run Generated App")
+    available_apps = st.session_state.get("available_apps", {})
+    if available_apps:
+        execution_mode = st.radio(
+            "Execution mode",
+            APP_EXECUTION_MODES,
+            horizontal=True,
+            help="Isolated apps run in a separate, resource-limited process and cannot stall the builder."
+        )
+        selected_app = st.selectbox("Select an app to run", ["None"] + list(available_apps.keys()))
+        isolated_app = None
+        if selected_app != "None":
+            app_path = available_apps[selected_app]
+            if execution_mode == APP_EXECUTION_MODES[0]:
+                run_app(app_path)
+            else:
+                isolated_app_url = run_app_isolated(selected_app, app_path)
+                if isolated_app_url:
+                    isolated_app = (selected_app, isolated_app_url)
+                    st.link_button("Open in new tab", isolated_app_url)
+
+        # The embedded isolated app lives in the main area, outside this fragment.
+        if st.session_state.get("isolated_app") != isolated_app:
+            st.session_state["isolated_app"] = isolated_app
+            st.rerun()
+    else:
+        st.write("No generated apps available yet.")
+
+    if "run_error" in st.session_state:
+        error_message = st.session_state["run_error"]["error_message"]
+        st.error(f"Error running the app: {error_message}")
+
+
+@st.fragment
+@profiled_fragment("catalog")
+def catalog_section() -> None:
+    """
+    Catalog region: filtering, paging and selecting entries only reruns this fragment.
+    """
+    display_entries()
+
+
+@st.fragment
+@profiled_fragment("ideas grid")
+def ideas_section() -> None:
+    """
+    Ideas grid region: selecting ideas and queueing builds only reruns this fragment.
+    """
+    if not st.session_state["ideas"]:
+        return
+
+    display_ideas(st.session_state["ideas"])
+
+    if st.button("Build App", type="primary"):
+        build_selected_apps(st.session_state["selected_ideas"])
+
+
+def run() -> None:
+    """
+    Main entry point for the Agentic App Builder Streamlit application. Sets up the page configuration,
+    loads session state variables, and provides UI functionality for uploading CSV files, generating
+    ideas, and running or building apps.
+
+    The page is split into fragments (sidebar app runner, catalog, ideas grid, build status) so that an
+    interaction inside one of them only reruns that region instead of the whole script.
+
+    Raises:
+        Exception: Handles exceptions for refreshing entries, running apps, or other UI interactions.
+    """
+    with stage("page setup"):
+        # Configure the page
+        st.set_page_config(
+            page_title="Agentic App Builder",
+            layout="wide",
+            page_icon="💡",
+            initial_sidebar_state="expanded"
+        )
+
+        # Load CSS styles
+        st.markdown(PAGE_STYLE, unsafe_allow_html=True)
 
     # Initialize session state variables
     for key, default in {
         "logs": [],
         "ideas": [],
-        "entries_df": get_entries(),
+        "selected_entry_ids": set(),
         "selected_ideas": [],
         "app_built": False,
         "available_apps": {}
@@ -71,7 +179,7 @@ def run() -> None:
     load_available_apps()
 
     # Sidebar setup
-    with st.sidebar:
+    with st.sidebar, stage("sidebar"):
         if os.path.exists(GOOGLE_ICON_PATH):
             st.image(GOOGLE_ICON_PATH, width=40)
 
@@ -80,38 +188,27 @@ def run() -> None:
         ideate_trigger = st.button("Ideate", help="Start the ideation process to generate API combination ideas.", type="primary")
         refresh_trigger = st.button("Refresh Entries", help="Refresh the entries table from the database.", type="secondary")
 
-        st.subheader("Run Generated App")
-        available_apps = st.session_state.get("available_apps", {})
-        if available_apps:
-            selected_app = st.selectbox("Select an app to run", ["None"] + list(available_apps.keys()))
-            if selected_app != "None":
-                app_path = available_apps[selected_app]
-                run_app(app_path)
-        else:
-            st.write("No generated apps available yet.")
-
-        if "run_error" in st.session_state:
-            error_message = st.session_state["run_error"]["error_message"]
-            st.error(f"Error running the app: {error_message}")
+        sidebar_app_runner()
 
     # Main content
     st.markdown("<h1 class='rainbow-title'>Agentic App Builder</h1>", unsafe_allow_html=True)
 
+    isolated_app = st.session_state.get("isolated_app")
+    if isolated_app:
+        app_name, app_url = isolated_app
+        st.subheader(f"Running App: {app_name}")
+        components.iframe(app_url, height=800, scrolling=True)
+
     st.subheader("Upload CSV")
     uploaded_file = st.file_uploader("Select your CSV file", type=['csv'])
     handle_csv_upload(uploaded_file)
 
     if refresh_trigger:
-        try:
-            st.session_state["entries_df"] = get_entries()
-            if "display_df" in st.session_state:
-                del st.session_state["display_df"]
-            logger.debug("Entries refreshed successfully from the database.")
-        except Exception as e:
-            logger.error(f"Failed to refresh entries: {e}")
-            st.error(f"Failed to refresh entries: {e}")
+        st.session_state["catalog_page"] = 1
+        logger.debug("Entries view reset to the first page.")
 
-    display_entries(st.session_state["entries_df"])
+    with stage("catalog"):
+        catalog_section()
 
     if ideate_trigger:
         st.session_state.update({
@@ -135,25 +232,37 @@ def run() -> None:
         else:
             st.warning("No ideas generated.")
 
-    if st.session_state["ideas"]:
-        display_ideas(st.session_state["ideas"])
+    with stage("ideas grid"):
+        ideas_section()
 
-        if st.button("Build App", type="primary"):
-            build_selected_apps(st.session_state["selected_ideas"])
-
-    if "app_build_success_message" in st.session_state:
-        st.success(st.session_state["app_build_success_message"])
-        del st.session_state["app_build_success_message"]
-        st.session_state["app_built"] = True
+    with stage("build status"):
+        display_build_status()
 
     if st.session_state["app_built"]:
         st.subheader("Your App(s) are Ready!")
         st.markdown("The generated code has been saved in the `./src/apps/<app_name>/` directories.")
         st.markdown("You can now select them from the sidebar to run them inline.")
 
+
+def main() -> None:
+    """
+    Runs the builder page. When instrumentation is enabled (APP_BUILDER_PROFILE=1 or the `?profile=1`
+    query parameter), the stages of the rerun are timed and shown in a sidebar panel, and a cProfile dump
+    is captured on request or for reruns slower than APP_BUILDER_PROFILE_SLOW_SECONDS.
+    """
+    if not profiling_requested():
+        run()
+        return
+
+    capture_profile = st.session_state.pop("capture_profile", False)
+    with record_rerun(capture_profile=capture_profile, slow_rerun_seconds=PROFILE_SLOW_RERUN_SECONDS or None) as rerun:
+        run()
+    display_profiling_panel(rerun)
+
+
 if __name__ == "__main__":
     try:
-        run()
+        main()
     except Exception as e:
         logger.error("Unhandled exception in main: %s", e)
         st.error(f"An unexpected error occurred: {e}")
@@ -0,0 +1,354 @@
+from concurrent.futures import ThreadPoolExecutor
+from src.config.setup import PROJECT_ROOT
+from src.config.logging import logger
+from dataclasses import dataclass
+from typing import Callable
+from typing import Optional
+from typing import Dict
+from typing import List
+import threading
+import compileall
+import hashlib
+import ctypes
+import errno
+import shutil
+import json
+import time
+import uuid
+import os
+
+
+APPS_DIR = os.path.join(PROJECT_ROOT, 'src', 'apps')
+MANIFEST_FILENAME = "manifest.json"
+
+# Where renameat2(RENAME_EXCHANGE) is unavailable, an app is replaced with two renames; readers that
+# find it missing in between retry this often, this far apart.
+SWAP_RETRIES = 20
+SWAP_RETRY_SECONDS = 0.05
+
+_AT_FDCWD = -100
+_RENAME_EXCHANGE = 2
+
+# Event kinds published by `AppArtifactWriter`.
+COMMITTED = "committed"
+COMPILED = "compiled"
+
+
+@dataclass
+class AppEvent:
+    """
+    Published when a generated app changes on disk.
+
+    Attributes:
+        kind (str): "committed" once the app directory is in place, "compiled" once its bytecode is.
+        app_name_slug (str): Name of the app directory.
+        app_dir (str): Absolute path of the app directory.
+    """
+    kind: str
+    app_name_slug: str
+    app_dir: str
+
+
+def _load_renameat2() -> Optional[Callable]:
+    try:
+        renameat2 = ctypes.CDLL(None, use_errno=True).renameat2
+    except (AttributeError, OSError):
+        return None
+    renameat2.argtypes = [ctypes.c_int, ctypes.c_char_p, ctypes.c_int, ctypes.c_char_p, ctypes.c_uint]
+    return renameat2
+
+
+_renameat2 = _load_renameat2()
+
+
+def _exchange(path_a: str, path_b: str) -> bool:
+    """
+    Atomically swaps two existing paths with renameat2(RENAME_EXCHANGE).
+
+    Returns:
+        bool: False if the platform or filesystem does not support the exchange; nothing was moved.
+
+    Raises:
+        OSError: If the exchange is supported but failed.
+    """
+    if _renameat2 is None:
+        return False
+    if _renameat2(_AT_FDCWD, os.fsencode(path_a), _AT_FDCWD, os.fsencode(path_b), _RENAME_EXCHANGE) == 0:
+        return True
+    error = ctypes.get_errno()
+    if error in (errno.ENOSYS, errno.EINVAL, errno.ENOTSUP):
+        return False
+    raise OSError(error, os.strerror(error), path_a, None, path_b)
+
+
+def wait_for_app_file(path: str) -> bool:
+    """
+    Returns True once `path` exists, retrying briefly in case its app is being replaced without
+    `RENAME_EXCHANGE` and is momentarily missing.
+    """
+    for _ in range(SWAP_RETRIES):
+        if os.path.exists(path):
+            return True
+        time.sleep(SWAP_RETRY_SECONDS)
+    return os.path.exists(path)
+
+
+def _swapping_apps(names: List[str]) -> List[str]:
+    """
+    Returns the apps moved aside to a trash directory whose replacement is not in place yet.
+    """
+    present = set(names)
+    swapping = []
+    for name in names:
+        if name.startswith(".trash-"):
+            # ".trash-<app_name_slug>-<8 hex token>"
+            app_name_slug = name[len(".trash-"):-9]
+            if app_name_slug not in present:
+                swapping.append(app_name_slug)
+    return swapping
+
+
+def is_app_dir_name(name: str) -> bool:
+    """
+    Returns False for staging and trash directories (dot-prefixed) and `__pycache__`, which are never apps.
+    """
+    return not name.startswith(".") and not name.startswith("__")
+
+
+class AppArtifactWriter:
+    """
+    Writes generated apps so that readers only ever see a complete app.
+
+    All files of an app and a manifest are written to a hidden staging directory next to the apps,
+    then the staging directory is renamed into place. An existing app is swapped with the staging
+    directory in one `renameat2(RENAME_EXCHANGE)`, so a concurrent reader finds the old app or the new
+    app, never a mix, a half-written file or no app. Where the exchange is unsupported, the old app is
+    moved aside and the new one renamed in; readers retry briefly if the app is missing in between.
+    The app's bytecode is compiled afterwards in a background thread so its first run does not pay
+    for it.
+    """
+
+    def __init__(self, apps_dir: str) -> None:
+        """
+        Args:
+            apps_dir (str): Directory holding one subdirectory per app.
+        """
+        self.apps_dir = apps_dir
+        self._subscribers: List[Callable[[AppEvent], None]] = []
+        self._lock = threading.Lock()
+        self._compiler = ThreadPoolExecutor(max_workers=1, thread_name_prefix="app-compile")
+        # Token of the latest commit per app, so compiling a version that was since replaced is skipped.
+        self._latest: Dict[str, str] = {}
+
+    def subscribe(self, callback: Callable[[AppEvent], None]) -> None:
+        """
+        Calls `callback` with every `AppEvent`, on the thread that caused it.
+        """
+        with self._lock:
+            self._subscribers.append(callback)
+
+    def _publish(self, event: AppEvent) -> None:
+        with self._lock:
+            subscribers = list(self._subscribers)
+        for callback in subscribers:
+            try:
+                callback(event)
+            except Exception as e:
+                logger.warning(f"App event subscriber failed on {event.kind} '{event.app_name_slug}': {e}")
+
+    def commit(self, app_name_slug: str, files: Dict[str, str], metadata: Optional[Dict] = None) -> str:
+        """
+        Atomically installs an app directory containing `files` and a manifest.
+
+        Args:
+            app_name_slug (str): Name of the app directory.
+            files (Dict[str, str]): File names (relative to the app directory) and their contents.
+            metadata (Optional[Dict]): Extra JSON-serializable fields stored in the manifest.
+
+        Returns:
+            str: Absolute path of the installed app directory.
+
+        Raises:
+            OSError: If the app could not be written; the previous version, if any, is left in place.
+        """
+        app_dir = os.path.join(self.apps_dir, app_name_slug)
+        token = uuid.uuid4().hex[:8]
+        staging_dir = os.path.join(self.apps_dir, f".staging-{app_name_slug}-{token}")
+        trash_dir = os.path.join(self.apps_dir, f".trash-{app_name_slug}-{token}")
+
+        manifest = {
+            "app_name_slug": app_name_slug,
+            "created_at": time.time(),
+            "files": {},
+            **(metadata or {})
+        }
+        try:
+            os.makedirs(staging_dir)
+            for name, content in files.items():
+                data = content.encode("utf-8")
+                path = os.path.join(staging_dir, name)
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                with open(path, 'wb') as f:
+                    f.write(data)
+                    f.flush()
+                    os.fsync(f.fileno())
+                manifest["files"][name] = {"bytes": len(data), "sha256": hashlib.sha256(data).hexdigest()}
+            with open(os.path.join(staging_dir, MANIFEST_FILENAME), 'w', encoding='utf-8') as f:
+                json.dump(manifest, f, indent=2)
+
+            # After an exchange the staging directory holds the previous version and is removed below.
+            exchanged = os.path.exists(app_dir) and _exchange(staging_dir, app_dir)
+            if not exchanged:
+                if os.path.exists(app_dir):
+                    os.rename(app_dir, trash_dir)
+                try:
+                    os.rename(staging_dir, app_dir)
+                except OSError:
+                    if os.path.exists(trash_dir) and not os.path.exists(app_dir):
+                        os.rename(trash_dir, app_dir)
+                    raise
+        finally:
+            shutil.rmtree(staging_dir, ignore_errors=True)
+            shutil.rmtree(trash_dir, ignore_errors=True)
+
+        with self._lock:
+            self._latest[app_name_slug] = token
+        logger.info(f"App '{app_name_slug}' committed to '{app_dir}' ({len(files)} files).")
+        self._publish(AppEvent(COMMITTED, app_name_slug, app_dir))
+        self._compiler.submit(self._compile, app_name_slug, app_dir, token)
+        return app_dir
+
+    def _is_latest(self, app_name_slug: str, token: str) -> bool:
+        with self._lock:
+            return self._latest.get(app_name_slug) == token
+
+    def _compile(self, app_name_slug: str, app_dir: str, token: str) -> None:
+        if not self._is_latest(app_name_slug, token):
+            return
+        compiled = compileall.compile_dir(app_dir, maxlevels=0, quiet=2)
+        if not self._is_latest(app_name_slug, token):
+            return
+        if compiled:
+            self._publish(AppEvent(COMPILED, app_name_slug, app_dir))
+        else:
+            logger.warning(f"Bytecode compilation of app '{app_name_slug}' failed.")
+
+    def discard_leftovers(self) -> None:
+        """
+        Removes staging and trash directories left behind by a process that died mid-commit.
+        """
+        try:
+            names = os.listdir(self.apps_dir)
+        except FileNotFoundError:
+            return
+        for name in names:
+            if name.startswith((".staging-", ".trash-")):
+                shutil.rmtree(os.path.join(self.apps_dir, name), ignore_errors=True)
+
+
+class AppRegistry:
+    """
+    Process-wide index of the generated apps and their frontend paths.
+
+    The apps directory is scanned once; afterwards apps committed by the builder are added from the
+    writer's events, and the directory is only rescanned if its modification time shows it was
+    changed by something else (e.g. apps copied in by hand).
+    """
+
+    def __init__(self, writer: AppArtifactWriter) -> None:
+        """
+        Args:
+            writer (AppArtifactWriter): Writer whose events keep the registry current.
+        """
+        self.apps_dir = writer.apps_dir
+        self._apps: Dict[str, str] = {}
+        self._status: Dict[str, str] = {}
+        self._scanned_mtime: Optional[int] = None
+        self._lock = threading.Lock()
+        writer.subscribe(self._on_event)
+
+    def _dir_mtime(self) -> Optional[int]:
+        try:
+            return os.stat(self.apps_dir).st_mtime_ns
+        except FileNotFoundError:
+            return None
+
+    def _scan(self) -> None:
+        apps = {}
+        if os.path.exists(self.apps_dir):
+            entries = sorted(os.listdir(self.apps_dir))
+            for _ in range(SWAP_RETRIES):
+                if not _swapping_apps(entries):
+                    break
+                time.sleep(SWAP_RETRY_SECONDS)
+                entries = sorted(os.listdir(self.apps_dir))
+            for entry in entries:
+                frontend_path = os.path.join(self.apps_dir, entry, "frontend.py")
+                if is_app_dir_name(entry) and os.path.exists(frontend_path):
+                    apps[entry] = os.path.relpath(frontend_path, start='.')
+        else:
+            logger.warning(f"Apps base directory does not exist: {self.apps_dir}")
+        self._apps = apps
+        logger.info(f"Found {len(apps)} generated app(s) in '{self.apps_dir}'.")
+
+    def _on_event(self, event: AppEvent) -> None:
+        with self._lock:
+            self._status[event.app_name_slug] = event.kind
+            if event.kind == COMMITTED:
+                frontend_path = os.path.join(event.app_dir, "frontend.py")
+                self._apps[event.app_name_slug] = os.path.relpath(frontend_path, start='.')
+                # The commit changed the directory's mtime; that change is accounted for.
+                if self._scanned_mtime is not None:
+                    self._scanned_mtime = self._dir_mtime()
+
+    def apps(self) -> Dict[str, str]:
+        """
+        Returns a copy of the app name to frontend path mapping.
+        """
+        mtime = self._dir_mtime()
+        with self._lock:
+            if self._scanned_mtime is None or mtime != self._scanned_mtime:
+                self._scan()
+                self._scanned_mtime = mtime
+            return dict(self._apps)
+
+    def status(self, app_name_slug: str) -> Optional[str]:
+        """
+        Returns the last event kind seen for an app committed by this process, if any.
+        """
+        with self._lock:
+            return self._status.get(app_name_slug)
+
+
+# Shared by the builder's script runs and its background build threads.
+_writer: Optional[AppArtifactWriter] = None
+_registry: Optional[AppRegistry] = None
+_init_lock = threading.Lock()
+
+
+def get_app_writer() -> AppArtifactWriter:
+    """
+    Returns the process-wide app writer, clearing out staging directories left by an earlier process
+    when it is first created.
+    """
+    global _writer
+    if _writer is None:
+        with _init_lock:
+            if _writer is None:
+                writer = AppArtifactWriter(APPS_DIR)
+                writer.discard_leftovers()
+                _writer = writer
+    return _writer
+
+
+def get_app_registry() -> AppRegistry:
+    """
+    Returns the process-wide app registry, kept current by the app writer's events.
+    """
+    global _registry
+    if _registry is None:
+        writer = get_app_writer()
+        with _init_lock:
+            if _registry is None:
+                _registry = AppRegistry(writer)
+    return _registry
@@ -0,0 +1,361 @@
+from src.config.setup import APP_MAX_RUNTIME_SECONDS
+from src.config.setup import APP_MEMORY_LIMIT_MB
+from src.config.setup import APP_CPU_LIMIT_SECONDS
+from src.config.setup import APP_POOL_SIZE
+from src.config.setup import APP_BIND_ADDRESS
+from src.config.setup import APP_PUBLIC_URL
+from src.config.setup import PROJECT_ROOT
+from src.config.logging import logger
+from dataclasses import dataclass
+from dataclasses import field
+from typing import Optional
+from typing import Dict
+from typing import List
+import multiprocessing as mp
+import urllib.request
+import threading
+import socket
+import time
+import sys
+import os
+
+try:
+    import resource
+except ImportError:  # Windows has no POSIX rlimits
+    resource = None
+
+
+# Modules imported once in the fork server so every worker starts warm.
+PRELOAD_MODULES = [
+    "streamlit",
+    "streamlit.web.bootstrap",
+    "pandas",
+    "google.genai",
+    "src.config.setup",
+    "src.llm.gemini_text",
+    "src.workflow.executor",
+]
+
+READY_TIMEOUT_SECONDS = 30
+READY_POLL_SECONDS = 0.1
+# A worker that exits while starting (e.g. its port was taken in the meantime) is retried this often.
+START_ATTEMPTS = 3
+WATCHDOG_INTERVAL_SECONDS = 5
+
+# Wildcard bind addresses and the loopback address the pool reaches them on.
+LOCAL_ADDRESSES = {"0.0.0.0": "127.0.0.1", "": "127.0.0.1", "::": "::1"}
+
+
+@dataclass
+class AppLimits:
+    """
+    Resource limits applied to a worker process before it starts serving an app.
+
+    Attributes:
+        cpu_seconds (int): Maximum CPU time (RLIMIT_CPU) the worker may consume.
+        memory_mb (int): Maximum heap and private writable memory (RLIMIT_DATA) in megabytes.
+        max_runtime_seconds (int): Wall-clock lifetime after which the pool stops the app.
+    """
+    cpu_seconds: int = APP_CPU_LIMIT_SECONDS
+    memory_mb: int = APP_MEMORY_LIMIT_MB
+    max_runtime_seconds: int = APP_MAX_RUNTIME_SECONDS
+
+
+@dataclass
+class _Worker:
+    process: mp.Process
+    conn: object
+
+
+@dataclass
+class RunningApp:
+    """
+    A generated app currently served by a pool worker.
+
+    Attributes:
+        app_name (str): Name of the app directory under `src/apps`.
+        app_path (str): Path to the app's frontend script.
+        port (int): Port the app's Streamlit server listens on.
+        url (str): URL the builder embeds or links to.
+        started_at (float): Epoch timestamp when the app was assigned to the worker.
+    """
+    app_name: str
+    app_path: str
+    port: int
+    url: str
+    started_at: float
+    worker: _Worker = field(repr=False)
+
+    def is_alive(self) -> bool:
+        return self.worker.process.is_alive()
+
+
+def _apply_limits(limits: AppLimits) -> None:
+    """
+    Applies CPU and memory rlimits to the current process. No-op where rlimits are unavailable.
+
+    Memory is capped with RLIMIT_DATA rather than RLIMIT_AS: the address space also counts the
+    preloaded libraries, thread stacks and reserved-but-unused mappings, so an address-space cap
+    would fail the worker at startup long before the app allocates real data.
+    """
+    if resource is None:
+        return
+    try:
+        resource.setrlimit(resource.RLIMIT_CPU, (limits.cpu_seconds, limits.cpu_seconds + 5))
+        memory_bytes = limits.memory_mb * 1024 * 1024
+        resource.setrlimit(resource.RLIMIT_DATA, (memory_bytes, memory_bytes))
+    except (ValueError, OSError) as e:
+        logger.warning(f"Could not apply resource limits: {e}")
+
+
+def _worker_main(conn) -> None:
+    """
+    Entry point of a pool worker. Blocks until it is assigned an app and a port, then serves the app
+    with Streamlit on that port.
+
+    The worker is forked from a fork server that has already imported `PRELOAD_MODULES`, so the
+    only remaining cold-start cost is binding the port and executing the app script.
+    """
+    assignment = conn.recv()
+    if assignment is None:
+        return
+
+    app_path, port, limits = assignment
+    _apply_limits(limits)
+
+    os.chdir(PROJECT_ROOT)
+    if PROJECT_ROOT not in sys.path:
+        sys.path.insert(0, PROJECT_ROOT)
+
+    from streamlit.web import bootstrap
+
+    flag_options = {
+        # Development mode (the default outside site-packages) refuses an explicit port.
+        "global_developmentMode": False,
+        "server_port": port,
+        "server_address": APP_BIND_ADDRESS,
+        "server_headless": True,
+        "server_runOnSave": False,
+        "browser_gatherUsageStats": False,
+    }
+    bootstrap.load_config_options(flag_options=flag_options)
+    bootstrap.run(app_path, False, [], flag_options)
+
+
+def _pick_port() -> int:
+    """
+    Returns a port that is currently free on `APP_BIND_ADDRESS`. Another process can still take it
+    before the worker binds it; Streamlit then exits, since the port is set explicitly, and `serve`
+    retries with a fresh port.
+    """
+    with socket.socket(socket.AF_INET6 if ":" in APP_BIND_ADDRESS else socket.AF_INET) as sock:
+        sock.bind((APP_BIND_ADDRESS, 0))
+        return sock.getsockname()[1]
+
+
+def _wait_until_ready(worker: _Worker, port: int, timeout: float) -> bool:
+    """
+    Polls the app's Streamlit health endpoint until it answers, the worker exits or `timeout` passes.
+    """
+    host = LOCAL_ADDRESSES.get(APP_BIND_ADDRESS, APP_BIND_ADDRESS)
+    url = f"http://{f'[{host}]' if ':' in host else host}:{port}/_stcore/health"
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline and worker.process.is_alive():
+        try:
+            with urllib.request.urlopen(url, timeout=1) as response:
+                if response.status == 200:
+                    return True
+        except OSError:
+            pass
+        time.sleep(READY_POLL_SECONDS)
+    return False
+
+
+class AppProcessPool:
+    """
+    Serves generated apps from a pool of pre-forked, pre-imported worker processes.
+
+    Each app runs its own Streamlit server in a separate process with CPU, memory and wall-clock
+    limits, so a slow or memory-hungry app can no longer stall or bloat the builder. Idle workers
+    are kept warm and replenished in the background.
+    """
+
+    def __init__(self, size: int = APP_POOL_SIZE, limits: Optional[AppLimits] = None) -> None:
+        if "forkserver" in mp.get_all_start_methods():
+            self._ctx = mp.get_context("forkserver")
+            self._ctx.set_forkserver_preload(PRELOAD_MODULES)
+        else:
+            self._ctx = mp.get_context("spawn")
+
+        self.size = size
+        self.limits = limits or AppLimits()
+        self._idle: List[_Worker] = []
+        self._running: Dict[str, RunningApp] = {}
+        self._app_locks: Dict[str, threading.Lock] = {}
+        self._lock = threading.Lock()
+        self._replenish_lock = threading.Lock()
+        self._closed = False
+
+        self._replenish()
+        self._watchdog = threading.Thread(target=self._watch, name="app-pool-watchdog", daemon=True)
+        self._watchdog.start()
+        logger.info(f"App process pool started with {size} warm worker(s).")
+
+    def _spawn_worker(self) -> _Worker:
+        parent_conn, child_conn = self._ctx.Pipe()
+        process = self._ctx.Process(target=_worker_main, args=(child_conn,), daemon=True)
+        process.start()
+        child_conn.close()
+        return _Worker(process=process, conn=parent_conn)
+
+    def _replenish(self) -> None:
+        if self._closed:
+            return
+        with self._replenish_lock:
+            with self._lock:
+                self._idle = [w for w in self._idle if w.process.is_alive()]
+                missing = self.size - len(self._idle)
+            for _ in range(max(missing, 0)):
+                worker = self._spawn_worker()
+                with self._lock:
+                    self._idle.append(worker)
+
+    def _take_worker(self) -> _Worker:
+        with self._lock:
+            while self._idle:
+                worker = self._idle.pop()
+                if worker.process.is_alive():
+                    return worker
+        logger.warning("No warm worker available, starting one on demand.")
+        return self._spawn_worker()
+
+    def _app_lock(self, app_name: str) -> threading.Lock:
+        with self._lock:
+            return self._app_locks.setdefault(app_name, threading.Lock())
+
+    def serve(self, app_name: str, app_path: str) -> RunningApp:
+        """
+        Returns the running instance of an app, assigning it to a warm worker if needed.
+
+        Args:
+            app_name (str): Name of the app directory under `src/apps`.
+            app_path (str): Path to the app's frontend script.
+
+        Returns:
+            RunningApp: The running app, including the URL to embed or link to.
+
+        Raises:
+            RuntimeError: If the pool is shut down or the app does not come up in time.
+        """
+        if self._closed:
+            raise RuntimeError("App process pool has been shut down.")
+
+        # Concurrent reruns for the same app must not start it twice; other apps start in parallel.
+        with self._app_lock(app_name):
+            with self._lock:
+                running = self._running.get(app_name)
+            if running and running.is_alive():
+                return running
+
+            for _ in range(START_ATTEMPTS):
+                worker = self._take_worker()
+                port = _pick_port()
+                worker.conn.send((os.path.abspath(app_path), port, self.limits))
+                if _wait_until_ready(worker, port, READY_TIMEOUT_SECONDS):
+                    break
+                exited = not worker.process.is_alive()
+                worker.process.kill()
+                if not exited:
+                    raise RuntimeError(f"App '{app_name}' did not start within {READY_TIMEOUT_SECONDS} seconds.")
+                logger.warning(f"Worker for app '{app_name}' exited during startup (exit code {worker.process.exitcode}).")
+            else:
+                raise RuntimeError(f"App '{app_name}' failed to start after {START_ATTEMPTS} attempts.")
+
+            running = RunningApp(
+                app_name=app_name,
+                app_path=app_path,
+                port=port,
+                url=APP_PUBLIC_URL.format(port=port),
+                started_at=time.time(),
+                worker=worker
+            )
+            with self._lock:
+                self._running[app_name] = running
+        logger.info(f"App '{app_name}' is served by pid {worker.process.pid} at {running.url}.")
+
+        threading.Thread(target=self._replenish, daemon=True).start()
+        return running
+
+    def stop(self, running: RunningApp) -> bool:
+        """
+        Stops the given instance of an app, unless it has already been stopped or replaced by a restart.
+
+        Returns:
+            bool: True if the instance was stopped.
+        """
+        with self._lock:
+            if self._running.get(running.app_name) is not running:
+                return False
+            del self._running[running.app_name]
+        running.worker.process.terminate()
+        running.worker.process.join(timeout=5)
+        if running.worker.process.is_alive():
+            running.worker.process.kill()
+        logger.info(f"Stopped app '{running.app_name}'.")
+        return True
+
+    def stop_app(self, app_name: str) -> None:
+        """
+        Stops the worker serving the given app, if any, waiting for a start of it in progress first.
+        """
+        with self._app_lock(app_name):
+            with self._lock:
+                running = self._running.get(app_name)
+            if running is not None:
+                self.stop(running)
+
+    def running_apps(self) -> List[RunningApp]:
+        """
+        Returns the apps currently served by the pool.
+        """
+        with self._lock:
+            return [app for app in self._running.values() if app.is_alive()]
+
+    def _watch(self) -> None:
+        while not self._closed:
+            time.sleep(WATCHDOG_INTERVAL_SECONDS)
+            now = time.time()
+            with self._lock:
+                apps = list(self._running.values())
+            for app in apps:
+                # `serve` may have restarted the app since the copy was taken; only act on this instance.
+                if not app.is_alive():
+                    with self._lock:
+                        if self._running.get(app.app_name) is app:
+                            del self._running[app.app_name]
+                            logger.warning(f"App '{app.app_name}' exited with code {app.worker.process.exitcode}.")
+                elif now - app.started_at > self.limits.max_runtime_seconds:
+                    logger.info(f"App '{app.app_name}' exceeded its {self.limits.max_runtime_seconds}s runtime limit.")
+                    self.stop(app)
+            self._replenish()
+
+    def shutdown(self) -> None:
+        """
+        Stops all running apps and idle workers.
+        """
+        self._closed = True
+        with self._lock:
+            apps = list(self._running.values())
+        for app in apps:
+            self.stop(app)
+        with self._lock:
+            idle, self._idle = self._idle, []
+        for worker in idle:
+            try:
+                worker.conn.send(None)
+            except (OSError, EOFError):
+                pass
+            worker.process.join(timeout=2)
+            if worker.process.is_alive():
+                worker.process.kill()
+        logger.info("App process pool shut down.")
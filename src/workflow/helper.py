@@ -1,11 +1,30 @@
-from concurrent.futures import ThreadPoolExecutor 
+from src.workflow.artifacts import wait_for_app_file
+from src.workflow.artifacts import get_app_registry
+from src.workflow.artifacts import get_app_writer
+from src.workflow.artifacts import COMMITTED
+from src.workflow.artifacts import AppEvent
+from src.workflow.executor import AppProcessPool
+from src.utils.profiling import RerunProfile
+from src.utils.profiling import timed
+from src.utils.tracing import annotate
+from src.utils.tracing import traced
+from src.workflow.jobs import BuildScheduler
+from src.workflow.jobs import VALIDATING
+from src.workflow.jobs import GENERATING
+from src.workflow.jobs import SAVED
 from src.agents.builder import build_app_code
 from src.agents.builder import generate_ideas
+from src.db.crud import fetch_db_entries_by_ids
+from src.db.crud import fetch_entries_page
 from src.db.crud import purge_and_load_csv  
-from src.config.setup import PROJECT_ROOT
+from src.db.crud import get_categories
+from src.db.crud import count_entries
+from src.config.setup import CATALOG_PAGE_SIZE
+from src.config.setup import UPLOAD_COPY_BUFFER_BYTES
 from src.config.setup import CSV_PATH 
 from src.config.logging import logger
 from typing import Generator
+from typing import Callable
 from typing import Optional 
 from typing import Tuple
 from typing import Union
@@ -13,47 +32,34 @@ from typing import Dict
 from typing import List 
 import streamlit as st 
 import importlib.util 
+import shutil
 import pandas as pd
+import math
 import time 
 import os 
 
 
+@timed()
 def load_available_apps() -> None:
     """
-    Loads all available applications from the 'src/apps' directory and updates the Streamlit session state.
+    Loads all available applications into `st.session_state["available_apps"]`, mapping each app name
+    to the relative path of its frontend script (frontend.py).
 
-    Each application's frontend script (frontend.py) is checked for existence. If found, the application
-    name and its relative path are stored in `st.session_state["available_apps"]`.
-
-    Exceptions encountered during the directory traversal are logged and skipped gracefully.
+    The apps directory is only scanned on first use or when it was changed outside the builder; apps
+    built here are picked up from the app writer's events. Staging directories of apps still being
+    written are never listed.
 
     Raises:
         OSError: If there are issues accessing the directory structure.
     """
-    apps_base_dir = os.path.join(PROJECT_ROOT, 'src', 'apps')
-
-    if "available_apps" not in st.session_state:
-        st.session_state["available_apps"] = {}
-    
-    st.session_state["available_apps"].clear()
-
     try:
-        if os.path.exists(apps_base_dir):
-            for entry in os.listdir(apps_base_dir):
-                d_path = os.path.join(apps_base_dir, entry)
-                if os.path.isdir(d_path):
-                    frontend_path = os.path.join(d_path, "frontend.py")
-                    if os.path.exists(frontend_path):
-                        relative_path = os.path.relpath(frontend_path, start='.')
-                        st.session_state["available_apps"][entry] = relative_path
-                        logger.info(f"App '{entry}' loaded successfully with frontend path '{relative_path}'.")
-        else:
-            logger.warning(f"Apps base directory does not exist: {apps_base_dir}")
+        st.session_state["available_apps"] = get_app_registry().apps()
     except OSError as e:
-        logger.error(f"Error accessing apps directory '{apps_base_dir}': {e}")
+        logger.error(f"Error accessing apps directory: {e}")
         raise
 
 
+@traced()
 def run_ideation(num_ideas: int = 3) -> Generator[Union[str, Tuple[str, List[dict]]], None, None]:
     """
     Executes the ideation process by guiding through a sequence of steps and generating innovative API combination ideas using Gemini LLM.
@@ -82,17 +88,10 @@ def run_ideation(num_ideas: int = 3) -> Generator[Union[str, Tuple[str, List[dic
         yield step
         time.sleep(1)
 
-    selected_names = []
-    try:
-        if "display_df" in st.session_state and "entries_df" in st.session_state:
-            selected_df = st.session_state["display_df"]
-            if "Select" in selected_df and selected_df["Select"].any():
-                selected_names = selected_df.loc[selected_df["Select"], "name"].tolist()
-    except KeyError as e:
-        logger.warning(f"Key error while accessing session state data: {e}")
+    selected_ids = sorted(st.session_state.get("selected_entry_ids", set()))
 
     try:
-        ideas = generate_ideas(num_ideas=num_ideas, selected_names=selected_names)
+        ideas = generate_ideas(num_ideas=num_ideas, selected_ids=selected_ids)
         logger.debug(f"{len(ideas)} ideas generated successfully.")
     except Exception as e:
         logger.error(f"Error during idea generation: {e}")
@@ -101,9 +100,11 @@ def run_ideation(num_ideas: int = 3) -> Generator[Union[str, Tuple[str, List[dic
     yield ("IDEAS_RESULT", ideas)
 
 
+@timed()
 def handle_csv_upload(uploaded_file: Optional[st.runtime.uploaded_file_manager.UploadedFile]) -> None:
     """
-    Handles the upload of a CSV file, saves it to disk, and attempts to load it into the database.
+    Handles the upload of a CSV file, streams it to disk in fixed-size blocks, and loads it into the
+    database chunk by chunk.
 
     Args:
         uploaded_file (Optional[UploadedFile]): The file uploaded via Streamlit's file uploader.
@@ -112,10 +113,14 @@ def handle_csv_upload(uploaded_file: Optional[st.runtime.uploaded_file_manager.U
         Exception: If file operations or database loading fail, appropriate errors are logged and displayed.
     """
     if uploaded_file is not None:
+        if st.session_state.get("ingested_upload_id") == uploaded_file.file_id:
+            return
+
         try:
             logger.debug("Uploading CSV file to disk.")
+            uploaded_file.seek(0)
             with open(CSV_PATH, 'wb') as f:
-                f.write(uploaded_file.read())
+                shutil.copyfileobj(uploaded_file, f, length=UPLOAD_COPY_BUFFER_BYTES)
             logger.info("CSV file uploaded and saved successfully.")
         except Exception as e:
             logger.error(f"Failed to save uploaded CSV: {e}")
@@ -125,6 +130,7 @@ def handle_csv_upload(uploaded_file: Optional[st.runtime.uploaded_file_manager.U
         logger.debug("CSV file uploaded successfully. Attempting to load into the database.")
         try:
             success, message = purge_and_load_csv(CSV_PATH)
+            st.session_state["ingested_upload_id"] = uploaded_file.file_id
             if success:
                 logger.info("CSV file loaded into the database successfully.")
                 st.success(message)
@@ -136,62 +142,95 @@ def handle_csv_upload(uploaded_file: Optional[st.runtime.uploaded_file_manager.U
             st.error(f"Error while loading CSV into the database: {e}")
 
 
-def display_entries(entries_df: Optional[pd.DataFrame]) -> None:
+@timed()
+def get_selected_entries_df() -> pd.DataFrame:
     """
-    Displays available entries in a Streamlit application, allowing users to select rows for further processing.
+    Returns the entries the user selected in the catalog, without their row ids.
 
-    Args:
-        entries_df (Optional[pd.DataFrame]): DataFrame containing the entries to be displayed. Must include a 'name' column.
+    Returns:
+        pd.DataFrame: The selected entries, or an empty DataFrame if nothing is selected.
+    """
+    selected_ids = sorted(st.session_state.get("selected_entry_ids", set()))
+    entries = fetch_db_entries_by_ids(selected_ids)
+    if not entries:
+        return pd.DataFrame()
+    return pd.DataFrame(entries).drop(columns=["id"])
 
-    Raises:
-        ValueError: If the provided DataFrame does not contain a 'name' column.
+
+@timed()
+def display_entries() -> None:
+    """
+    Displays one page of the API catalog with category facets and a text filter, allowing users to select
+    rows for further processing. Only the visible page is queried from the database, and selections are
+    kept in `st.session_state["selected_entry_ids"]` as a set of row ids.
     """
     st.subheader("Available Entries")
 
-    if entries_df is None or entries_df.empty:
-        st.write("No entries available. Please upload a CSV.")
-        return
-
-    st.markdown(
-        """
-        <p style='color:gray;font-size:13px;'>If you do not select any rows, random APIs will be chosen for you. 
-        Selected rows will be used for ideation and code generation. To avoid scrolling resets, select multiple rows 
-        first and then click 'Submit Selections'.</p>
-        """,
-        unsafe_allow_html=True
-    )
+    selected_ids = st.session_state.setdefault("selected_entry_ids", set())
 
     try:
-        if "display_df" not in st.session_state or \
-           st.session_state["display_df"].shape[0] != entries_df.shape[0]:
-            display_df = entries_df.copy().reset_index(drop=True)
-            if 'name' not in display_df.columns:
-                logger.warning("No 'name' column found in entries DataFrame.")
-                st.warning("No 'name' column found in entries. Please ensure CSV has a 'name' column.")
-                return
-            display_df.insert(0, 'Select', False)
-            st.session_state["display_df"] = display_df
-
-        with st.form("selection_form"):
-            edited_df = st.data_editor(
-                st.session_state["display_df"],
-                num_rows="dynamic",
-                use_container_width=True,
-                key="entries_editor"
-            )
-            submit = st.form_submit_button("Submit Selections")
+        categories = get_categories()
+        if not categories and count_entries() == 0:
+            st.write("No entries available. Please upload a CSV.")
+            return
 
-        if submit:
-            st.session_state["display_df"] = edited_df
+        st.markdown(
+            """
+            <p style='color:gray;font-size:13px;'>If you do not select any rows, random APIs will be chosen for you. 
+            Selected rows will be used for ideation and code generation. Selections are kept while you page
+            through and filter the catalog; click 'Submit Selections' to apply the changes on the current page.</p>
+            """,
+            unsafe_allow_html=True
+        )
 
-        selected_rows = st.session_state["display_df"][st.session_state["display_df"]["Select"]]
-        if not selected_rows.empty:
-            st.write("**Selected Entries:**")
-            styled_selected = selected_rows.style.apply(
+        filter_col, category_col = st.columns([2, 1])
+        with filter_col:
+            text_filter = st.text_input("Search", key="catalog_text_filter", placeholder="Search names, categories, descriptions and parameters")
+        with category_col:
+            selected_categories = st.multiselect("Category", categories, key="catalog_categories")
+
+        total = count_entries(selected_categories, text_filter)
+        num_pages = max(1, math.ceil(total / CATALOG_PAGE_SIZE))
+        if st.session_state.get("catalog_page", 1) > num_pages:
+            st.session_state["catalog_page"] = 1
+        page = st.number_input("Page", min_value=1, max_value=num_pages, step=1, key="catalog_page")
+        st.caption(f"{total} matching entries · page {page} of {num_pages}")
+
+        page_df = fetch_entries_page((page - 1) * CATALOG_PAGE_SIZE, CATALOG_PAGE_SIZE, selected_categories, text_filter)
+        if page_df.empty:
+            st.write("No entries match the current filters.")
+        else:
+            page_df.insert(0, "Select", page_df["id"].isin(selected_ids))
+            editor_key = f"entries_editor_{page}_{text_filter}_{'|'.join(selected_categories)}"
+            with st.form("selection_form"):
+                edited_df = st.data_editor(
+                    page_df,
+                    hide_index=True,
+                    use_container_width=True,
+                    column_config={"id": None},
+                    disabled=[col for col in page_df.columns if col != "Select"],
+                    key=editor_key
+                )
+                submit = st.form_submit_button("Submit Selections")
+
+            if submit:
+                for entry_id, is_selected in zip(edited_df["id"], edited_df["Select"]):
+                    if is_selected:
+                        selected_ids.add(int(entry_id))
+                    else:
+                        selected_ids.discard(int(entry_id))
+
+        if selected_ids:
+            st.write(f"**Selected Entries ({len(selected_ids)}):**")
+            selected_df = get_selected_entries_df()
+            styled_selected = selected_df.style.apply(
                 lambda row: ['background-color: #A5D6A7' for _ in row],
                 axis=1
             )
             st.dataframe(styled_selected, use_container_width=True)
+            if st.button("Clear Selections"):
+                selected_ids.clear()
+                st.rerun()
         else:
             st.write("No entries selected.")
 
@@ -200,6 +239,7 @@ def display_entries(entries_df: Optional[pd.DataFrame]) -> None:
         st.error(f"An error occurred while displaying entries: {e}")
 
 
+@timed()
 def display_ideas(ideas: List[dict]) -> None:
     """
     Displays a list of ideation results in a grid format and allows users to select one or more ideas.
@@ -255,21 +295,30 @@ def display_ideas(ideas: List[dict]) -> None:
         st.error(f"An error occurred while displaying ideas: {e}")
 
 
-def build_app_for_idea(idea: Dict, selected_entries: pd.DataFrame) -> str:
+@traced()
+def build_app_for_idea(
+    idea: Dict,
+    selected_entries: pd.DataFrame,
+    on_status: Optional[Callable[[str], None]] = None
+) -> str:
     """
     Builds an app for the given idea by generating and saving the corresponding frontend and backend code.
 
     Args:
         idea (Dict): A dictionary containing details about the idea, including its title.
         selected_entries (pd.DataFrame): A DataFrame of selected entries to be used in the app.
+        on_status (Optional[Callable[[str], None]]): Called with "generating" and "validating" as the
+            build moves through its stages.
 
     Returns:
         str: The slugified name of the app directory where the code is saved.
 
     Raises:
         KeyError: If the 'title' key is missing in the idea dictionary.
+        SyntaxError: If the generated code does not compile.
         Exception: For any errors during app directory creation or code generation.
     """
+    on_status = on_status or (lambda status: None)
     try:
         if 'title' not in idea:
             logger.error("The idea dictionary is missing the 'title' key.")
@@ -277,14 +326,16 @@ def build_app_for_idea(idea: Dict, selected_entries: pd.DataFrame) -> str:
 
         app_name = idea['title']
         app_name_slug = app_name.lower().replace(" ", "_").replace("-", "_")
-        apps_dir = os.path.join(PROJECT_ROOT, 'src', 'apps', app_name_slug)
-        print(f"PROJECT_ROOT = {PROJECT_ROOT}")
-
-        os.makedirs(apps_dir, exist_ok=True)
-        logger.info(f"Created or verified app directory: {apps_dir}")
+        annotate(title=app_name, app_name_slug=app_name_slug)
 
         # Build code for this idea
+        on_status(GENERATING)
         frontend_code, backend_code = build_app_code([idea], app_name_slug, entries=selected_entries)
+
+        on_status(VALIDATING)
+        compile(frontend_code, f"{app_name_slug}/frontend.py", "exec")
+        compile(backend_code, f"{app_name_slug}/backend.py", "exec")
+
         save_app_code(app_name_slug, frontend_code, backend_code)
 
         logger.info(f"App '{app_name}' built successfully with slug '{app_name_slug}'.")
@@ -298,74 +349,107 @@ def build_app_for_idea(idea: Dict, selected_entries: pd.DataFrame) -> str:
         raise
 
 
+@st.cache_resource(show_spinner=False)
+def get_build_scheduler() -> BuildScheduler:
+    """
+    Returns the process-wide background build scheduler. Being a cached resource, it outlives
+    individual reruns and sessions, so builds keep running across page reloads.
+
+    Returns:
+        BuildScheduler: The shared build scheduler.
+    """
+    return BuildScheduler(build_app_for_idea)
+
+
+@timed()
 def build_selected_apps(selected_ideas: List[dict]) -> None:
     """
-    Builds applications for the selected ideas by generating application code for each.
+    Queues background builds for the selected ideas. Progress is shown by `display_build_status`.
 
     Args:
         selected_ideas (List[dict]): A list of dictionaries representing selected ideas, each containing details such as the title.
-
-    Raises:
-        Exception: If any errors occur during the app-building process.
     """
     if not selected_ideas:
         st.warning("Please select at least one idea before building.")
         return
 
-    st.info("Preparing to generate application code. Please wait...")
-    logger.info(f"Building apps for selected ideas: {[idea['title'] for idea in selected_ideas]}")
+    logger.info(f"Queueing builds for selected ideas: {[idea['title'] for idea in selected_ideas]}")
 
-    selected_entries = st.session_state.get("display_df", pd.DataFrame())
-    selected_entries_df = (
-        selected_entries[selected_entries["Select"]]
-        if "Select" in selected_entries.columns else pd.DataFrame()
-    )
+    selected_entries_df = get_selected_entries_df()
 
-    try:
-        with ThreadPoolExecutor() as executor:
-            futures = [
-                executor.submit(build_app_for_idea, idea, selected_entries_df)
-                for idea in selected_ideas
-            ]
-            results = [f.result() for f in futures]
-
-        st.session_state["app_build_success_message"] = (
-            f"Apps generated for these ideas: {', '.join(results)}"
-        )
-        logger.info("All selected apps were built successfully.")
+    scheduler = get_build_scheduler()
+    for idea in selected_ideas:
+        scheduler.submit(idea, selected_entries_df)
+    st.info(f"Queued {len(selected_ideas)} build(s). Apps appear in the sidebar as soon as they are ready.")
+
+
+@st.fragment(run_every=2)
+@timed()
+def display_build_status() -> None:
+    """
+    Renders the status of every background build and refreshes itself while builds are running.
+    When a build finishes, the app list is reloaded and the page is rerun so the new app shows up in
+    the sidebar right away.
+    """
+    scheduler = get_build_scheduler()
+    jobs = scheduler.jobs()
+    if not jobs:
+        return
 
-        load_available_apps()
+    st.subheader("App Builds")
+    status_icons = {"queued": "⏳", "generating": "⚙️", "validating": "🔎", "saved": "✅", "failed": "❌"}
+    for job in jobs:
+        line = f"{status_icons.get(job.status, '')} **{job.title}** — {job.status}"
+        if job.status == SAVED and job.app_name_slug:
+            line += f" (`src/apps/{job.app_name_slug}`)"
+        st.markdown(line)
+        if job.error:
+            st.caption(job.error)
+
+    if not scheduler.has_active_jobs() and st.button("Clear finished builds"):
+        scheduler.clear_finished()
+        st.rerun()
+
+    saved_ids = {job.job_id for job in jobs if job.status == SAVED}
+    if "seen_saved_builds" not in st.session_state:
+        # Builds finished before this session started are already picked up by load_available_apps.
+        st.session_state["seen_saved_builds"] = saved_ids
+    seen_ids = st.session_state["seen_saved_builds"]
+    if saved_ids - seen_ids:
+        seen_ids.update(saved_ids)
+        st.session_state["app_built"] = True
         st.rerun()
-    except Exception as e:
-        logger.error(f"Error building the app(s): {e}")
-        st.error(f"An error occurred while building the app(s): {e}")
 
 
+@traced()
 def save_app_code(app_name_slug: str, frontend_code: str, backend_code: str) -> None:
     """
-    Save the generated frontend and backend code to the appropriate location.
+    Save the generated frontend and backend code to `src/apps/<app_name_slug>`. Both files and a
+    manifest are written to a staging directory and renamed into place together, so a half-written
+    app is never picked up.
 
     Args:
         app_name_slug (str): The slugified app name.
         frontend_code (str): The frontend code as a string.
         backend_code (str): The backend code as a string.
-    """
-    apps_dir = os.path.join(PROJECT_ROOT, 'src', 'apps', app_name_slug)
-    os.makedirs(apps_dir, exist_ok=True)
-
-    frontend_path = os.path.join(apps_dir, 'frontend.py')
-    backend_path = os.path.join(apps_dir, 'backend.py')
 
+    Raises:
+        OSError: If the app could not be written.
+    """
+    annotate(app_name_slug=app_name_slug, bytes=len(frontend_code) + len(backend_code))
     try:
-        with open(frontend_path, 'w', encoding='utf-8') as f:
-            f.write(frontend_code)
-        with open(backend_path, 'w', encoding='utf-8') as f:
-            f.write(backend_code)
-        logger.info("App code saved to: %s and %s", frontend_path, backend_path)
+        app_dir = get_app_writer().commit(
+            app_name_slug,
+            {'frontend.py': frontend_code, 'backend.py': backend_code}
+        )
+        logger.info("App code saved to: %s", app_dir)
     except Exception as e:
         logger.error("Failed to save app code: %s", e)
+        annotate(error=str(e))
+        raise
 
 
+@traced()
 def run_app(app_path: str) -> None:
     """
     Executes a dynamically loaded app from the given file path.
@@ -377,10 +461,12 @@ def run_app(app_path: str) -> None:
         AttributeError: If the app does not have a `main()` function.
         Exception: For any errors during the app execution process.
     """
+    annotate(app_path=app_path)
     try:
         logger.info(f"Attempting to run app from path: {app_path}")
 
         # Dynamically load the module from the given app path
+        wait_for_app_file(app_path)
         spec = importlib.util.spec_from_file_location("generated_app", app_path)
         generated_app = importlib.util.module_from_spec(spec)
         spec.loader.exec_module(generated_app)
@@ -398,6 +484,7 @@ def run_app(app_path: str) -> None:
         error_message = str(e)
 
         logger.error(f"Error running app '{app_name_slug}': {error_message}")
+        annotate(error=error_message)
 
         # Store error details in session state
         st.session_state["run_error"] = {
@@ -406,3 +493,79 @@ def run_app(app_path: str) -> None:
         }
 
         st.error(f"An error occurred while running the app: {error_message}")
+
+
+@st.cache_resource(show_spinner=False)
+def get_app_pool() -> AppProcessPool:
+    """
+    Returns the process-wide pool of warm workers used to run generated apps out of process.
+    The pool is created on first use and shared across all sessions of the builder.
+
+    Returns:
+        AppProcessPool: The shared app process pool.
+    """
+    pool = AppProcessPool()
+
+    def stop_rebuilt_app(event: AppEvent) -> None:
+        # A running worker has the previous backend module imported; the next run starts a fresh one.
+        if event.kind == COMMITTED:
+            pool.stop_app(event.app_name_slug)
+
+    get_app_writer().subscribe(stop_rebuilt_app)
+    return pool
+
+
+@traced()
+def run_app_isolated(app_name: str, app_path: str) -> Optional[str]:
+    """
+    Serves a generated app from the isolated process pool and returns the URL it is reachable at.
+
+    Args:
+        app_name (str): Name of the app directory under `src/apps`.
+        app_path (str): Path to the app's frontend script.
+
+    Returns:
+        Optional[str]: The app URL, or None if the app could not be started.
+    """
+    annotate(app_name=app_name)
+    try:
+        logger.info(f"Serving app '{app_name}' from the isolated process pool.")
+        running = get_app_pool().serve(app_name, app_path)
+        st.session_state.pop("run_error", None)
+        return running.url
+    except Exception as e:
+        error_message = str(e)
+        logger.error(f"Error serving app '{app_name}' in isolated mode: {error_message}")
+        annotate(error=error_message)
+        st.session_state["run_error"] = {
+            "app_name_slug": app_name,
+            "error_message": error_message
+        }
+        return None
+
+
+def display_profiling_panel(rerun: RerunProfile, fragment: Optional[str] = None) -> None:
+    """
+    Renders the stage timings of the last rerun in a collapsible panel, with an option to capture a
+    cProfile dump of the next rerun.
+
+    Args:
+        rerun (RerunProfile): Timings collected by `record_rerun`.
+        fragment (Optional[str]): Name of the fragment whose rerun this was. Fragment reruns cannot
+            write to the sidebar, so their panel is rendered in place, inside the fragment.
+    """
+    title = f"Fragment '{fragment}' rerun timings" if fragment else "Rerun timings"
+    with (st.container() if fragment else st.sidebar):
+        with st.expander(f"{title} ({rerun.total_seconds * 1000:.0f} ms)", expanded=False):
+            timings_df = pd.DataFrame([
+                {"stage": ("\u2003" * timing.depth) + timing.name, "ms": round(timing.seconds * 1000, 1)}
+                for timing in sorted(rerun.stages, key=lambda timing: (timing.start, timing.depth))
+            ])
+            if not timings_df.empty:
+                st.dataframe(timings_df, hide_index=True, use_container_width=True)
+
+            if rerun.profile_path:
+                st.caption(f"cProfile dump: `{os.path.relpath(rerun.profile_path)}`")
+            if st.button("Capture cProfile of next rerun", key=f"capture_profile_{fragment or 'app'}"):
+                st.session_state["capture_profile"] = True
+                st.rerun()
@@ -0,0 +1,184 @@
+from src.utils.tracing import TracingThreadPoolExecutor
+from src.config.setup import BUILD_MAX_CONCURRENCY
+from src.config.setup import BUILD_JOBS_PATH
+from src.config.logging import logger
+from src.utils.tracing import span
+from dataclasses import dataclass
+from dataclasses import asdict
+from typing import Callable
+from typing import Optional
+from typing import Dict
+from typing import List
+from typing import Any
+import pandas as pd
+import threading
+import json
+import time
+import uuid
+import os
+
+
+QUEUED = "queued"
+GENERATING = "generating"
+VALIDATING = "validating"
+SAVED = "saved"
+FAILED = "failed"
+
+TERMINAL_STATUSES = (SAVED, FAILED)
+
+
+@dataclass
+class BuildJob:
+    """
+    Tracks the progress of building a single idea into an app.
+
+    Attributes:
+        job_id (str): Unique identifier of the job.
+        title (str): Title of the idea being built.
+        status (str): One of queued, generating, validating, saved or failed.
+        app_name_slug (Optional[str]): Slug of the generated app once known.
+        error (Optional[str]): Error message if the build failed.
+        created_at (float): Epoch timestamp when the job was queued.
+        updated_at (float): Epoch timestamp of the last status change.
+    """
+    job_id: str
+    title: str
+    status: str = QUEUED
+    app_name_slug: Optional[str] = None
+    error: Optional[str] = None
+    created_at: float = 0.0
+    updated_at: float = 0.0
+
+    @property
+    def finished(self) -> bool:
+        return self.status in TERMINAL_STATUSES
+
+
+class BuildScheduler:
+    """
+    Runs app builds in the background with bounded concurrency.
+
+    Each submitted idea gets its own `BuildJob` whose status is updated as the build progresses, so a
+    failing build no longer discards the others and completed apps become available immediately.
+    Job state is kept in process memory, shared by all sessions, and mirrored to a JSON file so the
+    build history survives reruns, page reloads and server restarts.
+    """
+
+    def __init__(
+        self,
+        build_fn: Callable[..., str],
+        max_workers: int = BUILD_MAX_CONCURRENCY,
+        state_path: str = BUILD_JOBS_PATH
+    ) -> None:
+        """
+        Args:
+            build_fn (Callable[..., str]): Function called as `build_fn(idea, entries, on_status=...)`
+                that builds the app and returns its slug.
+            max_workers (int): Maximum number of builds running at the same time.
+            state_path (str): Path of the JSON file the job states are persisted to.
+        """
+        self._build_fn = build_fn
+        self._state_path = state_path
+        # Builds run in the submitter's trace context, so their spans join the trace that queued them.
+        self._executor = TracingThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="app-build")
+        self._lock = threading.Lock()
+        self._save_lock = threading.Lock()
+        self._jobs: Dict[str, BuildJob] = self._load_state()
+
+    def _load_state(self) -> Dict[str, BuildJob]:
+        if not os.path.exists(self._state_path):
+            return {}
+        try:
+            with open(self._state_path, 'r', encoding='utf-8') as f:
+                raw_jobs = json.load(f)
+        except (OSError, json.JSONDecodeError) as e:
+            logger.warning(f"Could not load build job state from '{self._state_path}': {e}")
+            return {}
+
+        jobs = {}
+        for raw_job in raw_jobs:
+            job = BuildJob(**raw_job)
+            if not job.finished:
+                # The process that ran this build is gone.
+                job.status = FAILED
+                job.error = "Build was interrupted by a server restart."
+            jobs[job.job_id] = job
+        return jobs
+
+    def _save_state(self) -> None:
+        # Build threads save concurrently; serialising the whole write and taking the snapshot inside
+        # the save lock means saves never share a temporary file and the last one always holds the
+        # newest state.
+        with self._save_lock:
+            with self._lock:
+                raw_jobs = [asdict(job) for job in self._jobs.values()]
+            tmp_path = f"{self._state_path}.tmp"
+            try:
+                with open(tmp_path, 'w', encoding='utf-8') as f:
+                    json.dump(raw_jobs, f)
+                os.replace(tmp_path, self._state_path)
+            except OSError as e:
+                logger.warning(f"Could not persist build job state: {e}")
+
+    def _update(self, job_id: str, **changes: Any) -> None:
+        with self._lock:
+            job = self._jobs[job_id]
+            for key, value in changes.items():
+                setattr(job, key, value)
+            job.updated_at = time.time()
+        logger.info(f"Build job '{job.title}' is {job.status}.")
+        self._save_state()
+
+    def submit(self, idea: Dict, entries: pd.DataFrame) -> BuildJob:
+        """
+        Queues a build for the given idea and returns immediately.
+
+        Args:
+            idea (Dict): The idea to build, including its title.
+            entries (pd.DataFrame): The selected API entries to pass to the builder.
+
+        Returns:
+            BuildJob: The queued job.
+        """
+        now = time.time()
+        job = BuildJob(job_id=uuid.uuid4().hex, title=idea.get('title', 'Untitled'), created_at=now, updated_at=now)
+        with self._lock:
+            self._jobs[job.job_id] = job
+        self._save_state()
+        self._executor.submit(self._run, job.job_id, idea, entries)
+        return job
+
+    def _run(self, job_id: str, idea: Dict, entries: pd.DataFrame) -> None:
+        job = self._jobs[job_id]
+        with span("build_job", job_id=job_id, title=job.title, queued_seconds=round(time.time() - job.created_at, 3)):
+            self._build(job_id, idea, entries)
+
+    def _build(self, job_id: str, idea: Dict, entries: pd.DataFrame) -> None:
+        try:
+            app_name_slug = self._build_fn(idea, entries, on_status=lambda status: self._update(job_id, status=status))
+            self._update(job_id, status=SAVED, app_name_slug=app_name_slug)
+        except Exception as e:
+            logger.error(f"Build job {job_id} failed: {e}")
+            self._update(job_id, status=FAILED, error=str(e))
+
+    def jobs(self) -> List[BuildJob]:
+        """
+        Returns a snapshot of all jobs, oldest first.
+        """
+        with self._lock:
+            return [BuildJob(**asdict(job)) for job in self._jobs.values()]
+
+    def has_active_jobs(self) -> bool:
+        """
+        Returns True while any job is queued or running.
+        """
+        with self._lock:
+            return any(not job.finished for job in self._jobs.values())
+
+    def clear_finished(self) -> None:
+        """
+        Removes saved and failed jobs from the history.
+        """
+        with self._lock:
+            self._jobs = {job_id: job for job_id, job in self._jobs.items() if not job.finished}
+        self._save_state()
@@ -0,0 +1,32 @@
+from src.workflow.executor import AppProcessPool
+from src.workflow.executor import AppLimits
+import urllib.request
+import pytest
+import sys
+
+
+# The pool imports Streamlit only inside its workers; without it they cannot serve anything.
+pytest.importorskip("streamlit")
+
+
+@pytest.mark.skipif(not sys.platform.startswith("linux"), reason="reads the worker's limits from /proc")
+def test_isolated_worker_starts_under_default_limits(tmp_path):
+    """
+    Smoke test: one pool worker, with the default CPU and memory limits applied, serves an app.
+    """
+    app_path = tmp_path / "frontend.py"
+    app_path.write_text('import streamlit as st\nst.write("ok")\n')
+    limits = AppLimits()
+
+    pool = AppProcessPool(size=1, limits=limits)
+    try:
+        running = pool.serve("smoke_test_app", str(app_path))
+        assert running.is_alive()
+        with urllib.request.urlopen(f"http://127.0.0.1:{running.port}/_stcore/health", timeout=5) as response:
+            assert response.read() == b"ok"
+
+        with open(f"/proc/{running.worker.process.pid}/limits") as f:
+            worker_limits = f.read()
+        assert f"Max data size {limits.memory_mb * 1024 * 1024}" in " ".join(worker_limits.split())
+    finally:
+        pool.shutdown()